@@ -0,0 +1,11 @@
+"""
+ASGI entry point. The hot read endpoints run as coroutines on the asyncio
+engine and every other route falls through to the Flask app:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8000
+"""
+from base import app
+from base.com.controller import async_read_controller
+from base.utils.asgi import asgi_router
+
+application = asgi_router
@@ -16,10 +16,15 @@ app = Flask(__name__)
 CORS(app)
 
 app.secret_key = os.getenv('SECRET_KEY')
+SECRET_KEY = app.secret_key
 
-app.config['SQLALCHEMY_ECHO'] = True
+app.config['SQLALCHEMY_ECHO'] = os.getenv('SQLALCHEMY_ECHO', 'true').lower() == 'true'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=30)
 app.config['PERMANENT_MAX_OVERFLOW'] = 0
+# Bodies declaring a larger Content-Length get a 413 before any of it is
+# read; upload endpoints enforce their per-file limits while streaming
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH',
+                                                 str(64 * 1024 * 1024)))
 
 db_host = os.getenv('DB_HOST')
 db_port = os.getenv('DB_PORT')
@@ -27,19 +32,23 @@ db_name = os.getenv('DB_NAME')
 db_user = os.getenv('DB_USER')
 db_password = os.getenv('DB_PASSWORD')
 
-app.config[
-    'SQLALCHEMY_DATABASE_URI'] = f'mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}'
+# DATABASE_URL overrides the MySQL settings, e.g. sqlite:///bench.db for benchmarks
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL') or \
+    f'mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}'
 
 app.app_context().push()
 
 db = SQLAlchemy(app)
 
 from base.com import vo
+from base.utils.replicas import RoutingSession
 
-with app.app_context():
-    db.create_all()
+# Must be swapped in before the first session is created
+db.session.session_factory.class_ = RoutingSession
 
-SECRET_KEY = app.secret_key
+if os.getenv('AUTO_MIGRATE', 'true').lower() == 'true':
+    from base.utils.migrations import migration_runner
+    migration_runner.upgrade()
 
 try:
     from base.utils.admin_setup import create_admin_user
@@ -47,4 +56,17 @@ try:
 except Exception as e:
     print(f"Error during admin setup: {e}")
 
+try:
+    from base.utils.reference_data import reference_data
+    reference_data.load()
+except Exception as e:
+    print(f"Error loading reference data: {e}")
+
+try:
+    from base.utils.popularity import popularity_tracker
+    popularity_tracker.load()
+except Exception as e:
+    print(f"Error loading popularity stats: {e}")
+
+from base.utils import query_metrics, request_metrics
 from base.com import controller
\ No newline at end of file
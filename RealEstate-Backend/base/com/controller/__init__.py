@@ -2,7 +2,12 @@ from base.com.controller import admin_controller
 from base.com.controller import appointment_controller
 from base.com.controller import category_controller
 from base.com.controller import favorite_controller
+from base.com.controller import import_controller
 from base.com.controller import location_controller
+from base.com.controller import metrics_controller
+from base.com.controller import moderation_controller
 from base.com.controller import property_controller
+from base.com.controller import recommendation_controller
 from base.com.controller import review_controller
+from base.com.controller import saved_search_controller
 from base.com.controller import user_controller
@@ -1,4 +1,4 @@
-from flask import jsonify
+from flask import jsonify, request
 
 from base import app
 from base.com.dao.appointment_dao import AppointmentDAO
@@ -7,6 +7,8 @@ from base.com.dao.review_dao import ReviewDAO
 from base.com.dao.user_dao import UserDAO
 from base.utils.decorators import token_required, admin_required
 from base.utils.helpers import format_response
+from base.utils.media import ORPHAN_GRACE_HOURS, backfill_image_metadata, \
+    collect_orphaned_media, delete_orphaned_media
 
 
 @app.route('/api/admin/dashboard', methods=['GET'])
@@ -196,3 +198,47 @@ def get_all_appointments(current_user):
         return jsonify(format_response('success', 'All appointments retrieved', result)), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/admin/media/image-metadata', methods=['POST'])
+@token_required
+@admin_required
+def queue_image_metadata_backfill(current_user):
+    try:
+        job_id = backfill_image_metadata.delay()
+        return jsonify(format_response(
+            'success', 'Image metadata backfill queued',
+            {'job_id': job_id})), 202
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/admin/media/orphans', methods=['POST'])
+@token_required
+@admin_required
+def collect_orphaned_media_files(current_user):
+    """
+    Report media files no listing or user refers to; with
+    {"dry_run": false} queue their deletion instead.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        grace_hours = data.get('grace_hours', ORPHAN_GRACE_HOURS)
+        # A fresh upload is on disk before its row is committed
+        if not isinstance(grace_hours, int) or isinstance(grace_hours, bool) \
+                or grace_hours < 1:
+            return jsonify(format_response(
+                'error', 'grace_hours must be a whole number of at least 1')), 400
+
+        if data.get('dry_run', True) is not False:
+            report = collect_orphaned_media(dry_run=True,
+                                            grace_hours=grace_hours)
+            return jsonify(format_response('success', 'Orphaned media found',
+                                           report)), 200
+
+        job_id = delete_orphaned_media.delay(grace_hours=grace_hours)
+        return jsonify(format_response(
+            'success', 'Orphaned media deletion queued',
+            {'job_id': job_id})), 202
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
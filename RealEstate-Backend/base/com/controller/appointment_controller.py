@@ -110,37 +110,45 @@ def update_appointment_status(current_user, appointment_id):
             return jsonify(format_response('error', 'Status is required')), 400
 
         appointment_dao = AppointmentDAO()
+        status = data['status']
+        user_id = current_user['user_id']
+        is_admin = current_user['user_role'] == 'admin'
+
+        # The guarded update is the whole happy path; the row is only read
+        # to explain why it matched nothing
+        success = False
+        if is_admin and status in ['confirmed', 'cancelled']:
+            success = appointment_dao.update_appointment_status(
+                appointment_id, status, seller_id=user_id)
+        if not success and status == 'cancelled':
+            success = appointment_dao.update_appointment_status(
+                appointment_id, status, buyer_id=user_id)
+
+        if success:
+            return jsonify(format_response('success',
+                                           f'Appointment {status} successfully')), 200
+
         appointment_vo = appointment_dao.get_appointment_by_id(appointment_id)
 
         if not appointment_vo:
             return jsonify(
                 format_response('error', 'Appointment not found')), 404
 
-        if current_user['user_role'] == 'admin' and current_user[
-            'user_id'] == appointment_vo.seller_id:
-            if data['status'] in ['confirmed', 'cancelled']:
-                success = appointment_dao.update_appointment_status(
-                    appointment_id, data['status'])
-            else:
+        if is_admin and user_id == appointment_vo.seller_id:
+            if status not in ['confirmed', 'cancelled']:
                 return jsonify(format_response('error',
                                                'Invalid status update for admin/seller')), 400
-        elif current_user['user_id'] == appointment_vo.buyer_id:
-            if data['status'] == 'cancelled':
-                success = appointment_dao.update_appointment_status(
-                    appointment_id, data['status'])
-            else:
+        elif user_id == appointment_vo.buyer_id:
+            if status != 'cancelled':
                 return jsonify(format_response('error',
                                                'Buyer can only cancel appointments')), 400
         else:
             return jsonify(format_response('error',
                                            'Unauthorized to update this appointment')), 403
 
-        if success:
-            return jsonify(format_response('success',
-                                           f'Appointment {data["status"]} successfully')), 200
-        else:
-            return jsonify(
-                format_response('error', 'Failed to update appointment')), 500
+        return jsonify(format_response('error',
+                                       f'Cannot change a {appointment_vo.appointment_status} '
+                                       f'appointment to {status}')), 400
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -150,6 +158,12 @@ def update_appointment_status(current_user, appointment_id):
 def cancel_appointment(current_user, appointment_id):
     try:
         appointment_dao = AppointmentDAO()
+
+        if appointment_dao.update_appointment_status(
+                appointment_id, 'cancelled', buyer_id=current_user['user_id']):
+            return jsonify(format_response('success',
+                                           'Appointment cancelled successfully')), 200
+
         appointment_vo = appointment_dao.get_appointment_by_id(appointment_id)
 
         if not appointment_vo:
@@ -164,18 +178,8 @@ def cancel_appointment(current_user, appointment_id):
             return jsonify(format_response('error',
                                            'Appointment is already cancelled')), 400
 
-        if appointment_vo.appointment_status == 'completed':
-            return jsonify(format_response('error',
-                                           'Cannot cancel a completed appointment')), 400
-
-        success = appointment_dao.update_appointment_status(appointment_id, 'cancelled')
-
-        if success:
-            return jsonify(format_response('success',
-                                           'Appointment cancelled successfully')), 200
-        else:
-            return jsonify(
-                format_response('error', 'Failed to cancel appointment')), 500
+        return jsonify(format_response('error',
+                                       f'Cannot cancel a {appointment_vo.appointment_status} appointment')), 400
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -0,0 +1,202 @@
+"""
+Async versions of the hot read endpoints, served by asgi.py. Views keep the
+Flask endpoint names so both serving modes share one set of metrics, and
+must return exactly what their Flask counterparts return.
+"""
+from base.com.dao.async_favorite_dao import AsyncFavoriteDAO
+from base.com.dao.async_property_dao import AsyncPropertyDAO
+from base.com.dao.async_review_dao import AsyncReviewDAO
+from base.com.dao.property_dao import PropertyDAO
+from base.com.dao.review_dao import REVIEW_FEED_SORTS
+from base.com.controller.property_controller import folder_name
+from base.com.controller.review_controller import review_row_as_dict
+from base.utils.async_db import async_db
+from base.utils.asgi import asgi_router, run_sync
+from base.utils.autocomplete import location_autocomplete, \
+    AUTOCOMPLETE_MAX_RESULTS
+from base.utils.decorators import decode_user_token
+from base.utils.helpers import format_response, \
+    format_property_image_metadata, format_property_images, \
+    format_property_listing, parse_limit, encode_cursor, decode_cursor
+from base.utils.reference_data import reference_data
+from base.utils.view_tracker import view_tracker
+
+
+def includes(request, name):
+    return name in request.args.get('include', '').split(',')
+
+
+async def get_include_favorite_ids(request, session):
+    if not includes(request, 'favorited'):
+        return None
+    current_user = decode_user_token(request.headers.get('authorization'))
+    if not current_user:
+        return frozenset()
+    return await AsyncFavoriteDAO(session).get_favorite_property_ids(
+        current_user['user_id'])
+
+
+@asgi_router.route('/api/properties')
+async def get_all_properties(request):
+    try:
+        card = request.args.get('view') == 'card'
+        async with async_db.session() as session:
+            properties = await AsyncPropertyDAO(session).get_all_properties(
+                card)
+            favorite_ids = await get_include_favorite_ids(request, session)
+        result = []
+
+        for property_vo, user_vo in properties:
+            item = format_property_listing(property_vo, user_vo, card)
+            if favorite_ids is not None:
+                item["is_favorited"] = property_vo.property_id in favorite_ids
+            result.append(item)
+
+        return format_response('success', 'Properties retrieved', result), 200
+
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/properties/<int:property_id>')
+async def get_property(request, property_id):
+    try:
+        async with async_db.session() as session:
+            property_vo = await AsyncPropertyDAO(session).get_property_by_id(
+                property_id)
+            if not property_vo:
+                return format_response('error', 'Property not found'), 404
+
+            if property_vo.is_approved:
+                view_tracker.record_view(property_id)
+
+            item = property_vo.as_dict()
+            item["property_image_metadata"] = format_property_image_metadata(
+                item.get("property_images"),
+                item.get("property_image_metadata"), folder_name)
+            item["property_images"] = format_property_images(
+                item.get("property_images"), folder_name)
+            item["favorite_count"] = await AsyncFavoriteDAO(
+                session).get_favorite_count_by_property(property_id)
+            favorite_ids = await get_include_favorite_ids(request, session)
+        if favorite_ids is not None:
+            item["is_favorited"] = property_id in favorite_ids
+        return format_response('success', 'Property retrieved', item), 200
+
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/reviews/property/<int:property_id>')
+async def get_property_reviews(request, property_id):
+    try:
+        sort = request.args.get('sort', 'newest')
+        if sort not in REVIEW_FEED_SORTS:
+            return format_response('error', 'Invalid sort'), 400
+
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor)
+        if cursor and after is None:
+            return format_response('error', 'Invalid cursor'), 400
+
+        async with async_db.session() as session:
+            review_dao = AsyncReviewDAO(session)
+            try:
+                reviews, next_cursor = await review_dao.get_review_feed(
+                    property_id, sort, parse_limit(request.args.get('limit')),
+                    after)
+            except (ValueError, TypeError, IndexError):
+                return format_response('error', 'Invalid cursor'), 400
+
+            data = {
+                'reviews': [review_row_as_dict(review) for review in reviews],
+                'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+            }
+
+            if not cursor:
+                stats = await review_dao.get_property_rating_stats(property_id)
+                data['stats'] = {
+                    'total_reviews': stats.total_reviews if stats else 0,
+                    'average_rating': round(float(stats.average_rating),
+                                            2) if stats and stats.average_rating else 0
+                }
+
+        return format_response('success', 'Reviews retrieved', data), 200
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/categories')
+async def get_all_categories(request):
+    try:
+        categories = reference_data.get_active_categories()
+        if includes(request, 'counts'):
+            category_counts, _ = await run_sync(
+                PropertyDAO().get_cached_listing_counts)
+            categories = [dict(item, listing_count=category_counts.get(
+                item['category_id'], 0)) for item in categories]
+        return format_response('success', 'Categories retrieved',
+                               categories), 200
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/categories/<int:category_id>')
+async def get_category(request, category_id):
+    try:
+        category = reference_data.get_category(category_id)
+
+        if category:
+            return format_response('success', 'Category retrieved',
+                                   category), 200
+        else:
+            return format_response('error', 'Category not found'), 404
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/locations')
+async def get_all_locations(request):
+    try:
+        locations = reference_data.get_active_locations()
+        if includes(request, 'counts'):
+            _, location_counts = await run_sync(
+                PropertyDAO().get_cached_listing_counts)
+            locations = [dict(item, listing_count=location_counts.get(
+                item['location_id'], 0)) for item in locations]
+        return format_response('success', 'Locations retrieved',
+                               locations), 200
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/locations/search')
+async def search_locations(request):
+    try:
+        search_term = request.args.get('q', '')
+
+        if not search_term:
+            return format_response('error', 'Search term is required'), 400
+
+        limit = parse_limit(request.args.get('limit'), default=10,
+                            maximum=AUTOCOMPLETE_MAX_RESULTS)
+        # The first search after startup waits for the index, so off the loop
+        locations = await run_sync(location_autocomplete.search, search_term,
+                                   limit)
+        return format_response('success', 'Search results', locations), 200
+    except Exception as e:
+        return format_response('error', str(e)), 500
+
+
+@asgi_router.route('/api/locations/<int:location_id>')
+async def get_location(request, location_id):
+    try:
+        location = reference_data.get_location(location_id)
+
+        if location:
+            return format_response('success', 'Location retrieved',
+                                   location), 200
+        else:
+            return format_response('error', 'Location not found'), 404
+    except Exception as e:
+        return format_response('error', str(e)), 500
@@ -2,9 +2,11 @@ from flask import request, jsonify
 
 from base import app
 from base.com.dao.category_dao import CategoryDAO
+from base.com.dao.property_dao import PropertyDAO
 from base.com.vo.category_vo import CategoryVO
 from base.utils.decorators import token_required, admin_required
 from base.utils.helpers import format_response
+from base.utils.reference_data import reference_data
 
 
 @app.route('/api/categories', methods=['POST'])
@@ -34,11 +36,13 @@ def create_category(current_user):
 @app.route('/api/categories', methods=['GET'])
 def get_all_categories():
     try:
-        category_dao = CategoryDAO()
-        categories = category_dao.get_all_categories()
+        categories = reference_data.get_active_categories()
+        if 'counts' in request.args.get('include', '').split(','):
+            category_counts, _ = PropertyDAO().get_cached_listing_counts()
+            categories = [dict(item, listing_count=category_counts.get(
+                item['category_id'], 0)) for item in categories]
         return jsonify(format_response('success', 'Categories retrieved',
-                                       [category.as_dict() for category in
-                                        categories])), 200
+                                       categories)), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -46,12 +50,11 @@ def get_all_categories():
 @app.route('/api/categories/<int:category_id>', methods=['GET'])
 def get_category(category_id):
     try:
-        category_dao = CategoryDAO()
-        category = category_dao.get_category_by_id(category_id)
+        category = reference_data.get_category(category_id)
 
         if category:
             return jsonify(format_response('success', 'Category retrieved',
-                                           category.as_dict())), 200
+                                           category)), 200
         else:
             return jsonify(format_response('error', 'Category not found')), 404
     except Exception as e:
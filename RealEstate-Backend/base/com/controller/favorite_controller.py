@@ -6,6 +6,8 @@ from base.com.vo.favorite_vo import FavoriteVO
 from base.utils.decorators import token_required
 from base.utils.helpers import format_response
 
+MAX_FAVORITE_CHECK_IDS = 200
+
 
 @app.route('/api/favorites', methods=['POST'])
 @token_required
@@ -41,13 +43,15 @@ def add_to_favorites(current_user):
 def get_my_favorites(current_user):
     try:
         favorite_dao = FavoriteDAO()
+        card = request.args.get('view') == 'card'
         favorites = favorite_dao.get_favorites_by_user_id(
-            current_user['user_id'])
+            current_user['user_id'], card)
 
         favorite_list = []
         for favorite_vo, property_vo in favorites:
             favorite_data = favorite_vo.as_dict()
-            favorite_data['property'] = property_vo.as_dict()
+            favorite_data['property'] = property_vo.as_card_dict() if card \
+                else property_vo.as_dict()
             favorite_list.append(favorite_data)
 
         return jsonify(
@@ -91,3 +95,30 @@ def check_if_favorited(current_user, property_id):
                                        {'is_favorited': is_favorited})), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/favorites/check', methods=['GET'])
+@token_required
+def check_favorites_batch(current_user):
+    try:
+        try:
+            property_ids = [int(item) for item in
+                            request.args.get('ids', '').split(',') if item]
+        except ValueError:
+            return jsonify(
+                format_response('error', 'IDs must be integers')), 400
+
+        if not property_ids:
+            return jsonify(format_response('error', 'IDs are required')), 400
+        if len(property_ids) > MAX_FAVORITE_CHECK_IDS:
+            return jsonify(format_response('error',
+                                           f'At most {MAX_FAVORITE_CHECK_IDS} IDs per request')), 400
+
+        favorited_ids = FavoriteDAO().get_favorited_property_ids(
+            current_user['user_id'], property_ids)
+        return jsonify(format_response('success', 'Favorite status checked', {
+            'favorited': {str(property_id): property_id in favorited_ids
+                          for property_id in property_ids}
+        })), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
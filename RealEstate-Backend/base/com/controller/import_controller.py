@@ -0,0 +1,127 @@
+import os
+import uuid
+
+from flask import request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from base import app
+from base.com.dao.import_job_dao import ImportJobDAO
+from base.com.vo.import_job_vo import ImportJobVO
+from base.utils.decorators import token_required
+from base.utils.helpers import format_response
+from base.utils.property_importer import IMPORT_FOLDER, IMPORT_FORMATS, \
+    MAX_IMPORT_REQUEST_BYTES, start_import_job, is_import_job_active
+from base.utils.unit_of_work import transaction
+
+
+def save_import_file(file, extensions):
+    """Save an import upload outside the public static folder"""
+    if not file or file.filename == '' or '.' not in file.filename:
+        return None
+    ext = file.filename.rsplit('.', 1)[1].lower()
+    if ext not in extensions:
+        return None
+
+    os.makedirs(IMPORT_FOLDER, exist_ok=True)
+    path = os.path.join(IMPORT_FOLDER, f"{uuid.uuid4().hex}.{ext}")
+    file.save(path)
+    return path
+
+
+@app.route('/api/properties/import', methods=['POST'])
+@token_required
+def create_import_job(current_user):
+    try:
+        request.max_content_length = MAX_IMPORT_REQUEST_BYTES
+        source_path = save_import_file(request.files.get('file'),
+                                       IMPORT_FORMATS)
+        if not source_path:
+            return jsonify(format_response('error',
+                                           'A .csv or .jsonl file is required')), 400
+
+        archive_path = None
+        if request.files.get('images'):
+            archive_path = save_import_file(request.files['images'], ('zip',))
+            if not archive_path:
+                return jsonify(format_response('error',
+                                               'Images must be a .zip archive')), 400
+
+        import_job_vo = ImportJobVO()
+        import_job_vo.user_id = current_user['user_id']
+        import_job_vo.source_format = source_path.rsplit('.', 1)[1]
+        import_job_vo.source_path = source_path
+        import_job_vo.archive_path = archive_path
+        import_job_vo.job_status = 'queued'
+
+        with transaction():
+            import_job_id = ImportJobDAO().insert_import_job(import_job_vo)
+            start_import_job(import_job_id)
+        return jsonify(format_response('success', 'Import started',
+                                       {'import_job_id': import_job_id})), 202
+
+    except RequestEntityTooLarge:
+        return jsonify(format_response('error', 'Upload is too large')), 413
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/properties/import', methods=['GET'])
+@token_required
+def get_my_import_jobs(current_user):
+    try:
+        import_jobs = ImportJobDAO().get_import_jobs_by_user_id(
+            current_user['user_id'])
+        return jsonify(format_response('success', 'My import jobs',
+                                       [job.as_dict() for job in
+                                        import_jobs])), 200
+
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/properties/import/<int:import_job_id>', methods=['GET'])
+@token_required
+def get_import_job(current_user, import_job_id):
+    try:
+        import_job_vo = ImportJobDAO().get_import_job_by_id(import_job_id)
+        if not import_job_vo:
+            return jsonify(format_response('error', 'Import job not found')), 404
+
+        if import_job_vo.user_id != current_user['user_id'] and current_user['user_role'] != 'admin':
+            return jsonify(format_response('error', 'Unauthorized')), 403
+
+        return jsonify(format_response('success', 'Import job retrieved',
+                                       import_job_vo.as_dict())), 200
+
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/properties/import/<int:import_job_id>/resume',
+           methods=['POST'])
+@token_required
+def resume_import_job(current_user, import_job_id):
+    try:
+        import_job_vo = ImportJobDAO().get_import_job_by_id(import_job_id)
+        if not import_job_vo:
+            return jsonify(format_response('error', 'Import job not found')), 404
+
+        if import_job_vo.user_id != current_user['user_id'] and current_user['user_role'] != 'admin':
+            return jsonify(format_response('error', 'Unauthorized')), 403
+
+        if import_job_vo.job_status == 'completed':
+            return jsonify(format_response('error',
+                                           'Import job is already completed')), 400
+
+        # A 'running' job whose heartbeat went stale lost its worker; the
+        # queued run claims it in the database, so a race here is harmless
+        if is_import_job_active(import_job_vo):
+            return jsonify(format_response('error',
+                                           'Import job is already running')), 400
+
+        start_import_job(import_job_id)
+        return jsonify(format_response('success', 'Import resumed',
+                                       {'import_job_id': import_job_id})), 202
+
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
@@ -2,9 +2,13 @@ from flask import request, jsonify
 
 from base import app
 from base.com.dao.location_dao import LocationDAO
+from base.com.dao.property_dao import PropertyDAO
 from base.com.vo.location_vo import LocationVO
 from base.utils.decorators import token_required, admin_required
-from base.utils.helpers import format_response
+from base.utils.autocomplete import location_autocomplete, \
+    AUTOCOMPLETE_MAX_RESULTS
+from base.utils.helpers import format_response, parse_limit
+from base.utils.reference_data import reference_data
 
 
 @app.route('/api/locations', methods=['POST'])
@@ -40,11 +44,13 @@ def create_location(current_user):
 @app.route('/api/locations', methods=['GET'])
 def get_all_locations():
     try:
-        location_dao = LocationDAO()
-        locations = location_dao.get_all_locations()
+        locations = reference_data.get_active_locations()
+        if 'counts' in request.args.get('include', '').split(','):
+            _, location_counts = PropertyDAO().get_cached_listing_counts()
+            locations = [dict(item, listing_count=location_counts.get(
+                item['location_id'], 0)) for item in locations]
         return jsonify(format_response('success', 'Locations retrieved',
-                                       [location.as_dict() for location in
-                                        locations])), 200
+                                       locations)), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -58,11 +64,11 @@ def search_locations():
             return jsonify(
                 format_response('error', 'Search term is required')), 400
 
-        location_dao = LocationDAO()
-        locations = location_dao.search_locations(search_term)
+        limit = parse_limit(request.args.get('limit'), default=10,
+                            maximum=AUTOCOMPLETE_MAX_RESULTS)
+        locations = location_autocomplete.search(search_term, limit)
         return jsonify(format_response('success', 'Search results',
-                                       [location.as_dict() for location in
-                                        locations])), 200
+                                       locations)), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -82,12 +88,11 @@ def get_locations_by_city(city):
 @app.route('/api/locations/<int:location_id>', methods=['GET'])
 def get_location(location_id):
     try:
-        location_dao = LocationDAO()
-        location = location_dao.get_location_by_id(location_id)
+        location = reference_data.get_location(location_id)
 
         if location:
             return jsonify(format_response('success', 'Location retrieved',
-                                           location.as_dict())), 200
+                                           location)), 200
         else:
             return jsonify(format_response('error', 'Location not found')), 404
     except Exception as e:
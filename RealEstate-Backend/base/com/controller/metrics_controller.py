@@ -0,0 +1,31 @@
+import hmac
+import os
+
+from flask import request, jsonify, Response
+
+from base import app
+from base.utils.helpers import format_response
+from base.utils.metrics import metrics_registry
+
+def metrics_access_allowed():
+    """
+    Bearer METRICS_TOKEN only. Without a token the endpoint stays closed:
+    behind a reverse proxy every request arrives from a local address.
+    """
+    token = os.getenv('METRICS_TOKEN')
+    if not token:
+        return False
+    supplied = request.headers.get('Authorization', '')
+    return hmac.compare_digest(supplied, f'Bearer {token}')
+
+
+@app.route('/internal/metrics', methods=['GET'])
+def get_metrics():
+    try:
+        if not metrics_access_allowed():
+            return jsonify(format_response('error', 'Forbidden')), 403
+
+        return Response(metrics_registry.render(),
+                        mimetype='text/plain; version=0.0.4')
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
@@ -0,0 +1,200 @@
+from datetime import datetime
+
+from flask import request, jsonify
+
+from base import app
+from base.com.dao.property_dao import PropertyDAO, \
+    PROPERTY_MODERATION_ACTIONS
+from base.com.dao.review_dao import ReviewDAO, REVIEW_MODERATION_ACTIONS
+from base.utils.decorators import token_required, admin_required
+from base.utils.helpers import format_response, parse_limit, encode_cursor, \
+    decode_cursor
+
+MAX_BULK_ITEMS = 1000
+
+PROPERTY_FILTER_FIELDS = ('user_id', 'category_id', 'location_id')
+REVIEW_FILTER_FIELDS = ('property_id', 'user_id', 'min_rating', 'max_rating')
+
+
+def parse_bulk_request(data, actions, filter_fields):
+    """
+    Validate a bulk moderation body: {"action", "ids"} or {"action", "filter"}.
+    Returns (action, ids, filters, error_message).
+    """
+    if not data or data.get('action') not in actions:
+        return None, None, None, \
+            f"Action must be one of: {', '.join(actions)}"
+
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or not ids:
+            return None, None, None, 'IDs must be a non-empty list'
+        if len(ids) > MAX_BULK_ITEMS:
+            return None, None, None, \
+                f'At most {MAX_BULK_ITEMS} IDs per request'
+        try:
+            ids = list(dict.fromkeys(int(item_id) for item_id in ids))
+        except (TypeError, ValueError):
+            return None, None, None, 'IDs must be integers'
+        return data['action'], ids, None, None
+
+    raw_filters = data.get('filter')
+    if not isinstance(raw_filters, dict) or not raw_filters:
+        return None, None, None, 'Either ids or filter is required'
+
+    filters = {}
+    try:
+        for field in filter_fields:
+            if raw_filters.get(field) is not None:
+                filters[field] = int(raw_filters[field])
+        for field in ('created_after', 'created_before'):
+            if raw_filters.get(field):
+                filters[field] = datetime.fromisoformat(raw_filters[field])
+    except (TypeError, ValueError):
+        return None, None, None, 'Invalid filter values'
+
+    if not filters:
+        return None, None, None, 'Filter has no supported fields'
+    return data['action'], None, filters, None
+
+
+def format_bulk_report(results, has_more=False):
+    """
+    has_more tells a filter request that matched more than MAX_BULK_ITEMS
+    rows that the rest is still untouched; sending it again continues.
+    """
+    return {
+        'has_more': has_more,
+        'processed': sum(1 for status in results.values() if status == 'done'),
+        'skipped': sum(1 for status in results.values() if status == 'skipped'),
+        'not_found': sum(
+            1 for status in results.values() if status == 'not_found'),
+        'results': [{'id': item_id, 'status': status}
+                    for item_id, status in results.items()]
+    }
+
+
+def bulk_message(action, has_more):
+    if has_more:
+        return f'Bulk {action} completed for the first {MAX_BULK_ITEMS} ' \
+               f'matches; send the request again for the rest'
+    return f'Bulk {action} completed'
+
+
+def parse_queue_cursor():
+    cursor = request.args.get('cursor')
+    after = decode_cursor(cursor)
+    if cursor and (not after or not isinstance(after[0], int)):
+        return None, False
+    return after[0] if after else None, True
+
+
+@app.route('/api/admin/moderation/properties', methods=['GET'])
+@token_required
+@admin_required
+def get_property_moderation_queue(current_user):
+    try:
+        after_id, valid = parse_queue_cursor()
+        if not valid:
+            return jsonify(format_response('error', 'Invalid cursor')), 400
+
+        limit = parse_limit(request.args.get('limit'))
+        properties = PropertyDAO().get_pending_approvals_page(limit + 1,
+                                                              after_id)
+        next_cursor = None
+        if len(properties) > limit:
+            properties = properties[:limit]
+            next_cursor = encode_cursor([properties[-1].property_id])
+
+        return jsonify(format_response('success', 'Property moderation queue', {
+            'items': [property_vo.as_dict() for property_vo in properties],
+            'next_cursor': next_cursor
+        })), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/admin/moderation/properties', methods=['POST'])
+@token_required
+@admin_required
+def bulk_moderate_properties(current_user):
+    try:
+        action, ids, filters, error = parse_bulk_request(
+            request.get_json(silent=True), tuple(PROPERTY_MODERATION_ACTIONS),
+            PROPERTY_FILTER_FIELDS)
+        if error:
+            return jsonify(format_response('error', error)), 400
+
+        property_dao = PropertyDAO()
+        has_more = False
+        if ids is None:
+            ids = property_dao.get_moderation_property_ids(
+                action, filters, MAX_BULK_ITEMS + 1)
+            has_more = len(ids) > MAX_BULK_ITEMS
+            ids = ids[:MAX_BULK_ITEMS]
+        results = property_dao.bulk_moderate_properties(ids, action) \
+            if ids else {}
+
+        return jsonify(format_response(
+            'success', bulk_message(action, has_more),
+            format_bulk_report(results, has_more))), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/admin/moderation/reviews', methods=['GET'])
+@token_required
+@admin_required
+def get_review_moderation_queue(current_user):
+    try:
+        after_id, valid = parse_queue_cursor()
+        if not valid:
+            return jsonify(format_response('error', 'Invalid cursor')), 400
+
+        limit = parse_limit(request.args.get('limit'))
+        reviews = ReviewDAO().get_pending_reviews_page(limit + 1, after_id)
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            next_cursor = encode_cursor([reviews[-1][0].review_id])
+
+        items = []
+        for review_vo, user_name, property_title in reviews:
+            review_data = review_vo.as_dict()
+            review_data['user_name'] = user_name
+            review_data['property_title'] = property_title
+            items.append(review_data)
+
+        return jsonify(format_response('success', 'Review moderation queue', {
+            'items': items,
+            'next_cursor': next_cursor
+        })), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/admin/moderation/reviews', methods=['POST'])
+@token_required
+@admin_required
+def bulk_moderate_reviews(current_user):
+    try:
+        action, ids, filters, error = parse_bulk_request(
+            request.get_json(silent=True), tuple(REVIEW_MODERATION_ACTIONS),
+            REVIEW_FILTER_FIELDS)
+        if error:
+            return jsonify(format_response('error', error)), 400
+
+        review_dao = ReviewDAO()
+        has_more = False
+        if ids is None:
+            ids = review_dao.get_moderation_review_ids(
+                action, filters, MAX_BULK_ITEMS + 1)
+            has_more = len(ids) > MAX_BULK_ITEMS
+            ids = ids[:MAX_BULK_ITEMS]
+        results = review_dao.bulk_moderate_reviews(ids, action) if ids else {}
+
+        return jsonify(format_response(
+            'success', bulk_message(action, has_more),
+            format_bulk_report(results, has_more))), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
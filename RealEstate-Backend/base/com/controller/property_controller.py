@@ -1,51 +1,58 @@
 from flask import request, jsonify
-from base import app
-from base.com.dao.property_dao import PropertyDAO
-from base.com.vo.property_vo import PropertyVO
-from base.utils.decorators import token_required
-from base.utils.helpers import format_response, save_uploaded_file, \
-    format_property_images
-from base.utils.validators import validate_price, validate_bedrooms, \
-    validate_bathrooms
-from flask import request, jsonify
 
 from base import app
+from base.com.dao.favorite_dao import FavoriteDAO
 from base.com.dao.property_dao import PropertyDAO
+from base.com.dao.property_stats_dao import PropertyStatsDAO
 from base.com.vo.property_vo import PropertyVO
-from base.utils.decorators import token_required
-from base.utils.helpers import format_response, save_uploaded_file, \
-    format_property_images
+from base.utils.decorators import token_required, get_current_user
+from base.utils.cache import TTLCache
+from base.utils.helpers import format_response, format_image_metadata, \
+    format_property_image, format_property_image_metadata, \
+    format_property_images, format_property_listing, parse_limit
+from base.utils.media import describe_property_images
+from base.utils.popularity import popularity_tracker
+from base.utils.similarity import similarity_index
+from base.utils.unit_of_work import transaction
+from base.utils.uploads import UploadError, receive_multipart
 from base.utils.validators import validate_price, validate_bedrooms, \
     validate_bathrooms
+from base.utils.view_tracker import view_tracker
 
 folder_name = "property_images"
 
+trending_cache = TTLCache(ttl=60, max_size=16)
+
+
+def get_include_favorite_ids():
+    """
+    Favorited property IDs of the caller when the request asks for
+    ?include=favorited, otherwise None.
+    """
+    includes = request.args.get('include', '').split(',')
+    if 'favorited' not in includes:
+        return None
+    current_user = get_current_user()
+    if not current_user:
+        return frozenset()
+    return FavoriteDAO().get_favorite_property_ids(current_user['user_id'])
+
 
 @app.route('/api/properties', methods=['POST'])
 @token_required
 def create_property(current_user):
     try:
-        if 'property_images' not in request.files:
+        form, uploads = receive_multipart({'property_images': folder_name})
+        image_filenames = uploads.get('property_images')
+        if not image_filenames:
             return jsonify(
                 format_response('error', 'Property images are required')), 400
 
-        files = request.files.getlist('property_images')
-        image_filenames = []
-
-        for file in files:
-            filename, _ = save_uploaded_file(file, folder_name)
-            if filename:
-                image_filenames.append(filename)
-
-        if not image_filenames:
-            return jsonify(format_response('error',
-                                           'At least one valid image is required')), 400
-
         try:
-            price = float(request.form.get('price'))
-            bedrooms = int(request.form.get('bedrooms'))
-            bathrooms = int(request.form.get('bathrooms'))
-            area_sqft = float(request.form.get('area_sqft'))
+            price = float(form.get('price'))
+            bedrooms = int(form.get('bedrooms'))
+            bathrooms = int(form.get('bathrooms'))
+            area_sqft = float(form.get('area_sqft'))
         except ValueError:
             return jsonify(
                 format_response('error', 'Invalid numeric values')), 400
@@ -61,34 +68,39 @@ def create_property(current_user):
                 format_response('error', 'Invalid bathrooms count')), 400
 
         property_vo = PropertyVO()
-        property_vo.property_title = request.form.get('property_title')
-        property_vo.property_description = request.form.get(
+        property_vo.property_title = form.get('property_title')
+        property_vo.property_description = form.get(
             'property_description')
-        property_vo.property_type = request.form.get('property_type')
+        property_vo.property_type = form.get('property_type')
         property_vo.price = price
         property_vo.bedrooms = bedrooms
         property_vo.bathrooms = bathrooms
         property_vo.area_sqft = area_sqft
-        property_vo.address = request.form.get('address')
-        property_vo.year_built = request.form.get('year_built')
-        property_vo.parking_spots = int(request.form.get('parking_spots', 0))
-        property_vo.has_garden = request.form.get('has_garden') == 'true'
-        property_vo.has_pool = request.form.get('has_pool') == 'true'
-        property_vo.pet_friendly = request.form.get('pet_friendly') == 'true'
-        property_vo.furnished = request.form.get('furnished') == 'true'
+        property_vo.address = form.get('address')
+        property_vo.year_built = form.get('year_built')
+        property_vo.parking_spots = int(form.get('parking_spots', 0))
+        property_vo.has_garden = form.get('has_garden') == 'true'
+        property_vo.has_pool = form.get('has_pool') == 'true'
+        property_vo.pet_friendly = form.get('pet_friendly') == 'true'
+        property_vo.furnished = form.get('furnished') == 'true'
         property_vo.property_images = image_filenames
         property_vo.user_id = current_user['user_id']
-        property_vo.category_id = int(request.form.get('category_id'))
-        property_vo.location_id = int(request.form.get('location_id'))
+        property_vo.category_id = int(form.get('category_id'))
+        property_vo.location_id = int(form.get('location_id'))
         property_vo.is_approved = current_user['user_role'] == 'admin'
 
         message = "Property created successfully and approved" if property_vo.is_approved else \
             "Property created successfully - waiting for approval"
 
-        property_id = PropertyDAO().insert_property(property_vo)
+        # Sizes, placeholders and srcset variants are made by a worker
+        with transaction():
+            property_id = PropertyDAO().insert_property(property_vo)
+            describe_property_images.delay(property_id=property_id)
         return jsonify(format_response('success', message,
                                        {'property_id': property_id})), 201
 
+    except UploadError as e:
+        return jsonify(format_response('error', str(e))), e.status_code
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -96,17 +108,17 @@ def create_property(current_user):
 @app.route('/api/properties', methods=['GET'])
 def get_all_properties():
     try:
-        properties = PropertyDAO().get_all_properties()
+        # ?view=card leaves the heavy columns unread; details stay on
+        # /api/properties/<id>
+        card = request.args.get('view') == 'card'
+        properties = PropertyDAO().get_all_properties(card)
+        favorite_ids = get_include_favorite_ids()
         result = []
 
-        for property_vo, user_vo, category_vo, location_vo in properties:
-            item = property_vo.as_dict()
-            item["property_images"] = format_property_images(
-                item.get("property_images"), folder_name)
-            item["user_name"] = user_vo.user_name
-            item["category_name"] = category_vo.category_name
-            item["location_name"] = location_vo.location_name
-            item["city"] = location_vo.city
+        for property_vo, user_vo in properties:
+            item = format_property_listing(property_vo, user_vo, card)
+            if favorite_ids is not None:
+                item["is_favorited"] = property_vo.property_id in favorite_ids
             result.append(item)
 
         return jsonify(
@@ -116,6 +128,30 @@ def get_all_properties():
         return jsonify(format_response('error', str(e))), 500
 
 
+@app.route('/api/properties/trending', methods=['GET'])
+def get_trending_properties():
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10, maximum=50)
+
+        def load():
+            # Over-fetch so sold or unapproved listings can be dropped
+            ranked_ids = popularity_tracker.get_trending_ids(limit * 2)
+            if not ranked_ids:
+                return []
+            rows = {row[0].property_id: row for row in
+                    PropertyDAO().get_available_properties_by_ids(ranked_ids)}
+            result = [format_property_listing(*rows[property_id])
+                      for property_id in ranked_ids if property_id in rows]
+            return result[:limit]
+
+        result = trending_cache.get_or_set(limit, load)
+        return jsonify(
+            format_response('success', 'Trending properties', result)), 200
+
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
 @app.route('/api/properties/<int:property_id>', methods=['GET'])
 def get_property(property_id):
     try:
@@ -123,9 +159,20 @@ def get_property(property_id):
         if not property_vo:
             return jsonify(format_response('error', 'Property not found')), 404
 
+        if property_vo.is_approved:
+            view_tracker.record_view(property_id)
+
         item = property_vo.as_dict()
+        item["property_image_metadata"] = format_property_image_metadata(
+            item.get("property_images"), item.get("property_image_metadata"),
+            folder_name)
         item["property_images"] = format_property_images(
             item.get("property_images"), folder_name)
+        item["favorite_count"] = FavoriteDAO().get_favorite_count_by_property(
+            property_id)
+        favorite_ids = get_include_favorite_ids()
+        if favorite_ids is not None:
+            item["is_favorited"] = property_id in favorite_ids
         return jsonify(
             format_response('success', 'Property retrieved', item)), 200
 
@@ -133,18 +180,60 @@ def get_property(property_id):
         return jsonify(format_response('error', str(e))), 500
 
 
+@app.route('/api/properties/<int:property_id>/similar', methods=['GET'])
+def get_similar_properties(property_id):
+    try:
+        limit = parse_limit(request.args.get('limit'), default=6, maximum=24)
+        similar_ids = similarity_index.get_similar_ids(property_id, limit)
+        if similar_ids is None:
+            return jsonify(format_response('error', 'Property not found')), 404
+
+        rows = {row[0].property_id: row for row in
+                PropertyDAO().get_available_properties_by_ids(similar_ids)} \
+            if similar_ids else {}
+        result = [format_property_listing(*rows[similar_id])
+                  for similar_id in similar_ids if similar_id in rows]
+
+        return jsonify(
+            format_response('success', 'Similar properties', result)), 200
+
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
 @app.route('/api/my-properties', methods=['GET'])
 @token_required
 def get_my_properties(current_user):
     try:
+        card = request.args.get('view') == 'card'
         properties = PropertyDAO().get_properties_by_user_id(
-            current_user['user_id'])
+            current_user['user_id'], card)
+        stats = PropertyStatsDAO().get_stats_by_property_ids(
+            [p.property_id for p in properties]) if properties else {}
         result = []
 
         for p in properties:
-            item = p.as_dict()
-            item["property_images"] = format_property_images(
-                item.get("property_images"), folder_name)
+            if card:
+                item = p.as_card_dict()
+                item["primary_image_metadata"] = format_image_metadata(
+                    item.get("primary_image"),
+                    item.get("primary_image_metadata"), folder_name)
+                item["primary_image"] = format_property_image(
+                    item.get("primary_image"), folder_name)
+            else:
+                item = p.as_dict()
+                item["property_image_metadata"] = \
+                    format_property_image_metadata(
+                        item.get("property_images"),
+                        item.get("property_image_metadata"), folder_name)
+                item["property_images"] = format_property_images(
+                    item.get("property_images"), folder_name)
+            property_stats_vo = stats.get(p.property_id)
+            favorite_delta, _ = popularity_tracker.get_pending_counts(
+                p.property_id)
+            item["view_count"] = (property_stats_vo.view_count if property_stats_vo else 0) + \
+                view_tracker.get_pending_views(p.property_id)
+            item["favorite_count"] = max(0, (property_stats_vo.favorite_count if property_stats_vo else 0) + favorite_delta)
             result.append(item)
 
         return jsonify(
@@ -159,20 +248,16 @@ def get_my_properties(current_user):
 def mark_property_sold(current_user, property_id):
     try:
         property_dao = PropertyDAO()
-        property_vo = property_dao.get_property_by_id(property_id)
-
-        if not property_vo:
-            return jsonify(format_response('error', 'Property not found')), 404
 
         # Only owner or admin can mark as sold
-        if property_vo.user_id != current_user['user_id'] and current_user['user_role'] != 'admin':
-            return jsonify(format_response('error', 'Unauthorized')), 403
-
-        success = property_dao.mark_property_sold(property_id)
-        if success:
+        owner_id = None if current_user['user_role'] == 'admin' \
+            else current_user['user_id']
+        if property_dao.mark_property_sold(property_id, owner_id):
             return jsonify(format_response('success', 'Property marked as sold')), 200
-        else:
-            return jsonify(format_response('error', 'Failed to mark property as sold')), 500
+
+        if not property_dao.get_property_by_id(property_id):
+            return jsonify(format_response('error', 'Property not found')), 404
+        return jsonify(format_response('error', 'Unauthorized')), 403
 
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
@@ -183,20 +268,16 @@ def mark_property_sold(current_user, property_id):
 def mark_property_pending(current_user, property_id):
     try:
         property_dao = PropertyDAO()
-        property_vo = property_dao.get_property_by_id(property_id)
-
-        if not property_vo:
-            return jsonify(format_response('error', 'Property not found')), 404
 
         # Only owner or admin can mark as pending
-        if property_vo.user_id != current_user['user_id'] and current_user['user_role'] != 'admin':
-            return jsonify(format_response('error', 'Unauthorized')), 403
-
-        success = property_dao.mark_property_pending(property_id)
-        if success:
+        owner_id = None if current_user['user_role'] == 'admin' \
+            else current_user['user_id']
+        if property_dao.mark_property_pending(property_id, owner_id):
             return jsonify(format_response('success', 'Property marked as pending')), 200
-        else:
-            return jsonify(format_response('error', 'Failed to mark property as pending')), 500
+
+        if not property_dao.get_property_by_id(property_id):
+            return jsonify(format_response('error', 'Property not found')), 404
+        return jsonify(format_response('error', 'Unauthorized')), 403
 
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
@@ -208,16 +289,13 @@ def get_sold_properties(current_user):
     try:
         property_dao = PropertyDAO()
         properties = property_dao.get_sold_properties()
+        favorite_ids = get_include_favorite_ids()
         result = []
 
-        for property_vo, user_vo, category_vo, location_vo in properties:
-            item = property_vo.as_dict()
-            item["property_images"] = format_property_images(
-                item.get("property_images"), folder_name)
-            item["user_name"] = user_vo.user_name
-            item["category_name"] = category_vo.category_name
-            item["location_name"] = location_vo.location_name
-            item["city"] = location_vo.city
+        for property_vo, user_vo in properties:
+            item = format_property_listing(property_vo, user_vo)
+            if favorite_ids is not None:
+                item["is_favorited"] = property_vo.property_id in favorite_ids
             result.append(item)
 
         return jsonify(
@@ -233,16 +311,13 @@ def get_pending_status_properties(current_user):
     try:
         property_dao = PropertyDAO()
         properties = property_dao.get_pending_properties()
+        favorite_ids = get_include_favorite_ids()
         result = []
 
-        for property_vo, user_vo, category_vo, location_vo in properties:
-            item = property_vo.as_dict()
-            item["property_images"] = format_property_images(
-                item.get("property_images"), folder_name)
-            item["user_name"] = user_vo.user_name
-            item["category_name"] = category_vo.category_name
-            item["location_name"] = location_vo.location_name
-            item["city"] = location_vo.city
+        for property_vo, user_vo in properties:
+            item = format_property_listing(property_vo, user_vo)
+            if favorite_ids is not None:
+                item["is_favorited"] = property_vo.property_id in favorite_ids
             result.append(item)
 
         return jsonify(
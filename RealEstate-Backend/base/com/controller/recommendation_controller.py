@@ -0,0 +1,37 @@
+from flask import request, jsonify
+
+from base import app
+from base.com.dao.property_dao import PropertyDAO
+from base.com.dao.recommendation_dao import RecommendationDAO
+from base.utils.decorators import token_required
+from base.utils.helpers import format_response, format_property_listing, \
+    parse_limit
+from base.utils.popularity import popularity_tracker
+
+
+@app.route('/api/recommendations', methods=['GET'])
+@token_required
+def get_recommendations(current_user):
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10, maximum=20)
+        source = 'personalized'
+        property_ids = RecommendationDAO().get_recommended_property_ids(
+            current_user['user_id'])
+
+        # Users without favorites or appointments get the trending list
+        if not property_ids:
+            source = 'trending'
+            property_ids = popularity_tracker.get_trending_ids(limit * 2)
+
+        rows = {row[0].property_id: row for row in
+                PropertyDAO().get_available_properties_by_ids(property_ids)} \
+            if property_ids else {}
+        result = [format_property_listing(*rows[property_id])
+                  for property_id in property_ids if property_id in rows]
+
+        return jsonify(format_response('success', 'Recommendations', {
+            'source': source,
+            'properties': result[:limit]
+        })), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
@@ -1,13 +1,27 @@
 from flask import request, jsonify
 
 from base import app
-from base.com.dao.review_dao import ReviewDAO
+from base.com.dao.review_dao import ReviewDAO, REVIEW_FEED_SORTS
 from base.com.vo.review_vo import ReviewVO
 from base.utils.decorators import token_required
-from base.utils.helpers import format_response
+from base.utils.helpers import format_response, parse_limit, encode_cursor, \
+    decode_cursor
 from base.utils.validators import validate_rating
 
 
+def review_row_as_dict(row):
+    return {
+        'review_id': row.review_id,
+        'rating': row.rating,
+        'comment': row.comment,
+        'is_approved': True,
+        'created_date': row.created_date.isoformat() if row.created_date else None,
+        'user_id': row.user_id,
+        'property_id': row.property_id,
+        'user_name': row.user_name
+    }
+
+
 @app.route('/api/reviews', methods=['POST'])
 @token_required
 def create_review(current_user):
@@ -48,25 +62,57 @@ def create_review(current_user):
 @app.route('/api/reviews/property/<int:property_id>', methods=['GET'])
 def get_property_reviews(property_id):
     try:
-        review_dao = ReviewDAO()
-        reviews = review_dao.get_reviews_by_property_id(property_id)
+        sort = request.args.get('sort', 'newest')
+        if sort not in REVIEW_FEED_SORTS:
+            return jsonify(format_response('error', 'Invalid sort')), 400
 
-        review_list = []
-        for review_vo, user_vo in reviews:
-            review_data = review_vo.as_dict()
-            review_data['user_name'] = user_vo.user_name
-            review_list.append(review_data)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor)
+        if cursor and after is None:
+            return jsonify(format_response('error', 'Invalid cursor')), 400
 
-        stats = review_dao.get_property_rating_stats(property_id)
-
-        return jsonify(format_response('success', 'Reviews retrieved', {
-            'reviews': review_list,
-            'stats': {
+        review_dao = ReviewDAO()
+        try:
+            reviews, next_cursor = review_dao.get_review_feed(
+                property_id, sort, parse_limit(request.args.get('limit')),
+                after)
+        except (ValueError, TypeError, IndexError):
+            return jsonify(format_response('error', 'Invalid cursor')), 400
+
+        data = {
+            'reviews': [review_row_as_dict(review) for review in reviews],
+            'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+        }
+
+        # Stats only change the header, so later pages skip the aggregate
+        if not cursor:
+            stats = review_dao.get_property_rating_stats(property_id)
+            data['stats'] = {
                 'total_reviews': stats.total_reviews if stats else 0,
                 'average_rating': round(float(stats.average_rating),
                                         2) if stats and stats.average_rating else 0
             }
-        })), 200
+
+        return jsonify(format_response('success', 'Reviews retrieved',
+                                       data)), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/reviews/recent', methods=['GET'])
+def get_recent_reviews():
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10, maximum=50)
+        reviews = ReviewDAO().get_cached_recent_reviews(limit)
+
+        review_list = []
+        for review in reviews:
+            review_data = review_row_as_dict(review)
+            review_data['property_title'] = review.property_title
+            review_list.append(review_data)
+
+        return jsonify(format_response('success', 'Recent reviews',
+                                       review_list)), 200
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -0,0 +1,106 @@
+from flask import request, jsonify
+
+from base import app
+from base.com.dao.property_dao import PropertyDAO
+from base.com.dao.saved_search_dao import SavedSearchDAO
+from base.com.vo.saved_search_vo import SavedSearchVO
+from base.utils.decorators import token_required
+from base.utils.helpers import format_response, format_property_images
+from base.utils.saved_search_matcher import normalize_search_filters
+
+MAX_SAVED_SEARCHES_PER_USER = 50
+
+folder_name = "property_images"
+
+
+@app.route('/api/saved-searches', methods=['POST'])
+@token_required
+def create_saved_search(current_user):
+    try:
+        data = request.get_json() or {}
+        search_name = (data.get('search_name') or '').strip()
+        if not search_name:
+            return jsonify(
+                format_response('error', 'Search name is required')), 400
+
+        try:
+            filters = normalize_search_filters(data.get('search_filters'))
+        except ValueError as e:
+            return jsonify(format_response('error', str(e))), 400
+
+        saved_search_dao = SavedSearchDAO()
+        if saved_search_dao.count_saved_searches_by_user_id(
+                current_user['user_id']) >= MAX_SAVED_SEARCHES_PER_USER:
+            return jsonify(format_response(
+                'error',
+                f'At most {MAX_SAVED_SEARCHES_PER_USER} saved searches allowed')), 400
+
+        saved_search_vo = SavedSearchVO()
+        saved_search_vo.search_name = search_name[:100]
+        saved_search_vo.search_filters = filters
+        saved_search_vo.user_id = current_user['user_id']
+
+        saved_search_id = saved_search_dao.insert_saved_search(saved_search_vo)
+        return jsonify(format_response('success', 'Search saved',
+                                       {'saved_search_id': saved_search_id})), 201
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/saved-searches', methods=['GET'])
+@token_required
+def get_my_saved_searches(current_user):
+    try:
+        saved_searches = SavedSearchDAO().get_saved_searches_by_user_id(
+            current_user['user_id'])
+        result = [saved_search_vo.as_dict()
+                  for saved_search_vo in saved_searches]
+        return jsonify(
+            format_response('success', 'My saved searches', result)), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/saved-searches/<int:saved_search_id>/results',
+           methods=['GET'])
+@token_required
+def get_saved_search_results(current_user, saved_search_id):
+    try:
+        saved_search_vo = SavedSearchDAO().get_saved_search_by_id(
+            saved_search_id)
+        if not saved_search_vo or \
+                saved_search_vo.user_id != current_user['user_id']:
+            return jsonify(
+                format_response('error', 'Saved search not found')), 404
+
+        properties = PropertyDAO().search_properties(
+            saved_search_vo.search_filters)
+        result = []
+        for property_vo in properties:
+            item = property_vo.as_dict()
+            item["property_images"] = format_property_images(
+                item.get("property_images"), folder_name)
+            result.append(item)
+
+        return jsonify(
+            format_response('success', 'Saved search results', result)), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
+
+
+@app.route('/api/saved-searches/<int:saved_search_id>', methods=['DELETE'])
+@token_required
+def delete_saved_search(current_user, saved_search_id):
+    try:
+        saved_search_dao = SavedSearchDAO()
+        saved_search_vo = saved_search_dao.get_saved_search_by_id(
+            saved_search_id)
+        if not saved_search_vo or \
+                saved_search_vo.user_id != current_user['user_id']:
+            return jsonify(
+                format_response('error', 'Saved search not found')), 404
+
+        saved_search_dao.delete_saved_search(saved_search_id)
+        return jsonify(format_response('success', 'Saved search deleted')), 200
+    except Exception as e:
+        return jsonify(format_response('error', str(e))), 500
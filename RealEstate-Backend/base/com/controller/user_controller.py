@@ -1,5 +1,3 @@
-import os
-
 from flask import request, jsonify
 
 from base import app
@@ -11,8 +9,10 @@ from base.utils.helpers import (
     generate_token,
     format_response,
     validate_password,
-    save_uploaded_file,
 )
+from base.utils.media import delete_media_files
+from base.utils.unit_of_work import transaction
+from base.utils.uploads import UploadError, receive_multipart
 from base.utils.validators import validate_email, validate_phone
 
 folder_name = "profile_pictures"
@@ -23,11 +23,11 @@ def register_user():
     try:
         profile_picture_filename = None
         if request.content_type and 'multipart/form-data' in request.content_type:
-            profile_picture = request.files.get('user_profile_picture')
-            if profile_picture and profile_picture.filename != '':
-                profile_picture_filename, _ = save_uploaded_file(
-                    profile_picture, folder_name)
-            data = request.form
+            data, uploads = receive_multipart(
+                {'user_profile_picture': folder_name}, max_files=1)
+            pictures = uploads.get('user_profile_picture')
+            if pictures:
+                profile_picture_filename = pictures[0]
         else:
             data = request.get_json()
             profile_picture_filename = data.get('user_profile_picture', None)
@@ -73,6 +73,8 @@ def register_user():
             format_response('success', 'User registered successfully',
                             {'user_id': user_id})), 201
 
+    except UploadError as e:
+        return jsonify(format_response('error', str(e))), e.status_code
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -141,8 +143,10 @@ def update_profile(current_user):
         if not user_vo:
             return jsonify(format_response('error', 'User not found')), 404
 
+        stale_pictures = []
         if request.content_type and 'multipart/form-data' in request.content_type:
-            data = request.form
+            data, uploads = receive_multipart(
+                {'user_profile_picture': folder_name}, max_files=1)
             if 'user_name' in data:
                 user_vo.user_name = data['user_name']
             if 'user_phone' in data:
@@ -158,21 +162,15 @@ def update_profile(current_user):
             if 'remove_profile_picture' in data and data['remove_profile_picture'] == 'true':
                 # Delete old picture if exists
                 if user_vo.user_profile_picture:
-                    old_path = f"base/static/{folder_name}/{user_vo.user_profile_picture}"
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
+                    stale_pictures.append(user_vo.user_profile_picture)
                 user_vo.user_profile_picture = None
 
-            profile_picture = request.files.get('user_profile_picture')
-            if profile_picture and profile_picture.filename != '':
-                filename, _ = save_uploaded_file(profile_picture, folder_name)
-                if filename:
-                    # Delete old picture if exists
-                    if user_vo.user_profile_picture:
-                        old_path = f"base/static/{folder_name}/{user_vo.user_profile_picture}"
-                        if os.path.exists(old_path):
-                            os.remove(old_path)
-                    user_vo.user_profile_picture = filename
+            pictures = uploads.get('user_profile_picture')
+            if pictures:
+                # Delete old picture if exists
+                if user_vo.user_profile_picture:
+                    stale_pictures.append(user_vo.user_profile_picture)
+                user_vo.user_profile_picture = pictures[0]
 
         else:
             data = request.get_json()
@@ -191,12 +189,15 @@ def update_profile(current_user):
             if 'remove_profile_picture' in data and data['remove_profile_picture'] == True:
                 # Delete old picture if exists
                 if user_vo.user_profile_picture:
-                    old_path = f"base/static/{folder_name}/{user_vo.user_profile_picture}"
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
+                    stale_pictures.append(user_vo.user_profile_picture)
                 user_vo.user_profile_picture = None
 
-        UserDAO().update_user(user_vo)
+        # Old pictures are deleted by a job, and only once the update commits
+        with transaction():
+            UserDAO().update_user(user_vo)
+            if stale_pictures:
+                delete_media_files.delay(folder_name=folder_name,
+                                         filenames=stale_pictures)
         
         # Return updated user data
         user_data = user_vo.as_dict()
@@ -208,6 +209,8 @@ def update_profile(current_user):
         return jsonify(
             format_response('success', 'Profile updated successfully', user_data)), 200
 
+    except UploadError as e:
+        return jsonify(format_response('error', str(e))), e.status_code
     except Exception as e:
         return jsonify(format_response('error', str(e))), 500
 
@@ -4,12 +4,20 @@ from base import db
 from base.com.vo.appointment_vo import AppointmentVO
 from base.com.vo.property_vo import PropertyVO
 from base.com.vo.user_vo import UserVO
+from base.utils.unit_of_work import commit, update_where
+
+# new status -> statuses an appointment may move to it from
+APPOINTMENT_TRANSITIONS = {
+    'confirmed': ('pending',),
+    'cancelled': ('pending', 'confirmed'),
+    'completed': ('confirmed',),
+}
 
 
 class AppointmentDAO:
     def insert_appointment(self, appointment_vo):
         db.session.add(appointment_vo)
-        db.session.commit()
+        commit()
         return appointment_vo.appointment_id
 
     def get_appointment_by_id(self, appointment_id):
@@ -72,24 +80,31 @@ class AppointmentDAO:
 
     def update_appointment(self, appointment_vo):
         db.session.merge(appointment_vo)
-        db.session.commit()
+        commit()
 
     def delete_appointment(self, appointment_id):
         appointment_vo = AppointmentVO.query.get(appointment_id)
         if appointment_vo:
             db.session.delete(appointment_vo)
-            db.session.commit()
+            commit()
             return True
         return False
 
-    def update_appointment_status(self, appointment_id, status):
-        appointment_vo = AppointmentVO.query.get(appointment_id)
-        if appointment_vo:
-            appointment_vo.appointment_status = status
-            db.session.flush()
-            db.session.commit()
-            return True
-        return False
+    def update_appointment_status(self, appointment_id, status, buyer_id=None,
+                                  seller_id=None):
+        """
+        Move an appointment to status if APPOINTMENT_TRANSITIONS allows it
+        from its current status and, when given, it belongs to buyer_id or
+        seller_id. False when the appointment is missing or a guard fails.
+        """
+        guards = [AppointmentVO.appointment_status.in_(
+            APPOINTMENT_TRANSITIONS[status])]
+        if buyer_id is not None:
+            guards.append(AppointmentVO.buyer_id == buyer_id)
+        if seller_id is not None:
+            guards.append(AppointmentVO.seller_id == seller_id)
+        return update_where(AppointmentVO, appointment_id,
+                            {'appointment_status': status}, *guards) > 0
 
     def get_all_appointments(self):
         appointment_vo_list = db.session.query(AppointmentVO, UserVO, UserVO) \
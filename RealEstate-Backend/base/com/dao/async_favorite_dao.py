@@ -0,0 +1,27 @@
+from base.com.dao.favorite_dao import favorite_ids_cache, \
+    favorite_property_ids_statement
+from base.com.vo.property_stats_vo import PropertyStatsVO
+from base.utils.popularity import popularity_tracker
+
+
+class AsyncFavoriteDAO:
+    """FavoriteDAO read methods over an AsyncSession, sharing its caches"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def get_favorite_property_ids(self, user_id):
+        favorite_ids = favorite_ids_cache.get(user_id)
+        if favorite_ids is None:
+            result = await self.session.execute(
+                favorite_property_ids_statement(user_id))
+            favorite_ids = frozenset(result.scalars())
+            favorite_ids_cache.set(user_id, favorite_ids)
+        return favorite_ids
+
+    async def get_favorite_count_by_property(self, property_id):
+        property_stats_vo = await self.session.get(PropertyStatsVO,
+                                                   property_id)
+        count = property_stats_vo.favorite_count if property_stats_vo else 0
+        favorite_delta, _ = popularity_tracker.get_pending_counts(property_id)
+        return max(0, count + favorite_delta)
@@ -0,0 +1,25 @@
+from base.com.dao.property_dao import listing_rows_statement, \
+    available_listing_rows_statement
+from base.com.vo.property_vo import PropertyVO
+
+
+class AsyncPropertyDAO:
+    """PropertyDAO read methods over an AsyncSession, same return shapes"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def get_property_by_id(self, property_id):
+        property_vo = await self.session.get(PropertyVO, property_id)
+        return property_vo
+
+    async def get_all_properties(self, card=False):
+        result = await self.session.execute(listing_rows_statement(card))
+        property_vo_list = result.all()
+        return property_vo_list
+
+    async def get_available_properties_by_ids(self, property_ids):
+        result = await self.session.execute(
+            available_listing_rows_statement(property_ids))
+        property_vo_list = result.all()
+        return property_vo_list
@@ -0,0 +1,21 @@
+from base.com.dao.review_dao import review_feed_statement, review_feed_page, \
+    rating_stats_statement
+
+
+class AsyncReviewDAO:
+    """ReviewDAO read methods over an AsyncSession, same return shapes"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def get_review_feed(self, property_id, sort='newest', limit=20,
+                              after=None):
+        result = await self.session.execute(
+            review_feed_statement(property_id, sort, limit, after))
+        return review_feed_page(result.all(), sort, limit)
+
+    async def get_property_rating_stats(self, property_id):
+        result = await self.session.execute(
+            rating_stats_statement(property_id))
+        stats = result.first()
+        return stats
@@ -1,11 +1,16 @@
 from base import db
+from base.com.dao.reference_version_dao import ReferenceVersionDAO
 from base.com.vo.category_vo import CategoryVO
+from base.utils.reference_data import reference_data, CATEGORY_REFERENCE
+from base.utils.unit_of_work import after_commit, commit
 
 
 class CategoryDAO:
     def insert_category(self, category_vo):
         db.session.add(category_vo)
-        db.session.commit()
+        ReferenceVersionDAO().bump_version(CATEGORY_REFERENCE)
+        commit()
+        after_commit(reference_data.reload, CATEGORY_REFERENCE)
         return category_vo.category_id
 
     def get_category_by_id(self, category_id):
@@ -22,13 +27,17 @@ class CategoryDAO:
 
     def update_category(self, category_vo):
         db.session.merge(category_vo)
-        db.session.commit()
+        ReferenceVersionDAO().bump_version(CATEGORY_REFERENCE)
+        commit()
+        after_commit(reference_data.reload, CATEGORY_REFERENCE)
 
     def delete_category(self, category_id):
         category_vo = CategoryVO.query.get(category_id)
         if category_vo:
             category_vo.is_active = False
-            db.session.commit()
+            ReferenceVersionDAO().bump_version(CATEGORY_REFERENCE)
+            commit()
+            after_commit(reference_data.reload, CATEGORY_REFERENCE)
             return True
         return False
 
@@ -36,6 +45,8 @@ class CategoryDAO:
         category_vo = CategoryVO.query.get(category_id)
         if category_vo:
             category_vo.is_active = True
-            db.session.commit()
+            ReferenceVersionDAO().bump_version(CATEGORY_REFERENCE)
+            commit()
+            after_commit(reference_data.reload, CATEGORY_REFERENCE)
             return True
         return False
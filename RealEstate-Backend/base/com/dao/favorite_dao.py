@@ -1,23 +1,50 @@
+import os
+
+from sqlalchemy import select
+
 from base import db
 from base.com.vo.favorite_vo import FavoriteVO
+from base.com.dao.property_dao import card_options
+from base.com.dao.property_stats_dao import PropertyStatsDAO
 from base.com.vo.property_vo import PropertyVO
+from base.utils.cache import TTLCache
+from base.utils.popularity import popularity_tracker
+from base.utils.unit_of_work import after_commit, commit
+
+# Writes invalidate only the worker that handled them, so this bounds how
+# long another worker can show a stale is_favorited; it still absorbs the
+# burst of card requests a page view makes
+FAVORITE_IDS_CACHE_SECONDS = float(os.getenv('FAVORITE_IDS_CACHE_SECONDS',
+                                             '5'))
+
+# user_id -> frozenset of favorited property IDs
+favorite_ids_cache = TTLCache(ttl=FAVORITE_IDS_CACHE_SECONDS, max_size=10000)
+
+
+def favorite_property_ids_statement(user_id):
+    return select(FavoriteVO.property_id).where(FavoriteVO.user_id == user_id)
 
 
 class FavoriteDAO:
     def insert_favorite(self, favorite_vo):
         db.session.add(favorite_vo)
-        db.session.commit()
+        commit()
+        after_commit(favorite_ids_cache.invalidate, favorite_vo.user_id)
+        after_commit(popularity_tracker.record_favorite,
+                     favorite_vo.property_id)
         return favorite_vo.favorite_id
 
     def get_favorite_by_id(self, favorite_id):
         favorite_vo = FavoriteVO.query.get(favorite_id)
         return favorite_vo
 
-    def get_favorites_by_user_id(self, user_id):
-        favorite_vo_list = db.session.query(FavoriteVO, PropertyVO) \
+    def get_favorites_by_user_id(self, user_id, card=False):
+        query = db.session.query(FavoriteVO, PropertyVO) \
             .join(PropertyVO, FavoriteVO.property_id == PropertyVO.property_id) \
-            .filter(FavoriteVO.user_id == user_id) \
-            .all()
+            .filter(FavoriteVO.user_id == user_id)
+        if card:
+            query = query.options(*card_options())
+        favorite_vo_list = query.all()
         return favorite_vo_list
 
     def get_favorite_by_user_and_property(self, user_id, property_id):
@@ -34,11 +61,34 @@ class FavoriteDAO:
         ).first()
         return favorite_vo is not None
 
+    def get_favorite_property_ids(self, user_id):
+        """All property IDs the user has favorited, cached per user"""
+        def load():
+            return frozenset(db.session.execute(
+                favorite_property_ids_statement(user_id)).scalars())
+
+        return favorite_ids_cache.get_or_set(user_id, load)
+
+    def get_favorited_property_ids(self, user_id, property_ids):
+        """Subset of property_ids favorited by the user, one IN query on a cache miss"""
+        cached = favorite_ids_cache.get(user_id)
+        if cached is not None:
+            return cached.intersection(property_ids)
+
+        rows = db.session.query(FavoriteVO.property_id) \
+            .filter(FavoriteVO.user_id == user_id) \
+            .filter(FavoriteVO.property_id.in_(property_ids)) \
+            .all()
+        return {row.property_id for row in rows}
+
     def delete_favorite(self, favorite_id):
         favorite_vo = FavoriteVO.query.get(favorite_id)
         if favorite_vo:
             db.session.delete(favorite_vo)
-            db.session.commit()
+            commit()
+            after_commit(favorite_ids_cache.invalidate, favorite_vo.user_id)
+            after_commit(popularity_tracker.record_favorite,
+                         favorite_vo.property_id, -1)
             return True
         return False
 
@@ -49,10 +99,15 @@ class FavoriteDAO:
         ).first()
         if favorite_vo:
             db.session.delete(favorite_vo)
-            db.session.commit()
+            commit()
+            after_commit(favorite_ids_cache.invalidate, user_id)
+            after_commit(popularity_tracker.record_favorite, property_id, -1)
             return True
         return False
 
     def get_favorite_count_by_property(self, property_id):
-        count = FavoriteVO.query.filter_by(property_id=property_id).count()
-        return count
+        property_stats_vo = PropertyStatsDAO().get_stats_by_property_id(
+            property_id)
+        count = property_stats_vo.favorite_count if property_stats_vo else 0
+        favorite_delta, _ = popularity_tracker.get_pending_counts(property_id)
+        return max(0, count + favorite_delta)
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_
+
+from base import db
+from base.com.vo.import_job_vo import ImportJobVO
+from base.utils.unit_of_work import commit, update_where
+
+
+class ImportJobDAO:
+    def insert_import_job(self, import_job_vo):
+        db.session.add(import_job_vo)
+        commit()
+        return import_job_vo.import_job_id
+
+    def get_import_job_by_id(self, import_job_id):
+        import_job_vo = ImportJobVO.query.get(import_job_id)
+        return import_job_vo
+
+    def get_import_jobs_by_user_id(self, user_id):
+        import_job_vo_list = ImportJobVO.query.filter_by(user_id=user_id) \
+            .order_by(ImportJobVO.import_job_id.desc()) \
+            .all()
+        return import_job_vo_list
+
+    def update_import_job(self, import_job_vo):
+        db.session.merge(import_job_vo)
+        commit()
+
+    def claim_import_job(self, import_job_id, stale_before):
+        """
+        Mark a job running unless another run holds it. A running job whose
+        last heartbeat is older than stale_before lost its worker and may be
+        claimed again.
+        """
+        return update_where(
+            ImportJobVO, import_job_id,
+            {'job_status': 'running', 'error_message': None,
+             'updated_date': datetime.utcnow()},
+            or_(ImportJobVO.job_status.in_(('queued', 'failed')),
+                and_(ImportJobVO.job_status == 'running',
+                     ImportJobVO.updated_date < stale_before))) > 0
+
+    def save_import_progress(self, import_job_id, checkpoint, values):
+        """
+        Store progress only if rows_processed is still checkpoint, so a run
+        that was taken over cannot move the checkpoint. Doubles as the
+        running job's heartbeat through updated_date.
+        """
+        return update_where(
+            ImportJobVO, import_job_id,
+            dict(values, updated_date=datetime.utcnow()),
+            ImportJobVO.job_status == 'running',
+            func.coalesce(ImportJobVO.rows_processed, 0) == checkpoint) > 0
+
+    def fail_import_job(self, import_job_id, error_message):
+        return update_where(ImportJobVO, import_job_id,
+                            {'job_status': 'failed',
+                             'error_message': error_message},
+                            ImportJobVO.job_status == 'running') > 0
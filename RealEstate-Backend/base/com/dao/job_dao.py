@@ -0,0 +1,118 @@
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from base import db
+from base.com.vo.job_vo import JobVO
+from base.utils.unit_of_work import commit, savepoint, transaction, \
+    update_where
+
+
+class JobDAO:
+    def insert_job(self, job_vo):
+        """
+        Add a job inside the caller's transaction, if any, so it is only
+        visible to workers once the work that enqueued it commits. Returns
+        the existing job's ID when its idempotency_key was used before.
+        """
+        try:
+            with savepoint():
+                db.session.add(job_vo)
+        except IntegrityError:
+            if job_vo.idempotency_key is None:
+                raise
+            return self.get_job_id_by_idempotency_key(
+                job_vo.idempotency_key)
+        return job_vo.job_id
+
+    def get_job_by_id(self, job_id):
+        job_vo = JobVO.query.get(job_id)
+        return job_vo
+
+    def get_job_id_by_idempotency_key(self, idempotency_key):
+        return db.session.query(JobVO.job_id) \
+            .filter(JobVO.idempotency_key == idempotency_key) \
+            .scalar()
+
+    def claim_jobs(self, worker_id, limit, now):
+        """
+        Mark up to `limit` due jobs running for worker_id, oldest due
+        first, and return them. SKIP LOCKED lets workers claim side by side
+        on MySQL; the status guard keeps a job from being claimed twice on
+        databases without it.
+        """
+        with transaction():
+            job_ids = db.session.execute(
+                select(JobVO.job_id)
+                .where(JobVO.job_status == 'queued', JobVO.run_after <= now)
+                .order_by(JobVO.run_after, JobVO.job_id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)).scalars().all()
+            claimed_ids = [
+                job_id for job_id in job_ids if update_where(
+                    JobVO, job_id,
+                    {'job_status': 'running', 'locked_by': worker_id,
+                     'locked_date': now, 'attempts': JobVO.attempts + 1},
+                    JobVO.job_status == 'queued')]
+        if not claimed_ids:
+            return []
+        job_vo_list = JobVO.query.filter(JobVO.job_id.in_(claimed_ids)) \
+            .populate_existing() \
+            .order_by(JobVO.run_after, JobVO.job_id) \
+            .all()
+        return job_vo_list
+
+    def complete_job(self, job_id, now):
+        return update_where(JobVO, job_id,
+                            {'job_status': 'completed', 'locked_by': None,
+                             'last_error': None, 'completed_date': now},
+                            JobVO.job_status == 'running') > 0
+
+    def retry_job(self, job_id, run_after, error):
+        return update_where(JobVO, job_id,
+                            {'job_status': 'queued', 'locked_by': None,
+                             'run_after': run_after, 'last_error': error},
+                            JobVO.job_status == 'running') > 0
+
+    def fail_job(self, job_id, error, now):
+        return update_where(JobVO, job_id,
+                            {'job_status': 'failed', 'locked_by': None,
+                             'last_error': error, 'completed_date': now},
+                            JobVO.job_status == 'running') > 0
+
+    def requeue_expired_jobs(self, locked_before):
+        """Put jobs back whose worker stopped before finishing them"""
+        updated = JobVO.query.filter(JobVO.job_status == 'running',
+                                     JobVO.locked_date < locked_before) \
+            .update({'job_status': 'queued', 'locked_by': None},
+                    synchronize_session=False)
+        commit()
+        return updated
+
+    def delete_finished_jobs(self, completed_before, limit=1000):
+        """Delete up to `limit` completed or failed jobs older than the cutoff"""
+        job_ids = db.session.execute(
+            select(JobVO.job_id)
+            .where(JobVO.job_status.in_(('completed', 'failed')),
+                   JobVO.completed_date < completed_before)
+            .limit(limit)).scalars().all()
+        if job_ids:
+            JobVO.query.filter(JobVO.job_id.in_(job_ids)) \
+                .delete(synchronize_session=False)
+        commit()
+        return len(job_ids)
+
+    def get_queue_depths(self):
+        """{task_name: queued job count}, including jobs waiting to retry"""
+        rows = db.session.query(JobVO.task_name, func.count(JobVO.job_id)) \
+            .filter(JobVO.job_status == 'queued') \
+            .group_by(JobVO.task_name) \
+            .all()
+        return dict(rows)
+
+    def get_oldest_due_dates(self, now):
+        """{task_name: run_after of the longest waiting due job}"""
+        rows = db.session.query(JobVO.task_name, func.min(JobVO.run_after)) \
+            .filter(JobVO.job_status == 'queued', JobVO.run_after <= now) \
+            .group_by(JobVO.task_name) \
+            .all()
+        return dict(rows)
@@ -1,11 +1,16 @@
 from base import db
+from base.com.dao.reference_version_dao import ReferenceVersionDAO
 from base.com.vo.location_vo import LocationVO
+from base.utils.reference_data import reference_data, LOCATION_REFERENCE
+from base.utils.unit_of_work import after_commit, commit
 
 
 class LocationDAO:
     def insert_location(self, location_vo):
         db.session.add(location_vo)
-        db.session.commit()
+        ReferenceVersionDAO().bump_version(LOCATION_REFERENCE)
+        commit()
+        after_commit(reference_data.reload, LOCATION_REFERENCE)
         return location_vo.location_id
 
     def get_location_by_id(self, location_id):
@@ -36,13 +41,17 @@ class LocationDAO:
 
     def update_location(self, location_vo):
         db.session.merge(location_vo)
-        db.session.commit()
+        ReferenceVersionDAO().bump_version(LOCATION_REFERENCE)
+        commit()
+        after_commit(reference_data.reload, LOCATION_REFERENCE)
 
     def delete_location(self, location_id):
         location_vo = LocationVO.query.get(location_id)
         if location_vo:
             location_vo.is_active = False
-            db.session.commit()
+            ReferenceVersionDAO().bump_version(LOCATION_REFERENCE)
+            commit()
+            after_commit(reference_data.reload, LOCATION_REFERENCE)
             return True
         return False
 
@@ -50,6 +59,8 @@ class LocationDAO:
         location_vo = LocationVO.query.get(location_id)
         if location_vo:
             location_vo.is_active = True
-            db.session.commit()
+            ReferenceVersionDAO().bump_version(LOCATION_REFERENCE)
+            commit()
+            after_commit(reference_data.reload, LOCATION_REFERENCE)
             return True
         return False
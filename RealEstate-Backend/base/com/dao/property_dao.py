@@ -1,36 +1,96 @@
-from sqlalchemy import or_
+from sqlalchemy import and_, func, null, or_, select
+from sqlalchemy.orm import defer, load_only
 
 from base import db
-from base.com.vo.category_vo import CategoryVO
-from base.com.vo.location_vo import LocationVO
 from base.com.vo.property_vo import PropertyVO
 from base.com.vo.user_vo import UserVO
+from base.utils.cache import TTLCache
+from base.utils.popularity import popularity_tracker
+from base.utils.replicas import read_replica
+from base.utils.saved_search_matcher import saved_search_matcher
+from base.utils.similarity import similarity_index
+from base.utils.unit_of_work import after_commit, commit, transaction, \
+    update_where
+
+# (category counts, location counts) of approved, available listings
+listing_counts_cache = TTLCache(ttl=60, max_size=1)
+
+# action -> (eligibility guard, column values; None deletes the row). A
+# guard must exclude rows the action already handled, so a filtered bulk
+# request capped at MAX_BULK_ITEMS continues with the rest when repeated.
+PROPERTY_MODERATION_ACTIONS = {
+    'approve': (PropertyVO.is_approved == False, {'is_approved': True}),
+    'reject': (PropertyVO.is_approved == False, None),
+    'feature': (and_(PropertyVO.is_approved == True,
+                     PropertyVO.is_featured.isnot(True)),
+                {'is_featured': True}),
+}
+
+
+# Unbounded columns that listing cards show only through description_snippet,
+# primary_image and primary_image_metadata
+PROPERTY_HEAVY_COLUMNS = (PropertyVO.property_description, PropertyVO.address,
+                          PropertyVO.property_images,
+                          PropertyVO.property_image_metadata)
+
+
+def card_options():
+    """Loader options leaving PropertyVO.as_card_dict() columns only"""
+    return [defer(column) for column in PROPERTY_HEAVY_COLUMNS]
+
+
+def listing_rows_statement(card=False):
+    """(PropertyVO, UserVO) rows of approved listings; shared with AsyncPropertyDAO"""
+    statement = select(PropertyVO, UserVO) \
+        .join(UserVO, PropertyVO.user_id == UserVO.user_id) \
+        .where(PropertyVO.is_approved == True)
+    if card:
+        # Cards show only the owner's name
+        statement = statement.options(*card_options(),
+                                      load_only(UserVO.user_name))
+    return statement
+
+
+def available_listing_rows_statement(property_ids):
+    return listing_rows_statement() \
+        .where(PropertyVO.property_id.in_(property_ids)) \
+        .where(PropertyVO.property_status == 'available')
 
 
 class PropertyDAO:
     def insert_property(self, property_vo):
         db.session.add(property_vo)
-        db.session.commit()
+        commit()
+        after_commit(listing_counts_cache.invalidate)
+        if property_vo.is_approved:
+            after_commit(saved_search_matcher.publish,
+                         [property_vo.property_id])
         return property_vo.property_id
 
     def get_property_by_id(self, property_id):
         property_vo = PropertyVO.query.get(property_id)
         return property_vo
 
-    def get_all_properties(self):
-        property_vo_list = db.session.query(PropertyVO, UserVO, CategoryVO,
-                                            LocationVO) \
-            .join(UserVO, PropertyVO.user_id == UserVO.user_id) \
-            .join(CategoryVO, PropertyVO.category_id == CategoryVO.category_id) \
-            .join(LocationVO, PropertyVO.location_id == LocationVO.location_id) \
-            .filter(PropertyVO.is_approved == True) \
-            .all()
+    @read_replica
+    def get_all_properties(self, card=False):
+        property_vo_list = db.session.execute(
+            listing_rows_statement(card)).all()
         return property_vo_list
 
-    def get_properties_by_user_id(self, user_id):
-        property_vo_list = PropertyVO.query.filter_by(user_id=user_id).all()
+    @read_replica
+    def get_available_properties_by_ids(self, property_ids):
+        property_vo_list = db.session.execute(
+            available_listing_rows_statement(property_ids)).all()
+        return property_vo_list
+
+    def get_properties_by_user_id(self, user_id, card=False):
+        query = PropertyVO.query.filter_by(user_id=user_id)
+        if card:
+            query = query.options(*card_options())
+        property_vo_list = query.all()
         return property_vo_list
 
+    @read_replica
     def get_properties_by_category_id(self, category_id):
         property_vo_list = PropertyVO.query.filter_by(
             category_id=category_id,
@@ -38,6 +98,7 @@ class PropertyDAO:
         ).all()
         return property_vo_list
 
+    @read_replica
     def get_properties_by_location_id(self, location_id):
         property_vo_list = PropertyVO.query.filter_by(
             location_id=location_id,
@@ -45,6 +106,7 @@ class PropertyDAO:
         ).all()
         return property_vo_list
 
+    @read_replica
     def get_properties_by_type(self, property_type):
         property_vo_list = PropertyVO.query.filter_by(
             property_type=property_type,
@@ -52,6 +114,7 @@ class PropertyDAO:
         ).all()
         return property_vo_list
 
+    @read_replica
     def get_featured_properties(self):
         property_vo_list = PropertyVO.query.filter_by(
             is_featured=True,
@@ -60,6 +123,7 @@ class PropertyDAO:
         ).all()
         return property_vo_list
 
+    @read_replica
     def search_properties(self, filters):
         query = PropertyVO.query.filter_by(is_approved=True)
 
@@ -102,78 +166,188 @@ class PropertyDAO:
         property_vo_list = query.all()
         return property_vo_list
 
+    def get_listing_counts(self):
+        """
+        ({category_id: count}, {location_id: count}) of approved, available
+        listings from one grouped scan of property_table
+        """
+        rows = db.session.query(PropertyVO.category_id, PropertyVO.location_id,
+                                func.count(PropertyVO.property_id)) \
+            .filter(PropertyVO.is_approved == True,
+                    PropertyVO.property_status == 'available') \
+            .group_by(PropertyVO.category_id, PropertyVO.location_id) \
+            .all()
+        category_counts = {}
+        location_counts = {}
+        for category_id, location_id, count in rows:
+            category_counts[category_id] = \
+                category_counts.get(category_id, 0) + count
+            location_counts[location_id] = \
+                location_counts.get(location_id, 0) + count
+        return category_counts, location_counts
+
+    def get_cached_listing_counts(self):
+        return listing_counts_cache.get_or_set('counts',
+                                               self.get_listing_counts)
+
     def update_property(self, property_vo):
         db.session.merge(property_vo)
-        db.session.commit()
+        commit()
+        after_commit(listing_counts_cache.invalidate)
 
     def delete_property(self, property_id):
         property_vo = PropertyVO.query.get(property_id)
         if property_vo:
             db.session.delete(property_vo)
-            db.session.commit()
+            commit()
+            after_commit(listing_counts_cache.invalidate)
+            after_commit(similarity_index.remove, property_id)
+            after_commit(popularity_tracker.forget, [property_id])
             return True
         return False
 
     def approve_property(self, property_id):
-        property_vo = PropertyVO.query.get(property_id)
-        if property_vo:
-            property_vo.is_approved = True
-            db.session.commit()
+        if update_where(PropertyVO, property_id, {'is_approved': True},
+                        PropertyVO.is_approved == False):
+            after_commit(listing_counts_cache.invalidate)
+            after_commit(saved_search_matcher.publish, [property_id])
             return True
-        return False
+        # Already approved also counts as success
+        return self.get_property_by_id(property_id) is not None
 
     def feature_property(self, property_id):
-        property_vo = PropertyVO.query.get(property_id)
-        if property_vo:
-            property_vo.is_featured = True
-            db.session.commit()
-            return True
-        return False
+        return update_where(PropertyVO, property_id,
+                            {'is_featured': True}) > 0
 
-    def update_property_status(self, property_id, status):
-        property_vo = PropertyVO.query.get(property_id)
-        if property_vo:
-            property_vo.property_status = status
-            db.session.commit()
+    def update_property_status(self, property_id, status, user_id=None):
+        """
+        Set property_status, only on user_id's listing when given. False
+        when the property is missing or belongs to someone else.
+        """
+        guards = [PropertyVO.user_id == user_id] if user_id is not None else []
+        if update_where(PropertyVO, property_id, {'property_status': status},
+                        *guards):
+            after_commit(listing_counts_cache.invalidate)
             return True
         return False
 
+    def get_property_image_lists(self):
+        """Stream every listing's property_images list"""
+        rows = db.session.query(PropertyVO.property_images) \
+            .yield_per(1000)
+        return rows
+
+    def get_property_ids_missing_image_metadata(self, after_id=0, limit=100):
+        rows = db.session.query(PropertyVO.property_id) \
+            .filter(PropertyVO.primary_image.isnot(None),
+                    PropertyVO.primary_image_metadata.is_(None),
+                    PropertyVO.property_id > after_id) \
+            .order_by(PropertyVO.property_id) \
+            .limit(limit) \
+            .all()
+        return [row.property_id for row in rows]
+
+    def update_image_metadata(self, property_id, image_metadata,
+                              primary_image_metadata):
+        # SQL NULL rather than JSON null keeps a missing primary entry
+        # visible to get_property_ids_missing_image_metadata; updated_date
+        # is kept since the listing itself did not change
+        return update_where(
+            PropertyVO, property_id,
+            {'property_image_metadata': image_metadata,
+             'primary_image_metadata': primary_image_metadata
+             if primary_image_metadata is not None else null(),
+             'updated_date': PropertyVO.updated_date}) > 0
+
     def get_pending_approvals(self):
         property_vo_list = PropertyVO.query.filter_by(is_approved=False).all()
         return property_vo_list
 
-    def mark_property_sold(self, property_id):
-        property_vo = PropertyVO.query.get(property_id)
-        if property_vo:
-            property_vo.property_status = 'sold'
-            db.session.commit()
-            return True
-        return False
+    def mark_property_sold(self, property_id, user_id=None):
+        return self.update_property_status(property_id, 'sold', user_id)
 
-    def mark_property_pending(self, property_id):
-        property_vo = PropertyVO.query.get(property_id)
-        if property_vo:
-            property_vo.property_status = 'pending'
-            db.session.commit()
-            return True
-        return False
+    def mark_property_pending(self, property_id, user_id=None):
+        return self.update_property_status(property_id, 'pending', user_id)
 
+    @read_replica
     def get_sold_properties(self):
-        property_vo_list = db.session.query(PropertyVO, UserVO, CategoryVO,
-                                            LocationVO) \
+        property_vo_list = db.session.query(PropertyVO, UserVO) \
             .join(UserVO, PropertyVO.user_id == UserVO.user_id) \
-            .join(CategoryVO, PropertyVO.category_id == CategoryVO.category_id) \
-            .join(LocationVO, PropertyVO.location_id == LocationVO.location_id) \
             .filter(PropertyVO.property_status == 'sold') \
             .all()
         return property_vo_list
 
+    @read_replica
     def get_pending_properties(self):
-        property_vo_list = db.session.query(PropertyVO, UserVO, CategoryVO,
-                                            LocationVO) \
+        property_vo_list = db.session.query(PropertyVO, UserVO) \
             .join(UserVO, PropertyVO.user_id == UserVO.user_id) \
-            .join(CategoryVO, PropertyVO.category_id == CategoryVO.category_id) \
-            .join(LocationVO, PropertyVO.location_id == LocationVO.location_id) \
             .filter(PropertyVO.property_status == 'pending') \
             .all()
         return property_vo_list
+
+    def get_pending_approvals_page(self, limit=20, after_id=None):
+        query = PropertyVO.query.filter_by(is_approved=False)
+        if after_id:
+            query = query.filter(PropertyVO.property_id > after_id)
+        property_vo_list = query.order_by(PropertyVO.property_id) \
+            .limit(limit) \
+            .all()
+        return property_vo_list
+
+    def get_moderation_property_ids(self, action, filters, limit):
+        guard, _ = PROPERTY_MODERATION_ACTIONS[action]
+        query = db.session.query(PropertyVO.property_id).filter(guard)
+
+        if filters.get('user_id'):
+            query = query.filter(PropertyVO.user_id == filters['user_id'])
+
+        if filters.get('category_id'):
+            query = query.filter(
+                PropertyVO.category_id == filters['category_id'])
+
+        if filters.get('location_id'):
+            query = query.filter(
+                PropertyVO.location_id == filters['location_id'])
+
+        if filters.get('created_after'):
+            query = query.filter(
+                PropertyVO.created_date >= filters['created_after'])
+
+        if filters.get('created_before'):
+            query = query.filter(
+                PropertyVO.created_date < filters['created_before'])
+
+        rows = query.order_by(PropertyVO.property_id).limit(limit).all()
+        return [row.property_id for row in rows]
+
+    def bulk_moderate_properties(self, property_ids, action):
+        """
+        Apply a moderation action to many properties in one transaction.
+        Returns {property_id: 'done' | 'skipped' | 'not_found'}.
+        """
+        guard, values = PROPERTY_MODERATION_ACTIONS[action]
+        with transaction():
+            rows = db.session.query(PropertyVO.property_id,
+                                    guard.label('eligible')) \
+                .filter(PropertyVO.property_id.in_(property_ids)) \
+                .with_for_update() \
+                .all()
+            found = {row.property_id: bool(row.eligible) for row in rows}
+            eligible_ids = [pid for pid, eligible in found.items() if eligible]
+
+            if eligible_ids:
+                query = PropertyVO.query.filter(
+                    PropertyVO.property_id.in_(eligible_ids), guard)
+                if values is None:
+                    query.delete(synchronize_session=False)
+                else:
+                    query.update(values, synchronize_session=False)
+            after_commit(listing_counts_cache.invalidate)
+            if values is None and eligible_ids:
+                after_commit(popularity_tracker.forget, eligible_ids)
+            if action == 'approve' and eligible_ids:
+                after_commit(saved_search_matcher.publish, eligible_ids)
+
+        return {pid: 'not_found' if pid not in found else
+                'done' if found[pid] else 'skipped'
+                for pid in property_ids}
@@ -0,0 +1,118 @@
+import math
+
+from sqlalchemy.exc import IntegrityError
+
+from base import db
+from base.com.vo.favorite_vo import FavoriteVO
+from base.com.vo.property_stats_vo import PropertyStatsVO
+from base.com.vo.property_vo import PropertyVO
+from base.utils.unit_of_work import savepoint, transaction
+
+
+class PropertyStatsDAO:
+    def get_stats_by_property_id(self, property_id):
+        property_stats_vo = PropertyStatsVO.query.get(property_id)
+        return property_stats_vo
+
+    def get_stats_by_property_ids(self, property_ids):
+        property_stats_vo_list = PropertyStatsVO.query.filter(
+            PropertyStatsVO.property_id.in_(property_ids)).all()
+        return {stats.property_id: stats for stats in property_stats_vo_list}
+
+    def get_trending_scores(self):
+        rows = db.session.query(PropertyStatsVO.property_id,
+                                PropertyStatsVO.trending_score,
+                                PropertyStatsVO.trending_updated_date) \
+            .filter(PropertyStatsVO.trending_score > 0) \
+            .yield_per(1000)
+        return rows
+
+    def count_stats_rows(self):
+        return PropertyStatsVO.query.count()
+
+    def apply_stat_deltas(self, deltas, decay_rate, now):
+        """
+        Merge {property_id: (favorite_delta, view_delta, score_delta)} into
+        property_stats_table with one locking read, one batched UPDATE and
+        one batched INSERT. Stored scores are decayed to `now` before adding.
+        Deltas of properties deleted since they were recorded are dropped:
+        their rows could never be inserted, and retrying them would block
+        every later flush.
+        """
+        existing = {
+            stats.property_id: stats for stats in db.session.query(
+                PropertyStatsVO.property_id, PropertyStatsVO.favorite_count,
+                PropertyStatsVO.view_count, PropertyStatsVO.trending_score,
+                PropertyStatsVO.trending_updated_date)
+            .filter(PropertyStatsVO.property_id.in_(list(deltas)))
+            .with_for_update()
+        }
+
+        new_ids = [property_id for property_id in deltas
+                   if property_id not in existing]
+        # The shared lock keeps these from being deleted before the INSERT
+        live_ids = {row.property_id for row in db.session.query(
+            PropertyVO.property_id)
+            .filter(PropertyVO.property_id.in_(new_ids))
+            .with_for_update(read=True)} if new_ids else set()
+
+        update_mappings = []
+        insert_mappings = []
+        for property_id, (favorite_delta, view_delta, score_delta) in deltas.items():
+            stats = existing.get(property_id)
+            if stats is None:
+                if property_id not in live_ids:
+                    continue
+                insert_mappings.append({
+                    'property_id': property_id,
+                    'favorite_count': max(0, favorite_delta),
+                    'view_count': max(0, view_delta),
+                    'trending_score': max(0.0, score_delta),
+                    'trending_updated_date': now
+                })
+                continue
+
+            elapsed = (now - stats.trending_updated_date).total_seconds() \
+                if stats.trending_updated_date else 0
+            score = stats.trending_score * math.exp(
+                -decay_rate * max(0.0, elapsed))
+            update_mappings.append({
+                'property_id': property_id,
+                'favorite_count': max(0, stats.favorite_count + favorite_delta),
+                'view_count': max(0, stats.view_count + view_delta),
+                'trending_score': max(0.0, score + score_delta),
+                'trending_updated_date': now
+            })
+
+        with transaction():
+            if update_mappings:
+                db.session.bulk_update_mappings(PropertyStatsVO,
+                                                update_mappings)
+            if insert_mappings:
+                db.session.bulk_insert_mappings(PropertyStatsVO,
+                                                insert_mappings)
+
+    def backfill_favorite_stats(self, favorite_weight, decay_rate, now):
+        """One-time seed of counts and decayed scores from favorite_table"""
+        totals = {}
+        for property_id, created_date in db.session.query(
+                FavoriteVO.property_id, FavoriteVO.created_date) \
+                .yield_per(1000):
+            age = (now - created_date).total_seconds() if created_date else 0
+            count, score = totals.get(property_id, (0, 0.0))
+            totals[property_id] = (count + 1, score + favorite_weight * math.exp(
+                -decay_rate * max(0.0, age)))
+
+        try:
+            with savepoint():
+                db.session.bulk_insert_mappings(PropertyStatsVO, [{
+                    'property_id': property_id,
+                    'favorite_count': count,
+                    'view_count': 0,
+                    'trending_score': score,
+                    'trending_updated_date': now
+                } for property_id, (count, score) in totals.items()])
+        except IntegrityError:
+            # Another worker seeded the table first
+            return 0
+        return len(totals)
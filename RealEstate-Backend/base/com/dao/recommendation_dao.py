@@ -0,0 +1,29 @@
+from base import db
+from base.com.vo.recommendation_vo import RecommendationVO
+from base.utils.unit_of_work import commit, transaction
+
+
+class RecommendationDAO:
+    def get_recommended_property_ids(self, user_id, limit=20):
+        rows = db.session.query(RecommendationVO.property_id) \
+            .filter(RecommendationVO.user_id == user_id) \
+            .order_by(RecommendationVO.recommendation_rank) \
+            .limit(limit) \
+            .all()
+        return [row.property_id for row in rows]
+
+    def replace_recommendations(self, user_ids, mappings):
+        """Swap the stored lists of user_ids for mappings in one transaction"""
+        with transaction():
+            RecommendationVO.query.filter(
+                RecommendationVO.user_id.in_(user_ids)) \
+                .delete(synchronize_session=False)
+            if mappings:
+                db.session.bulk_insert_mappings(RecommendationVO, mappings)
+
+    def delete_recommendations_before(self, created_date):
+        """Drop lists left over from earlier runs (users with no signal now)"""
+        RecommendationVO.query.filter(
+            RecommendationVO.created_date < created_date) \
+            .delete(synchronize_session=False)
+        commit()
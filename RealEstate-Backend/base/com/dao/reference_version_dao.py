@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from base import db
+from base.com.vo.reference_version_vo import ReferenceVersionVO
+from base.utils.unit_of_work import savepoint
+
+
+class ReferenceVersionDAO:
+    def get_versions(self, session=None):
+        rows = (session or db.session).query(ReferenceVersionVO.reference_name,
+                                ReferenceVersionVO.reference_version).all()
+        return {row.reference_name: row.reference_version for row in rows}
+
+    def ensure_versions(self, reference_names):
+        """Create missing version rows; concurrent creators are ignored"""
+        existing = self.get_versions()
+        for reference_name in reference_names:
+            if reference_name in existing:
+                continue
+            try:
+                with savepoint():
+                    db.session.add(ReferenceVersionVO(
+                        reference_name=reference_name, reference_version=0))
+            except IntegrityError:
+                pass
+
+    def bump_version(self, reference_name):
+        """
+        Increment a version row inside the caller's transaction; the
+        caller commits it together with the reference data change.
+        """
+        updated = ReferenceVersionVO.query.filter_by(
+            reference_name=reference_name).update(
+            {'reference_version': ReferenceVersionVO.reference_version + 1,
+             'updated_date': datetime.utcnow()},
+            synchronize_session=False)
+        if not updated:
+            db.session.add(ReferenceVersionVO(reference_name=reference_name,
+                                              reference_version=1))
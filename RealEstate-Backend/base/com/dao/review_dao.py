@@ -1,21 +1,96 @@
-from sqlalchemy import func
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select
 
 from base import db
 from base.com.vo.property_vo import PropertyVO
 from base.com.vo.review_vo import ReviewVO
 from base.com.vo.user_vo import UserVO
+from base.utils.cache import TTLCache
+from base.utils.replicas import read_replica
+from base.utils.unit_of_work import after_commit, commit, transaction, \
+    update_where
+
+REVIEW_FEED_SORTS = ('newest', 'rating')
+
+# action -> (eligibility guard, column values; None deletes the row)
+REVIEW_MODERATION_ACTIONS = {
+    'approve': (ReviewVO.is_approved == False, {'is_approved': True}),
+    'reject': (ReviewVO.is_approved == False, None),
+}
+
+recent_reviews_cache = TTLCache(ttl=60, max_size=32)
+
+
+def review_feed_statement(property_id, sort, limit, after):
+    """One page (plus a look-ahead row) of the review feed; shared with AsyncReviewDAO"""
+    statement = select(ReviewVO.review_id, ReviewVO.rating, ReviewVO.comment,
+                       ReviewVO.created_date, ReviewVO.user_id,
+                       ReviewVO.property_id, UserVO.user_name) \
+        .join(UserVO, ReviewVO.user_id == UserVO.user_id) \
+        .where(ReviewVO.property_id == property_id) \
+        .where(ReviewVO.is_approved == True)
+
+    if sort == 'rating':
+        if after:
+            rating = int(after[0])
+            created_date = datetime.fromisoformat(after[1])
+            review_id = int(after[2])
+            statement = statement.where(or_(
+                ReviewVO.rating < rating,
+                and_(ReviewVO.rating == rating,
+                     ReviewVO.created_date < created_date),
+                and_(ReviewVO.rating == rating,
+                     ReviewVO.created_date == created_date,
+                     ReviewVO.review_id < review_id)))
+        statement = statement.order_by(ReviewVO.rating.desc(),
+                                       ReviewVO.created_date.desc(),
+                                       ReviewVO.review_id.desc())
+    else:
+        if after:
+            created_date = datetime.fromisoformat(after[0])
+            review_id = int(after[1])
+            statement = statement.where(or_(
+                ReviewVO.created_date < created_date,
+                and_(ReviewVO.created_date == created_date,
+                     ReviewVO.review_id < review_id)))
+        statement = statement.order_by(ReviewVO.created_date.desc(),
+                                       ReviewVO.review_id.desc())
+
+    return statement.limit(limit + 1)
+
+
+def review_feed_page(rows, sort, limit):
+    """Split the look-ahead row off; returns (rows, next_cursor or None)"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = [last.created_date.isoformat(), last.review_id]
+    if sort == 'rating':
+        next_cursor.insert(0, last.rating)
+    return rows, next_cursor
+
+
+def rating_stats_statement(property_id):
+    return select(func.count(ReviewVO.review_id).label('total_reviews'),
+                  func.avg(ReviewVO.rating).label('average_rating')) \
+        .where(ReviewVO.property_id == property_id,
+               ReviewVO.is_approved == True)
 
 
 class ReviewDAO:
     def insert_review(self, review_vo):
         db.session.add(review_vo)
-        db.session.commit()
+        commit()
         return review_vo.review_id
 
     def get_review_by_id(self, review_id):
         review_vo = ReviewVO.query.get(review_id)
         return review_vo
 
+    @read_replica
     def get_reviews_by_property_id(self, property_id):
         review_vo_list = db.session.query(ReviewVO, UserVO) \
             .join(UserVO, ReviewVO.user_id == UserVO.user_id) \
@@ -24,6 +99,18 @@ class ReviewDAO:
             .all()
         return review_vo_list
 
+    @read_replica
+    def get_review_feed(self, property_id, sort='newest', limit=20,
+                        after=None):
+        """
+        Keyset-paginated approved reviews with only the author name joined.
+        `after` is the cursor list returned by a previous call.
+        Returns (rows, next_cursor) where next_cursor is None on the last page.
+        """
+        rows = db.session.execute(
+            review_feed_statement(property_id, sort, limit, after)).all()
+        return review_feed_page(rows, sort, limit)
+
     def get_reviews_by_user_id(self, user_id):
         review_vo_list = ReviewVO.query.filter_by(user_id=user_id).all()
         return review_vo_list
@@ -39,38 +126,110 @@ class ReviewDAO:
         review_vo_list = ReviewVO.query.filter_by(is_approved=False).all()
         return review_vo_list
 
+    def get_pending_reviews_page(self, limit=20, after_id=None):
+        query = db.session.query(ReviewVO, UserVO.user_name,
+                                 PropertyVO.property_title) \
+            .join(UserVO, ReviewVO.user_id == UserVO.user_id) \
+            .join(PropertyVO, ReviewVO.property_id == PropertyVO.property_id) \
+            .filter(ReviewVO.is_approved == False)
+        if after_id:
+            query = query.filter(ReviewVO.review_id > after_id)
+        review_vo_list = query.order_by(ReviewVO.review_id) \
+            .limit(limit) \
+            .all()
+        return review_vo_list
+
+    def get_moderation_review_ids(self, action, filters, limit):
+        guard, _ = REVIEW_MODERATION_ACTIONS[action]
+        query = db.session.query(ReviewVO.review_id).filter(guard)
+
+        if filters.get('property_id'):
+            query = query.filter(
+                ReviewVO.property_id == filters['property_id'])
+
+        if filters.get('user_id'):
+            query = query.filter(ReviewVO.user_id == filters['user_id'])
+
+        if filters.get('min_rating'):
+            query = query.filter(ReviewVO.rating >= filters['min_rating'])
+
+        if filters.get('max_rating'):
+            query = query.filter(ReviewVO.rating <= filters['max_rating'])
+
+        if filters.get('created_after'):
+            query = query.filter(
+                ReviewVO.created_date >= filters['created_after'])
+
+        if filters.get('created_before'):
+            query = query.filter(
+                ReviewVO.created_date < filters['created_before'])
+
+        rows = query.order_by(ReviewVO.review_id).limit(limit).all()
+        return [row.review_id for row in rows]
+
+    def bulk_moderate_reviews(self, review_ids, action):
+        """
+        Apply a moderation action to many reviews in one transaction.
+        Returns {review_id: 'done' | 'skipped' | 'not_found'}.
+        """
+        guard, values = REVIEW_MODERATION_ACTIONS[action]
+        with transaction():
+            rows = db.session.query(ReviewVO.review_id,
+                                    guard.label('eligible')) \
+                .filter(ReviewVO.review_id.in_(review_ids)) \
+                .with_for_update() \
+                .all()
+            found = {row.review_id: bool(row.eligible) for row in rows}
+            eligible_ids = [rid for rid, eligible in found.items() if eligible]
+
+            if eligible_ids:
+                query = ReviewVO.query.filter(
+                    ReviewVO.review_id.in_(eligible_ids), guard)
+                if values is None:
+                    query.delete(synchronize_session=False)
+                else:
+                    query.update(values, synchronize_session=False)
+                after_commit(recent_reviews_cache.invalidate)
+        return {rid: 'not_found' if rid not in found else
+                'done' if found[rid] else 'skipped'
+                for rid in review_ids}
+
+    @read_replica
     def get_property_rating_stats(self, property_id):
-        stats = db.session.query(
-            func.count(ReviewVO.review_id).label('total_reviews'),
-            func.avg(ReviewVO.rating).label('average_rating')
-        ).filter(
-            ReviewVO.property_id == property_id,
-            ReviewVO.is_approved == True
-        ).first()
+        stats = db.session.execute(
+            rating_stats_statement(property_id)).first()
         return stats
 
     def update_review(self, review_vo):
         db.session.merge(review_vo)
-        db.session.commit()
+        commit()
+        after_commit(recent_reviews_cache.invalidate)
 
     def delete_review(self, review_id):
         review_vo = ReviewVO.query.get(review_id)
         if review_vo:
             db.session.delete(review_vo)
-            db.session.commit()
+            commit()
+            after_commit(recent_reviews_cache.invalidate)
             return True
         return False
 
     def approve_review(self, review_id):
-        review_vo = ReviewVO.query.get(review_id)
-        if review_vo:
-            review_vo.is_approved = True
-            db.session.commit()
+        if update_where(ReviewVO, review_id, {'is_approved': True},
+                        ReviewVO.is_approved == False):
+            after_commit(recent_reviews_cache.invalidate)
             return True
-        return False
+        # Already approved also counts as success
+        return self.get_review_by_id(review_id) is not None
 
     def get_recent_reviews(self, limit=10):
-        review_vo_list = db.session.query(ReviewVO, UserVO, PropertyVO) \
+        review_vo_list = db.session.query(ReviewVO.review_id, ReviewVO.rating,
+                                          ReviewVO.comment,
+                                          ReviewVO.created_date,
+                                          ReviewVO.user_id,
+                                          ReviewVO.property_id,
+                                          UserVO.user_name,
+                                          PropertyVO.property_title) \
             .join(UserVO, ReviewVO.user_id == UserVO.user_id) \
             .join(PropertyVO, ReviewVO.property_id == PropertyVO.property_id) \
             .filter(ReviewVO.is_approved == True) \
@@ -78,3 +237,7 @@ class ReviewDAO:
             .limit(limit) \
             .all()
         return review_vo_list
+
+    def get_cached_recent_reviews(self, limit=10):
+        return recent_reviews_cache.get_or_set(
+            limit, lambda: self.get_recent_reviews(limit))
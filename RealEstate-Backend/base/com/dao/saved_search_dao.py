@@ -0,0 +1,35 @@
+from base import db
+from base.com.vo.saved_search_vo import SavedSearchVO
+from base.utils.saved_search_matcher import saved_search_matcher
+from base.utils.unit_of_work import after_commit, commit
+
+
+class SavedSearchDAO:
+    def insert_saved_search(self, saved_search_vo):
+        db.session.add(saved_search_vo)
+        commit()
+        after_commit(saved_search_matcher.add, saved_search_vo.saved_search_id,
+                     saved_search_vo.user_id, saved_search_vo.search_filters)
+        return saved_search_vo.saved_search_id
+
+    def get_saved_search_by_id(self, saved_search_id):
+        saved_search_vo = SavedSearchVO.query.get(saved_search_id)
+        return saved_search_vo
+
+    def get_saved_searches_by_user_id(self, user_id):
+        saved_search_vo_list = SavedSearchVO.query.filter_by(
+            user_id=user_id, is_active=True).all()
+        return saved_search_vo_list
+
+    def count_saved_searches_by_user_id(self, user_id):
+        return SavedSearchVO.query.filter_by(user_id=user_id,
+                                             is_active=True).count()
+
+    def delete_saved_search(self, saved_search_id):
+        saved_search_vo = SavedSearchVO.query.get(saved_search_id)
+        if saved_search_vo:
+            db.session.delete(saved_search_vo)
+            commit()
+            after_commit(saved_search_matcher.remove, saved_search_id)
+            return True
+        return False
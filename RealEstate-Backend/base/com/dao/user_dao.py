@@ -1,11 +1,12 @@
 from base import db
 from base.com.vo.user_vo import UserVO
+from base.utils.unit_of_work import commit, update_where
 
 
 class UserDAO:
     def insert_user(self, user_vo):
         db.session.add(user_vo)
-        db.session.commit()
+        commit()
         return user_vo.user_id
 
     def get_user_by_id(self, user_id):
@@ -24,30 +25,27 @@ class UserDAO:
         user_vo_list = UserVO.query.filter_by(user_role=user_role).all()
         return user_vo_list
 
+    def get_profile_pictures(self):
+        """Stream every stored profile picture filename"""
+        rows = db.session.query(UserVO.user_profile_picture) \
+            .filter(UserVO.user_profile_picture.isnot(None)) \
+            .yield_per(1000)
+        return rows
+
     def update_user(self, user_vo):
         db.session.merge(user_vo)
-        db.session.commit()
+        commit()
 
     def delete_user(self, user_id):
         user_vo = UserVO.query.get(user_id)
         if user_vo:
             db.session.delete(user_vo)
-            db.session.commit()
+            commit()
             return True
         return False
 
     def update_user_role(self, user_id, new_role):
-        user_vo = UserVO.query.get(user_id)
-        if user_vo:
-            user_vo.user_role = new_role
-            db.session.commit()
-            return True
-        return False
+        return update_where(UserVO, user_id, {'user_role': new_role}) > 0
 
     def verify_user(self, user_id):
-        user_vo = UserVO.query.get(user_id)
-        if user_vo:
-            user_vo.is_verified = True
-            db.session.commit()
-            return True
-        return False
+        return update_where(UserVO, user_id, {'is_verified': True}) > 0
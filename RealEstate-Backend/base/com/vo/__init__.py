@@ -4,4 +4,11 @@ from base.com.vo.location_vo import LocationVO
 from base.com.vo.property_vo import PropertyVO
 from base.com.vo.review_vo import ReviewVO
 from base.com.vo.appointment_vo import AppointmentVO
-from base.com.vo.favorite_vo import FavoriteVO
\ No newline at end of file
+from base.com.vo.favorite_vo import FavoriteVO
+from base.com.vo.import_job_vo import ImportJobVO
+from base.com.vo.property_stats_vo import PropertyStatsVO
+from base.com.vo.recommendation_vo import RecommendationVO
+from base.com.vo.saved_search_vo import SavedSearchVO
+from base.com.vo.reference_version_vo import ReferenceVersionVO
+from base.com.vo.schema_migration_vo import SchemaMigrationVO
+from base.com.vo.job_vo import JobVO
\ No newline at end of file
@@ -29,6 +29,11 @@ class AppointmentVO(db.Model):
                             db.ForeignKey(PropertyVO.property_id,
                                           ondelete='CASCADE'), nullable=False)
 
+    # Slot conflict checks and a property's upcoming appointments
+    __table_args__ = (db.Index('idx_appointment_property_slot',
+                               'property_id', 'appointment_date',
+                               'appointment_time'),)
+
     def as_dict(self):
         return {
             'appointment_id': self.appointment_id,
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from base import db
+from base.com.vo.user_vo import UserVO
+
+
+class ImportJobVO(db.Model):
+    __tablename__ = 'import_job_table'
+    import_job_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    source_format = db.Column('source_format', db.Enum('csv', 'jsonl'),
+                              nullable=False)
+    source_path = db.Column('source_path', db.String(255), nullable=False)
+    archive_path = db.Column('archive_path', db.String(255), nullable=True)
+    job_status = db.Column('job_status',
+                           db.Enum('queued', 'running', 'completed',
+                                   'failed'), default='queued')
+    rows_processed = db.Column('rows_processed', db.Integer, default=0)
+    rows_imported = db.Column('rows_imported', db.Integer, default=0)
+    rows_failed = db.Column('rows_failed', db.Integer, default=0)
+    row_errors = db.Column('row_errors', db.JSON,
+                           nullable=True)  # Array of {row, error}
+    error_message = db.Column('error_message', db.Text, nullable=True)
+    created_date = db.Column('created_date', db.DateTime,
+                             default=datetime.utcnow)
+    updated_date = db.Column('updated_date', db.DateTime,
+                             default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Foreign Keys
+    user_id = db.Column('user_id', db.Integer,
+                        db.ForeignKey(UserVO.user_id, ondelete='CASCADE'),
+                        nullable=False)
+
+    def as_dict(self):
+        return {
+            'import_job_id': self.import_job_id,
+            'source_format': self.source_format,
+            'job_status': self.job_status,
+            'rows_processed': self.rows_processed,
+            'rows_imported': self.rows_imported,
+            'rows_failed': self.rows_failed,
+            'row_errors': self.row_errors or [],
+            'error_message': self.error_message,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None,
+            'user_id': self.user_id
+        }
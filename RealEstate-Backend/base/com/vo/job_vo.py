@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from base import db
+
+
+class JobVO(db.Model):
+    __tablename__ = 'job_table'
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    task_name = db.Column('task_name', db.String(100), nullable=False)
+    payload = db.Column('payload', db.JSON,
+                        nullable=False)  # Task keyword arguments
+    job_status = db.Column('job_status',
+                           db.Enum('queued', 'running', 'completed',
+                                   'failed'), default='queued')
+    attempts = db.Column('attempts', db.Integer, default=0)
+    max_attempts = db.Column('max_attempts', db.Integer, nullable=False)
+    idempotency_key = db.Column('idempotency_key', db.String(255),
+                                unique=True, nullable=True)
+    run_after = db.Column('run_after', db.DateTime, default=datetime.utcnow)
+    locked_by = db.Column('locked_by', db.String(100), nullable=True)
+    locked_date = db.Column('locked_date', db.DateTime, nullable=True)
+    last_error = db.Column('last_error', db.Text, nullable=True)
+    completed_date = db.Column('completed_date', db.DateTime, nullable=True)
+    created_date = db.Column('created_date', db.DateTime,
+                             default=datetime.utcnow)
+    updated_date = db.Column('updated_date', db.DateTime,
+                             default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Due jobs in the order workers claim them
+    __table_args__ = (db.Index('idx_job_status_run_after', 'job_status',
+                               'run_after'),)
+
+    def as_dict(self):
+        return {
+            'job_id': self.job_id,
+            'task_name': self.task_name,
+            'payload': self.payload,
+            'job_status': self.job_status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'idempotency_key': self.idempotency_key,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'last_error': self.last_error,
+            'completed_date': self.completed_date.isoformat() if self.completed_date else None,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None
+        }
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from base import db
+from base.com.vo.property_vo import PropertyVO
+
+
+class PropertyStatsVO(db.Model):
+    __tablename__ = 'property_stats_table'
+    property_id = db.Column('property_id', db.Integer,
+                            db.ForeignKey(PropertyVO.property_id,
+                                          ondelete='CASCADE'),
+                            primary_key=True, autoincrement=False)
+    favorite_count = db.Column('favorite_count', db.Integer, default=0,
+                               nullable=False)
+    view_count = db.Column('view_count', db.Integer, default=0,
+                           nullable=False)
+    # Time-decayed popularity as of trending_updated_date
+    trending_score = db.Column('trending_score', db.Float, default=0,
+                               nullable=False)
+    trending_updated_date = db.Column('trending_updated_date', db.DateTime,
+                                      default=datetime.utcnow)
+
+    def as_dict(self):
+        return {
+            'property_id': self.property_id,
+            'favorite_count': self.favorite_count,
+            'view_count': self.view_count,
+            'trending_score': self.trending_score,
+            'trending_updated_date': self.trending_updated_date.isoformat() if self.trending_updated_date else None
+        }
@@ -1,10 +1,32 @@
 from datetime import datetime
 
+from sqlalchemy.orm import validates
+
 from base import db
 from base.com.vo.category_vo import CategoryVO
 from base.com.vo.location_vo import LocationVO
 from base.com.vo.user_vo import UserVO
 
+# Also the SUBSTR length of the migration that backfilled the column
+DESCRIPTION_SNIPPET_LENGTH = 200
+
+
+def make_description_snippet(description):
+    return description[:DESCRIPTION_SNIPPET_LENGTH] if description else None
+
+
+def first_image(images):
+    return images[0] if images else None
+
+
+def _insert_parameter(function, name):
+    # Column default computed from the row's own values, so bulk inserts
+    # that bypass the ORM validators are covered too
+    def default(context):
+        return function(context.get_current_parameters().get(name))
+
+    return default
+
 
 class PropertyVO(db.Model):
     __tablename__ = 'property_table'
@@ -28,6 +50,22 @@ class PropertyVO(db.Model):
     furnished = db.Column('furnished', db.Boolean, default=False)
     property_images = db.Column('property_images', db.JSON,
                                 nullable=True)  # Array of image filenames
+    # Copies of the heavy columns' card-sized parts, so list views can
+    # leave the Text and JSON columns unread
+    description_snippet = db.Column(
+        'description_snippet', db.String(DESCRIPTION_SNIPPET_LENGTH),
+        nullable=True, default=_insert_parameter(make_description_snippet,
+                                                 'property_description'))
+    primary_image = db.Column('primary_image', db.String(255), nullable=True,
+                              default=_insert_parameter(first_image,
+                                                        'property_images'))
+    # Written by the describe_property_images task: {filename: {width,
+    # height, dominant_color, placeholder, variants}} and the primary
+    # image's entry on its own for cards
+    property_image_metadata = db.Column('property_image_metadata', db.JSON,
+                                        nullable=True)
+    primary_image_metadata = db.Column('primary_image_metadata', db.JSON,
+                                       nullable=True)
     property_status = db.Column('property_status',
                                 db.Enum('available', 'sold', 'rented',
                                         'pending'), default='available')
@@ -49,6 +87,51 @@ class PropertyVO(db.Model):
                             db.ForeignKey(LocationVO.location_id,
                                           ondelete='CASCADE'), nullable=False)
 
+    # Approved listings by status, newest first
+    __table_args__ = (db.Index('idx_property_approved_status_created',
+                               'is_approved', 'property_status',
+                               'created_date'),)
+
+    @validates('property_description')
+    def validate_property_description(self, key, property_description):
+        self.description_snippet = make_description_snippet(
+            property_description)
+        return property_description
+
+    @validates('property_images')
+    def validate_property_images(self, key, property_images):
+        self.primary_image = first_image(property_images)
+        return property_images
+
+    def as_card_dict(self):
+        """as_dict without the deferred heavy columns, for listing cards"""
+        return {
+            'property_id': self.property_id,
+            'property_title': self.property_title,
+            'description_snippet': self.description_snippet,
+            'property_type': self.property_type,
+            'price': self.price,
+            'bedrooms': self.bedrooms,
+            'bathrooms': self.bathrooms,
+            'area_sqft': self.area_sqft,
+            'year_built': self.year_built,
+            'parking_spots': self.parking_spots,
+            'has_garden': self.has_garden,
+            'has_pool': self.has_pool,
+            'pet_friendly': self.pet_friendly,
+            'furnished': self.furnished,
+            'primary_image': self.primary_image,
+            'primary_image_metadata': self.primary_image_metadata,
+            'property_status': self.property_status,
+            'is_featured': self.is_featured,
+            'is_approved': self.is_approved,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None,
+            'user_id': self.user_id,
+            'category_id': self.category_id,
+            'location_id': self.location_id
+        }
+
     def as_dict(self):
         return {
             'property_id': self.property_id,
@@ -67,6 +150,7 @@ class PropertyVO(db.Model):
             'pet_friendly': self.pet_friendly,
             'furnished': self.furnished,
             'property_images': self.property_images,
+            'property_image_metadata': self.property_image_metadata,
             'property_status': self.property_status,
             'is_featured': self.is_featured,
             'is_approved': self.is_approved,
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from base import db
+from base.com.vo.property_vo import PropertyVO
+from base.com.vo.user_vo import UserVO
+
+
+class RecommendationVO(db.Model):
+    __tablename__ = 'recommendation_table'
+    recommendation_id = db.Column(db.Integer, primary_key=True,
+                                  autoincrement=True)
+    recommendation_rank = db.Column('recommendation_rank', db.SmallInteger,
+                                    nullable=False)
+    recommendation_score = db.Column('recommendation_score', db.Float,
+                                     nullable=False)
+    created_date = db.Column('created_date', db.DateTime,
+                             default=datetime.utcnow)
+
+    # Foreign Keys
+    user_id = db.Column('user_id', db.Integer,
+                        db.ForeignKey(UserVO.user_id, ondelete='CASCADE'),
+                        nullable=False)
+    property_id = db.Column('property_id', db.Integer,
+                            db.ForeignKey(PropertyVO.property_id,
+                                          ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (db.Index('idx_recommendation_user_rank', 'user_id',
+                               'recommendation_rank'),)
+
+    def as_dict(self):
+        return {
+            'recommendation_id': self.recommendation_id,
+            'recommendation_rank': self.recommendation_rank,
+            'recommendation_score': self.recommendation_score,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'user_id': self.user_id,
+            'property_id': self.property_id
+        }
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from base import db
+
+
+class ReferenceVersionVO(db.Model):
+    __tablename__ = 'reference_version_table'
+    reference_name = db.Column('reference_name', db.String(50),
+                               primary_key=True)
+    reference_version = db.Column('reference_version', db.Integer, default=0,
+                                  nullable=False)
+    updated_date = db.Column('updated_date', db.DateTime,
+                             default=datetime.utcnow,
+                             onupdate=datetime.utcnow)
+
+    def as_dict(self):
+        return {
+            'reference_name': self.reference_name,
+            'reference_version': self.reference_version,
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None
+        }
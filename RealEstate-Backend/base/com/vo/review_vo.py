@@ -22,9 +22,11 @@ class ReviewVO(db.Model):
                             db.ForeignKey(PropertyVO.property_id,
                                           ondelete='CASCADE'), nullable=False)
 
-    # Unique constraint to prevent duplicate reviews
+    # Unique constraint to prevent duplicate reviews, index for the feed
     __table_args__ = (db.UniqueConstraint('user_id', 'property_id',
-                                          name='unique_user_property_review'),)
+                                          name='unique_user_property_review'),
+                      db.Index('idx_review_property_approved_created',
+                               'property_id', 'is_approved', 'created_date'),)
 
     def as_dict(self):
         return {
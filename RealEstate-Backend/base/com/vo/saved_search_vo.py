@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from base import db
+from base.com.vo.user_vo import UserVO
+
+
+class SavedSearchVO(db.Model):
+    __tablename__ = 'saved_search_table'
+    saved_search_id = db.Column(db.Integer, primary_key=True,
+                                autoincrement=True)
+    search_name = db.Column('search_name', db.String(100), nullable=False)
+    search_filters = db.Column('search_filters', db.JSON,
+                               nullable=False)  # search_properties filter dict
+    is_active = db.Column('is_active', db.Boolean, default=True)
+    created_date = db.Column('created_date', db.DateTime,
+                             default=datetime.utcnow)
+
+    # Foreign Keys
+    user_id = db.Column('user_id', db.Integer,
+                        db.ForeignKey(UserVO.user_id, ondelete='CASCADE'),
+                        nullable=False)
+
+    def as_dict(self):
+        return {
+            'saved_search_id': self.saved_search_id,
+            'search_name': self.search_name,
+            'search_filters': self.search_filters,
+            'is_active': self.is_active,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'user_id': self.user_id
+        }
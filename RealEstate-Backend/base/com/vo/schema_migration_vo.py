@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from base import db
+
+
+class SchemaMigrationVO(db.Model):
+    __tablename__ = 'schema_migration_table'
+    revision = db.Column('revision', db.String(32), primary_key=True)
+    description = db.Column('description', db.String(255), nullable=True)
+    applied_date = db.Column('applied_date', db.DateTime,
+                             default=datetime.utcnow)
+
+    def as_dict(self):
+        return {
+            'revision': self.revision,
+            'description': self.description,
+            'applied_date': self.applied_date.isoformat() if self.applied_date else None
+        }
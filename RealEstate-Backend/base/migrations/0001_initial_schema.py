@@ -0,0 +1,207 @@
+"""
+The schema as db.create_all() built it before migrations existed. Frozen
+here rather than read from the VOs so later VO changes never rewrite it.
+Tables that already exist are left alone, which adopts databases created
+by create_all() as they are.
+"""
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+description = 'Initial schema'
+
+metadata = sa.MetaData()
+
+sa.Table(
+    'user_table', metadata,
+    sa.Column('user_id', sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column('user_name', sa.String(100), nullable=False),
+    sa.Column('user_email', sa.String(255), unique=True, nullable=False),
+    sa.Column('user_password', sa.String(255), nullable=False),
+    sa.Column('user_phone', sa.String(20), nullable=True),
+    sa.Column('user_address', sa.Text, nullable=True),
+    sa.Column('user_role', sa.Enum('user', 'admin')),
+    sa.Column('user_profile_picture', sa.String(255), nullable=True),
+    sa.Column('is_verified', sa.Boolean),
+    sa.Column('is_active', sa.Boolean),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('updated_date', sa.DateTime))
+
+sa.Table(
+    'category_table', metadata,
+    sa.Column('category_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('category_name', sa.String(100), nullable=False, unique=True),
+    sa.Column('is_active', sa.Boolean))
+
+sa.Table(
+    'location_table', metadata,
+    sa.Column('location_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('location_name', sa.String(100), nullable=False),
+    sa.Column('city', sa.String(100), nullable=False),
+    sa.Column('state', sa.String(100), nullable=False),
+    sa.Column('country', sa.String(100), nullable=False),
+    sa.Column('zip_code', sa.String(20), nullable=True),
+    sa.Column('latitude', sa.Float, nullable=True),
+    sa.Column('longitude', sa.Float, nullable=True),
+    sa.Column('is_active', sa.Boolean))
+
+sa.Table(
+    'property_table', metadata,
+    sa.Column('property_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('property_title', sa.String(255), nullable=False),
+    sa.Column('property_description', sa.Text, nullable=False),
+    sa.Column('property_type', sa.Enum('sale', 'rent'), nullable=False),
+    sa.Column('price', sa.Float, nullable=False),
+    sa.Column('bedrooms', sa.Integer, nullable=False),
+    sa.Column('bathrooms', sa.Integer, nullable=False),
+    sa.Column('area_sqft', sa.Float, nullable=False),
+    sa.Column('address', sa.Text, nullable=False),
+    sa.Column('year_built', sa.Integer, nullable=True),
+    sa.Column('parking_spots', sa.Integer),
+    sa.Column('has_garden', sa.Boolean),
+    sa.Column('has_pool', sa.Boolean),
+    sa.Column('pet_friendly', sa.Boolean),
+    sa.Column('furnished', sa.Boolean),
+    sa.Column('property_images', sa.JSON, nullable=True),
+    sa.Column('property_status',
+              sa.Enum('available', 'sold', 'rented', 'pending')),
+    sa.Column('is_featured', sa.Boolean),
+    sa.Column('is_approved', sa.Boolean),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('updated_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('category_id', sa.Integer,
+              sa.ForeignKey('category_table.category_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('location_id', sa.Integer,
+              sa.ForeignKey('location_table.location_id', ondelete='CASCADE'),
+              nullable=False))
+
+sa.Table(
+    'review_table', metadata,
+    sa.Column('review_id', sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column('rating', sa.Integer, nullable=False),
+    sa.Column('comment', sa.Text, nullable=True),
+    sa.Column('is_approved', sa.Boolean),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('property_id', sa.Integer,
+              sa.ForeignKey('property_table.property_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.UniqueConstraint('user_id', 'property_id',
+                        name='unique_user_property_review'),
+    sa.Index('idx_review_property_approved_created', 'property_id',
+             'is_approved', 'created_date'))
+
+sa.Table(
+    'appointment_table', metadata,
+    sa.Column('appointment_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('appointment_date', sa.Date, nullable=False),
+    sa.Column('appointment_time', sa.Time, nullable=False),
+    sa.Column('appointment_status',
+              sa.Enum('pending', 'confirmed', 'cancelled', 'completed')),
+    sa.Column('message', sa.Text, nullable=True),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('buyer_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('seller_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('property_id', sa.Integer,
+              sa.ForeignKey('property_table.property_id', ondelete='CASCADE'),
+              nullable=False))
+
+sa.Table(
+    'favorite_table', metadata,
+    sa.Column('favorite_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('property_id', sa.Integer,
+              sa.ForeignKey('property_table.property_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.UniqueConstraint('user_id', 'property_id',
+                        name='unique_user_property_favorite'))
+
+sa.Table(
+    'import_job_table', metadata,
+    sa.Column('import_job_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('source_format', sa.Enum('csv', 'jsonl'), nullable=False),
+    sa.Column('source_path', sa.String(255), nullable=False),
+    sa.Column('archive_path', sa.String(255), nullable=True),
+    sa.Column('job_status',
+              sa.Enum('queued', 'running', 'completed', 'failed')),
+    sa.Column('rows_processed', sa.Integer),
+    sa.Column('rows_imported', sa.Integer),
+    sa.Column('rows_failed', sa.Integer),
+    sa.Column('row_errors', sa.JSON, nullable=True),
+    sa.Column('error_message', sa.Text, nullable=True),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('updated_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False))
+
+sa.Table(
+    'property_stats_table', metadata,
+    sa.Column('property_id', sa.Integer,
+              sa.ForeignKey('property_table.property_id', ondelete='CASCADE'),
+              primary_key=True, autoincrement=False),
+    sa.Column('favorite_count', sa.Integer, nullable=False),
+    sa.Column('view_count', sa.Integer, nullable=False),
+    sa.Column('trending_score', sa.Float, nullable=False),
+    sa.Column('trending_updated_date', sa.DateTime))
+
+sa.Table(
+    'recommendation_table', metadata,
+    sa.Column('recommendation_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('recommendation_rank', sa.SmallInteger, nullable=False),
+    sa.Column('recommendation_score', sa.Float, nullable=False),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Column('property_id', sa.Integer,
+              sa.ForeignKey('property_table.property_id', ondelete='CASCADE'),
+              nullable=False),
+    sa.Index('idx_recommendation_user_rank', 'user_id',
+             'recommendation_rank'))
+
+sa.Table(
+    'saved_search_table', metadata,
+    sa.Column('saved_search_id', sa.Integer, primary_key=True,
+              autoincrement=True),
+    sa.Column('search_name', sa.String(100), nullable=False),
+    sa.Column('search_filters', sa.JSON, nullable=False),
+    sa.Column('is_active', sa.Boolean),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('user_id', sa.Integer,
+              sa.ForeignKey('user_table.user_id', ondelete='CASCADE'),
+              nullable=False))
+
+sa.Table(
+    'reference_version_table', metadata,
+    sa.Column('reference_name', sa.String(50), primary_key=True),
+    sa.Column('reference_version', sa.Integer, nullable=False),
+    sa.Column('updated_date', sa.DateTime))
+
+
+def upgrade(op):
+    op.create_tables(metadata)
+
+
+def downgrade(op):
+    op.drop_tables(metadata)
@@ -0,0 +1,21 @@
+"""
+Indexes for the approved-listing feeds and appointment slot lookups, built
+online on MySQL. favorite_table(user_id) needs none of its own: it is the
+leading column of unique_user_property_favorite, which already serves
+lookups by user.
+"""
+revision = '0002'
+down_revision = '0001'
+description = 'Listing and appointment indexes'
+
+
+def upgrade(op):
+    op.create_index('idx_property_approved_status_created', 'property_table',
+                    ['is_approved', 'property_status', 'created_date'])
+    op.create_index('idx_appointment_property_slot', 'appointment_table',
+                    ['property_id', 'appointment_date', 'appointment_time'])
+
+
+def downgrade(op):
+    op.drop_index('idx_appointment_property_slot', 'appointment_table')
+    op.drop_index('idx_property_approved_status_created', 'property_table')
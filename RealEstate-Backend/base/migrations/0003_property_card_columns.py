@@ -0,0 +1,33 @@
+"""
+description_snippet and primary_image, the card-sized parts of
+property_description and property_images, so list views can defer the
+heavy columns. Existing rows are backfilled in batches with the same
+truncation PropertyVO applies on write.
+"""
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+description = 'Property card columns'
+
+DESCRIPTION_SNIPPET_LENGTH = 200
+
+
+def upgrade(op):
+    op.add_column('property_table',
+                  sa.Column('description_snippet',
+                            sa.String(DESCRIPTION_SNIPPET_LENGTH),
+                            nullable=True))
+    op.add_column('property_table',
+                  sa.Column('primary_image', sa.String(255), nullable=True))
+    op.backfill('property_table', lambda table: {
+        'description_snippet': sa.func.substr(
+            table.c.property_description, 1, DESCRIPTION_SNIPPET_LENGTH),
+        'primary_image': sa.type_coerce(table.c.property_images,
+                                        sa.JSON)[0].as_string(),
+    }, where=lambda table: table.c.description_snippet.is_(None))
+
+
+def downgrade(op):
+    op.drop_column('property_table', 'primary_image')
+    op.drop_column('property_table', 'description_snippet')
@@ -0,0 +1,39 @@
+"""
+job_table for the database job queue backend, indexed the way workers
+claim due jobs: by status, oldest run_after first.
+"""
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+description = 'Job queue'
+
+metadata = sa.MetaData()
+
+sa.Table(
+    'job_table', metadata,
+    sa.Column('job_id', sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column('task_name', sa.String(100), nullable=False),
+    sa.Column('payload', sa.JSON, nullable=False),
+    sa.Column('job_status', sa.Enum('queued', 'running', 'completed',
+                                    'failed')),
+    sa.Column('attempts', sa.Integer),
+    sa.Column('max_attempts', sa.Integer, nullable=False),
+    sa.Column('idempotency_key', sa.String(255), unique=True,
+              nullable=True),
+    sa.Column('run_after', sa.DateTime),
+    sa.Column('locked_by', sa.String(100), nullable=True),
+    sa.Column('locked_date', sa.DateTime, nullable=True),
+    sa.Column('last_error', sa.Text, nullable=True),
+    sa.Column('completed_date', sa.DateTime, nullable=True),
+    sa.Column('created_date', sa.DateTime),
+    sa.Column('updated_date', sa.DateTime),
+    sa.Index('idx_job_status_run_after', 'job_status', 'run_after'))
+
+
+def upgrade(op):
+    op.create_tables(metadata)
+
+
+def downgrade(op):
+    op.drop_tables(metadata)
@@ -0,0 +1,25 @@
+"""
+Responsive image metadata of property images, filled in by the
+describe_property_images task. Nothing is backfilled here: decoding the
+images is worker work, queued for existing listings by
+POST /api/admin/media/image-metadata.
+"""
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+description = 'Property image metadata'
+
+
+def upgrade(op):
+    op.add_column('property_table',
+                  sa.Column('property_image_metadata', sa.JSON,
+                            nullable=True))
+    op.add_column('property_table',
+                  sa.Column('primary_image_metadata', sa.JSON,
+                            nullable=True))
+
+
+def downgrade(op):
+    op.drop_column('property_table', 'primary_image_metadata')
+    op.drop_column('property_table', 'property_image_metadata')
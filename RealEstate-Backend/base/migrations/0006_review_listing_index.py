@@ -0,0 +1,18 @@
+"""
+The review listing index on databases that 0001 adopted from create_all():
+0001 leaves existing tables alone, so review_table never got the index its
+frozen schema declares. Databases 0001 built already have it.
+"""
+revision = '0006'
+down_revision = '0005'
+description = 'Review listing index'
+
+
+def upgrade(op):
+    op.create_index('idx_review_property_approved_created', 'review_table',
+                    ['property_id', 'is_approved', 'created_date'])
+
+
+def downgrade(op):
+    # Part of 0001's schema, so reverting this revision keeps it
+    pass
@@ -1,3 +1,4 @@
+from .cache import *
 from .decorators import *
 from .helpers import *
 from .validators import *
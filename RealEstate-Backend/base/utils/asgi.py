@@ -0,0 +1,163 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+
+from base import app, db
+from base.utils.async_db import async_db
+from base.utils.helpers import format_response
+from base.utils.reference_data import reference_data, REFERENCE_POLL_SECONDS
+from base.utils.request_metrics import http_requests_total, \
+    http_request_duration_seconds, http_response_size_bytes
+
+# Threads for the Flask fallback and for sync helpers called from async views
+ASGI_SYNC_THREADS = int(os.getenv('ASGI_SYNC_THREADS', '32'))
+
+sync_executor = ThreadPoolExecutor(max_workers=ASGI_SYNC_THREADS,
+                                   thread_name_prefix='asgi-sync')
+
+
+async def run_sync(function, *args):
+    """Run blocking code (sync DAOs, cache loaders) off the event loop"""
+
+    def call():
+        with app.app_context():
+            try:
+                return function(*args)
+            finally:
+                db.session.remove()
+
+    return await asyncio.get_running_loop().run_in_executor(sync_executor,
+                                                            call)
+
+
+class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs WSGI apps on one shared thread by default; rewrap the
+    # plain function so Flask requests run concurrently on the pool
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func,
+                                 thread_sensitive=False,
+                                 executor=sync_executor)
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await PooledWsgiToAsgiInstance(self.wsgi_application,
+                                       self.duplicate_header_limit)(
+            scope, receive, send)
+
+
+class AsyncRequest:
+    """The parts of an ASGI HTTP scope the async views read"""
+
+    def __init__(self, scope):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = {}
+        for key, value in parse_qsl(scope.get('query_string', b'').decode(
+                'latin-1'), keep_blank_values=True):
+            self.args.setdefault(key, value)
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+
+
+class AsyncRouter:
+    """
+    ASGI application serving the routes registered with @route from
+    coroutines on the event loop, so a request waiting on MySQL holds no
+    thread. Every other request goes to the Flask app on a thread pool.
+    Views take (request, **view_args) and return (payload, status) like
+    the Flask views' jsonify(...), status.
+    """
+
+    def __init__(self, flask_app):
+        self.url_map = Map()
+        self.views = {}
+        self.fallback = PooledWsgiToAsgi(flask_app)
+        self._reference_poller = None
+
+    def route(self, rule, methods=('GET',)):
+        def decorator(view):
+            self.url_map.add(Rule(rule, endpoint=view.__name__,
+                                  methods=list(methods)))
+            self.views[view.__name__] = view
+            return view
+
+        return decorator
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        try:
+            endpoint, view_args = self.url_map.bind('localhost').match(
+                scope['path'], method=scope['method'])
+        except HTTPException:
+            await self.fallback(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request = AsyncRequest(scope)
+        try:
+            payload, status = await self.views[endpoint](request, **view_args)
+        except Exception as e:
+            payload, status = format_response('error', str(e)), 500
+        # Same bytes as jsonify outside debug mode
+        body = f"{app.json.dumps(payload, separators=(',', ':'))}\n".encode(
+            'utf-8')
+        seconds = time.perf_counter() - started
+
+        http_requests_total.inc((endpoint, request.method, str(status)))
+        http_request_duration_seconds.observe(seconds,
+                                              (endpoint, request.method))
+        http_response_size_bytes.observe(len(body), (endpoint,))
+
+        headers = [(b'content-type', b'application/json'),
+                   (b'content-length', str(len(body)).encode()),
+                   (b'server-timing', f'app;dur={seconds * 1000:.1f}'.encode())]
+        # Mirrors what flask-cors sends for the app's allow-all config
+        origin = request.headers.get('origin')
+        if origin:
+            headers += [(b'access-control-allow-origin', origin.encode()),
+                        (b'vary', b'Origin')]
+        else:
+            headers.append((b'access-control-allow-origin', b'*'))
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': headers})
+        await send({'type': 'http.response.body',
+                    'body': b'' if request.method == 'HEAD' else body})
+
+    async def _poll_reference_data(self):
+        # Keeps the snapshots fresh from a thread so lookups made on the
+        # event loop never fall through to a blocking poll
+        while True:
+            try:
+                await run_sync(reference_data.ensure_fresh)
+            except Exception as e:
+                print(f"Error polling reference data: {e}")
+            await asyncio.sleep(REFERENCE_POLL_SECONDS / 2)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._reference_poller = asyncio.create_task(
+                    self._poll_reference_data())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._reference_poller is not None:
+                    self._reference_poller.cancel()
+                await async_db.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+asgi_router = AsyncRouter(app)
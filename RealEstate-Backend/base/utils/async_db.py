@@ -0,0 +1,71 @@
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from base import app
+
+# Sync dialect -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+ASYNC_POOL_SIZE = int(os.getenv('ASYNC_POOL_SIZE', '20'))
+ASYNC_MAX_OVERFLOW = int(os.getenv('ASYNC_MAX_OVERFLOW', '10'))
+ASYNC_POOL_TIMEOUT = float(os.getenv('ASYNC_POOL_TIMEOUT', '10'))
+ASYNC_POOL_RECYCLE = int(os.getenv('ASYNC_POOL_RECYCLE', '3600'))
+
+
+def get_async_database_url():
+    """ASYNC_DATABASE_URL, or the app's database URL with an asyncio driver"""
+    configured = os.getenv('ASYNC_DATABASE_URL')
+    if configured:
+        return make_url(configured)
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise ValueError(f"No asyncio driver configured for "
+                         f"{url.get_backend_name()}")
+    return url.set(drivername=drivername)
+
+
+class AsyncDatabase:
+    """
+    Lazily created AsyncEngine for the ASGI read path. Its pool is sized
+    separately from the sync engine because one event loop multiplexes many
+    in-flight requests over it instead of one connection per thread.
+    """
+
+    def __init__(self):
+        self._engine = None
+        self._sessionmaker = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            url = get_async_database_url()
+            options = {'pool_pre_ping': True}
+            if url.get_backend_name() != 'sqlite':
+                options.update(pool_size=ASYNC_POOL_SIZE,
+                               max_overflow=ASYNC_MAX_OVERFLOW,
+                               pool_timeout=ASYNC_POOL_TIMEOUT,
+                               pool_recycle=ASYNC_POOL_RECYCLE)
+            self._engine = create_async_engine(url, **options)
+            self._sessionmaker = async_sessionmaker(self._engine,
+                                                    expire_on_commit=False)
+        return self._engine
+
+    def session(self):
+        """New AsyncSession; use as `async with async_db.session() as session`"""
+        if self._sessionmaker is None:
+            self.engine
+        return self._sessionmaker()
+
+    async def dispose(self):
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._sessionmaker = None
+
+
+async_db = AsyncDatabase()
@@ -0,0 +1,207 @@
+import re
+import threading
+import time
+
+from base import app, db
+from base.com.dao.property_dao import PropertyDAO
+from base.utils.reference_data import reference_data, LOCATION_REFERENCE, \
+    REFERENCE_POLL_SECONDS
+
+AUTOCOMPLETE_MAX_RESULTS = 20
+LISTING_COUNT_REFRESH_SECONDS = 300
+AUTOCOMPLETE_REFRESH_SECONDS = REFERENCE_POLL_SECONDS / 2
+# How long a search right after startup waits for the first index
+AUTOCOMPLETE_FIRST_BUILD_SECONDS = 10
+TRIGRAM_MIN_SIMILARITY = 0.5
+
+_non_word = re.compile(r'[^\w]+')
+
+
+def normalize_text(value):
+    return ' '.join(_non_word.sub(' ', str(value or '').lower()).split())
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        # Best AUTOCOMPLETE_MAX_RESULTS location IDs below this node, by rank
+        self.top = []
+
+
+class LocationAutocomplete:
+    """
+    Type-ahead over active locations, built in memory from the reference
+    data snapshot. Every word and phrase of a location's name, city and
+    state is a key in a prefix trie whose nodes keep their top results
+    precomputed, so a prefix lookup is O(len(term)). When prefixes find
+    fewer than `limit` results, a trigram index supplies fuzzy matches for
+    misspellings and mid-word fragments.
+
+    Ranking is by approved listing count. A background thread rebuilds
+    the index when the location snapshot changes (insert_location/
+    update_location/delete_location reload it) and when listing counts go
+    stale, so searches never query the database and keep reading the
+    current index while a rebuild runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = threading.Event()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+        self._root = TrieNode()
+        self._trigram_index = {}
+        self._field_locations = {}
+        self._locations = {}
+        self._listing_counts = {}
+        self._snapshot = None
+        self._counted_at = None
+
+    def build(self, snapshot, listing_counts):
+        root = TrieNode()
+        trigram_index = {}
+        field_locations = {}
+        locations = {}
+
+        # Inserting in rank order lets every node keep the first K IDs it sees
+        ranked = sorted(snapshot.active, key=lambda location: (
+            -listing_counts.get(location['location_id'], 0),
+            location['location_id']))
+        for location in ranked:
+            location_id = location['location_id']
+            locations[location_id] = location
+            fields = [normalize_text(location[field])
+                      for field in ('location_name', 'city', 'state')]
+            keys = {field for field in fields if field}
+            keys.add(normalize_text(f"{location['location_name']} {location['city']}"))
+            for field in fields:
+                keys.update(field.split())
+
+            for key in keys:
+                node = root
+                for char in key:
+                    node = node.children.setdefault(char, TrieNode())
+                    # Keys of one location share nodes; count it once
+                    if len(node.top) < AUTOCOMPLETE_MAX_RESULTS and \
+                            (not node.top or node.top[-1] != location_id):
+                        node.top.append(location_id)
+
+            for field in fields:
+                if field not in field_locations:
+                    field_locations[field] = []
+                    for trigram in trigrams(field):
+                        trigram_index.setdefault(trigram, []).append(field)
+                field_locations[field].append(location_id)
+
+        with self._lock:
+            self._root = root
+            self._trigram_index = trigram_index
+            self._field_locations = field_locations
+            self._locations = locations
+            self._listing_counts = listing_counts
+            self._snapshot = snapshot
+        self._built.set()
+
+    def refresh(self):
+        """Rebuild if the locations changed or listing counts went stale"""
+        snapshot = reference_data.get_snapshot(LOCATION_REFERENCE)
+        counts_stale = self._counted_at is None or \
+            time.time() - self._counted_at > LISTING_COUNT_REFRESH_SECONDS
+        if snapshot is self._snapshot and not counts_stale:
+            return
+        listing_counts = self._listing_counts
+        if counts_stale:
+            try:
+                _, listing_counts = PropertyDAO().get_cached_listing_counts()
+                self._counted_at = time.time()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error counting listings for autocomplete: {e}")
+        self.build(snapshot, listing_counts)
+
+    def _ensure_refresher(self):
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._refresher_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(
+                target=self._run_refresher, name='autocomplete-refresher',
+                daemon=True)
+            self._refresher.start()
+
+    def _run_refresher(self):
+        while True:
+            with app.app_context():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing location autocomplete: {e}")
+                finally:
+                    db.session.remove()
+            time.sleep(AUTOCOMPLETE_REFRESH_SECONDS)
+
+    def _fuzzy(self, term, exclude, limit):
+        """
+        Locations with a name, city or state containing at least
+        TRIGRAM_MIN_SIMILARITY of the term's trigrams. The trigram index
+        is over distinct field values, so a city shared by thousands of
+        locations is scored once.
+        """
+        term_trigrams = trigrams(term)
+        shared = {}
+        for trigram in term_trigrams:
+            for field in self._trigram_index.get(trigram, ()):
+                shared[field] = shared.get(field, 0) + 1
+
+        required = TRIGRAM_MIN_SIMILARITY * len(term_trigrams)
+        fields = sorted((-count, field) for field, count in shared.items()
+                        if count >= required)
+
+        location_ids = []
+        seen = set(exclude)
+        for _, field in fields:
+            # Locations of one field value are stored in rank order
+            for location_id in self._field_locations[field]:
+                if location_id not in seen:
+                    seen.add(location_id)
+                    location_ids.append(location_id)
+                    if len(location_ids) == limit:
+                        return location_ids
+        return location_ids
+
+    def search(self, term, limit=10):
+        """Up to `limit` active locations for a type-ahead term, best first"""
+        self._ensure_refresher()
+        if not self._built.is_set():
+            self._built.wait(AUTOCOMPLETE_FIRST_BUILD_SECONDS)
+        term = normalize_text(term)
+        limit = min(limit, AUTOCOMPLETE_MAX_RESULTS)
+        if not term:
+            return []
+
+        with self._lock:
+            node = self._root
+            for char in term:
+                node = node.children.get(char)
+                if node is None:
+                    break
+            location_ids = node.top[:limit] if node is not None else []
+
+            if len(location_ids) < limit and len(term) >= 3:
+                location_ids += self._fuzzy(term, set(location_ids),
+                                            limit - len(location_ids))
+
+            return [dict(self._locations[location_id],
+                         listing_count=self._listing_counts.get(location_id, 0))
+                    for location_id in location_ids]
+
+
+location_autocomplete = LocationAutocomplete()
@@ -56,7 +56,10 @@ def user_required(f):
 
 
 def get_current_user():
-    token = request.headers.get('Authorization')
+    return decode_user_token(request.headers.get('Authorization'))
+
+
+def decode_user_token(token):
     if not token:
         return None
 
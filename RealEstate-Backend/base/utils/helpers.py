@@ -1,14 +1,16 @@
+import base64
 import datetime
 import hashlib
-import os
-import uuid
+import json
 
 import jwt
-from werkzeug.utils import secure_filename
 
 from base import SECRET_KEY
+from base.utils.reference_data import reference_data
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
 
 
 def hash_password(password):
@@ -53,29 +55,91 @@ def allowed_file(filename):
         1].lower() in ALLOWED_EXTENSIONS
 
 
-def save_uploaded_file(file, folder_name):
-    """
-    Save file into base/static/<folder_name>/ with unique filename.
-    Returns (unique_filename, folder_path)
-    """
-    if not file or file.filename == "":
-        return None, None
-    if not allowed_file(file.filename):
-        return None, None
+def format_property_images(image_list, folder_name):
+    """Return full URL paths for images"""
+    if not image_list:
+        return []
+    return [f"/static/{folder_name}/{img}" for img in image_list]
 
-    folder_path = f"base/static/{folder_name}/"
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
 
-    original_filename = secure_filename(file.filename)
-    ext = os.path.splitext(original_filename)[1]
-    unique_filename = f"{uuid.uuid4().hex}{ext}"
-    file.save(os.path.join(folder_path, unique_filename))
-    return unique_filename, folder_path
+def format_property_image(image, folder_name):
+    return f"/static/{folder_name}/{image}" if image else None
+
+
+def format_image_metadata(image, metadata, folder_name):
+    """Responsive image fields of one image, None until it is described"""
+    if not image or not metadata:
+        return None
+    url = format_property_image(image, folder_name)
+    srcset = [f"/static/{folder_name}/{variant} {width}w"
+              for width, variant in metadata.get('variants', [])]
+    srcset.append(f"{url} {metadata['width']}w")
+    return {
+        'url': url,
+        'width': metadata['width'],
+        'height': metadata['height'],
+        'dominant_color': metadata['dominant_color'],
+        'placeholder': metadata['placeholder'],
+        'srcset': ', '.join(srcset)
+    }
 
 
-def format_property_images(image_list, folder_name):
-    """Return full URL paths for images"""
+def format_property_image_metadata(image_list, image_metadata, folder_name):
+    """format_image_metadata of each image, in image_list order"""
     if not image_list:
         return []
-    return [f"/static/{folder_name}/{img}" for img in image_list]
+    image_metadata = image_metadata or {}
+    return [format_image_metadata(image, image_metadata.get(image),
+                                  folder_name) for image in image_list]
+
+
+def format_property_listing(property_vo, user_vo, card=False):
+    """Property card payload; category and location names come from the reference cache"""
+    if card:
+        item = property_vo.as_card_dict()
+        item["primary_image_metadata"] = format_image_metadata(
+            item.get("primary_image"), item.get("primary_image_metadata"),
+            "property_images")
+        item["primary_image"] = format_property_image(
+            item.get("primary_image"), "property_images")
+    else:
+        item = property_vo.as_dict()
+        item["property_image_metadata"] = format_property_image_metadata(
+            item.get("property_images"), item.get("property_image_metadata"),
+            "property_images")
+        item["property_images"] = format_property_images(
+            item.get("property_images"), "property_images")
+    item["user_name"] = user_vo.user_name
+    item["category_name"] = reference_data.get_category_name(
+        property_vo.category_id)
+    location = reference_data.get_location(property_vo.location_id)
+    item["location_name"] = location['location_name'] if location else None
+    item["city"] = location['city'] if location else None
+    return item
+
+
+def parse_limit(value, default=DEFAULT_PAGE_LIMIT, maximum=MAX_PAGE_LIMIT):
+    """Clamp a page size query parameter to [1, maximum]"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(values):
+    """Encode keyset pagination values as an opaque URL-safe token"""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by encode_cursor, None if malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
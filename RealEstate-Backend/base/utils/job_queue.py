@@ -0,0 +1,476 @@
+"""
+Background jobs. Tasks are functions registered with @task whose keyword
+arguments are the job payload; request handlers enqueue them and return:
+
+    @task(max_attempts=3)
+    def delete_media_files(folder_name: str, filenames: list):
+        ...
+
+    delete_media_files.delay(folder_name='profile_pictures',
+                             filenames=['old.png'])
+
+JOB_QUEUE_BACKEND=database keeps jobs in job_table, where worker.py claims
+them and runs them on a process pool. The default, local, keeps them in
+memory and runs them on a thread of the process that enqueued them, which
+needs no worker but loses queued jobs on restart.
+
+Both run a job at least once: a job whose worker died is requeued after
+JOB_LEASE_SECONDS, so tasks must tolerate running twice. Failed attempts
+are retried with exponential backoff until the task's max_attempts.
+"""
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from base import app, db
+from base.com.dao.job_dao import JobDAO
+from base.com.vo.job_vo import JobVO
+from base.utils.metrics import metrics_registry
+from base.utils.unit_of_work import after_commit
+
+JOB_QUEUE_BACKEND = os.getenv('JOB_QUEUE_BACKEND', 'local')
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+JOB_RETRY_BASE_SECONDS = float(os.getenv('JOB_RETRY_BASE_SECONDS', '10'))
+JOB_RETRY_MAX_SECONDS = float(os.getenv('JOB_RETRY_MAX_SECONDS', '3600'))
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '900'))
+JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', '7'))
+JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', '1'))
+JOB_MAINTENANCE_SECONDS = 60
+MAX_JOB_ERROR_LENGTH = 2000
+
+# Payload values are stored as JSON
+PAYLOAD_TYPES = (str, int, float, bool, list, dict)
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0,
+                   900.0, 3600.0)
+
+jobs_enqueued_total = metrics_registry.counter(
+    'jobs_enqueued_total', 'Jobs enqueued by task', ('task',))
+jobs_processed_total = metrics_registry.counter(
+    'jobs_processed_total', 'Job attempts by task and outcome',
+    ('task', 'outcome'))
+job_duration_seconds = metrics_registry.histogram(
+    'job_duration_seconds', 'Task run time per attempt', ('task',),
+    buckets=LATENCY_BUCKETS)
+job_queue_latency_seconds = metrics_registry.histogram(
+    'job_queue_latency_seconds', 'Time from a job falling due to its start',
+    ('task',), buckets=LATENCY_BUCKETS)
+job_queue_depth = metrics_registry.gauge(
+    'job_queue_depth', 'Queued jobs by task, including retries not yet due',
+    ('task',))
+job_queue_oldest_seconds = metrics_registry.gauge(
+    'job_queue_oldest_seconds', 'Wait so far of the oldest due job by task',
+    ('task',))
+
+tasks = {}
+
+
+class Task:
+    def __init__(self, function, name, max_attempts):
+        self.function = function
+        self.name = name
+        self.max_attempts = max_attempts
+        self.signature = inspect.signature(function)
+        self.types = {}
+        for parameter, hint in typing.get_type_hints(function).items():
+            if parameter == 'return':
+                continue
+            payload_type = typing.get_origin(hint) or hint
+            if payload_type not in PAYLOAD_TYPES:
+                raise TypeError(f"Task {name}: {parameter} must be annotated "
+                                f"as str, int, float, bool, list or dict")
+            self.types[parameter] = payload_type
+        functools.update_wrapper(self, function)
+
+    def __call__(self, **payload):
+        """Run the task in this process, as a worker does"""
+        return self.function(**payload)
+
+    def validate(self, payload):
+        try:
+            bound = self.signature.bind(**payload)
+        except TypeError as e:
+            raise TypeError(f"Task {self.name}: {e}")
+        for parameter, value in bound.arguments.items():
+            payload_type = self.types.get(parameter)
+            if payload_type is None or value is None:
+                continue
+            if payload_type is float and isinstance(value, int):
+                continue
+            if not isinstance(value, payload_type):
+                raise TypeError(f"Task {self.name}: {parameter} must be "
+                                f"{payload_type.__name__}")
+        try:
+            json.dumps(payload)
+        except (TypeError, ValueError) as e:
+            raise TypeError(f"Task {self.name}: payload is not JSON: {e}")
+
+    def delay(self, **payload):
+        return self.enqueue(payload)
+
+    def enqueue(self, payload, idempotency_key=None, delay_seconds=0):
+        """
+        Queue a run of this task and return its job ID. A job enqueued with
+        an idempotency_key that was used before is not queued again; the
+        earlier job's ID is returned instead.
+        """
+        self.validate(payload)
+        return job_queue.enqueue(self, payload, idempotency_key,
+                                 delay_seconds)
+
+
+def task(name=None, max_attempts=JOB_MAX_ATTEMPTS):
+    """Register a function as a task; its annotations type the payload"""
+
+    def decorator(function):
+        task_name = name or function.__name__
+        if task_name in tasks:
+            raise ValueError(f"Task {task_name} is already registered")
+        tasks[task_name] = Task(function, task_name, max_attempts)
+        return tasks[task_name]
+
+    return decorator
+
+
+def retry_delay(attempts):
+    """Seconds before retrying a job that has failed `attempts` times"""
+    delay = min(JOB_RETRY_MAX_SECONDS,
+                JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    # Jitter keeps jobs that failed together from retrying together
+    return random.uniform(delay / 2, delay)
+
+
+def run_attempt(task_name, payload):
+    """Run one attempt of a job; returns (error or None, seconds taken)"""
+    started = time.perf_counter()
+    try:
+        task = tasks.get(task_name)
+        if task is None:
+            raise LookupError(f"Unknown task {task_name}")
+        task(**payload)
+    except Exception as e:
+        db.session.rollback()
+        error = f"{type(e).__name__}: {e}"[:MAX_JOB_ERROR_LENGTH]
+        return error, time.perf_counter() - started
+    return None, time.perf_counter() - started
+
+
+def record_attempt(task_name, outcome, duration):
+    jobs_processed_total.inc((task_name, outcome))
+    job_duration_seconds.observe(duration, (task_name,))
+
+
+class DatabaseJobQueue:
+    """Jobs in job_table, run by worker.py"""
+    name = 'database'
+
+    def enqueue(self, task, payload, idempotency_key=None, delay_seconds=0):
+        job_vo = JobVO()
+        job_vo.task_name = task.name
+        job_vo.payload = payload
+        job_vo.job_status = 'queued'
+        job_vo.attempts = 0
+        job_vo.max_attempts = task.max_attempts
+        job_vo.idempotency_key = idempotency_key
+        job_vo.run_after = datetime.utcnow() + timedelta(
+            seconds=delay_seconds)
+        job_id = JobDAO().insert_job(job_vo)
+        if job_id == job_vo.job_id:
+            jobs_enqueued_total.inc((task.name,))
+        return job_id
+
+    def claim(self, worker_id, limit):
+        now = datetime.utcnow()
+        job_vo_list = JobDAO().claim_jobs(worker_id, limit, now)
+        for job_vo in job_vo_list:
+            job_queue_latency_seconds.observe(
+                max(0.0, (now - job_vo.run_after).total_seconds()),
+                (job_vo.task_name,))
+        return job_vo_list
+
+    def get_depths(self):
+        # Own app context, so metrics served off the request thread work
+        with app.app_context():
+            return JobDAO().get_queue_depths()
+
+    def get_oldest_waits(self):
+        now = datetime.utcnow()
+        with app.app_context():
+            due_dates = JobDAO().get_oldest_due_dates(now)
+        return {task_name: (now - run_after).total_seconds()
+                for task_name, run_after in due_dates.items()}
+
+
+def execute_job(job_id):
+    """
+    Run a claimed job in a worker process and store the outcome in
+    job_table. Returns (task_name, outcome, seconds) for the worker's
+    metrics, or None when the job is no longer this worker's to run.
+    """
+    job_dao = JobDAO()
+    try:
+        job_vo = job_dao.get_job_by_id(job_id)
+        if job_vo is None or job_vo.job_status != 'running':
+            return None
+        task_name = job_vo.task_name
+        attempts = job_vo.attempts
+        max_attempts = job_vo.max_attempts
+
+        error, duration = run_attempt(task_name, job_vo.payload)
+        now = datetime.utcnow()
+        if error is None:
+            job_dao.complete_job(job_id, now)
+            return task_name, 'completed', duration
+        if attempts >= max_attempts:
+            job_dao.fail_job(job_id, error, now)
+            print(f"Job {job_id} ({task_name}) failed after {attempts} "
+                  f"attempts: {error}")
+            return task_name, 'failed', duration
+        job_dao.retry_job(job_id, now + timedelta(
+            seconds=retry_delay(attempts)), error)
+        return task_name, 'retried', duration
+    finally:
+        db.session.remove()
+
+
+def init_worker_process():
+    # Ctrl+C reaches the whole process group; only the parent should stop,
+    # letting running jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class JobWorker:
+    """
+    Claims due jobs from job_table and runs them on a pool of processes,
+    at most one job per process at a time. The parent process only claims,
+    requeues expired leases, purges old jobs and records metrics.
+    """
+
+    def __init__(self, processes, poll_interval=JOB_POLL_SECONDS):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = DatabaseJobQueue()
+        self._stopping = threading.Event()
+        self._next_maintenance = 0
+
+    def stop(self, *args):
+        """Stop claiming; jobs already running are finished first"""
+        self._stopping.set()
+
+    def run(self, once=False):
+        """Run jobs until stopped, or with once=True until none are due"""
+        executor = self._create_executor()
+        in_flight = {}  # future -> (job_id, task_name)
+        try:
+            while True:
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=self.poll_interval,
+                                   return_when=FIRST_COMPLETED)
+                    broken = False
+                    for future in done:
+                        if not self._finish(future, *in_flight.pop(future)):
+                            broken = True
+                    if broken:
+                        executor.shutdown(wait=False)
+                        executor = self._create_executor()
+                if self._stopping.is_set():
+                    if not in_flight:
+                        break
+                    continue
+
+                self._maintain()
+                free = self.processes - len(in_flight)
+                for job_vo in self._claim(free) if free else []:
+                    future = executor.submit(execute_job, job_vo.job_id)
+                    in_flight[future] = (job_vo.job_id, job_vo.task_name)
+                db.session.remove()
+
+                if not in_flight:
+                    if once:
+                        break
+                    self._stopping.wait(self.poll_interval)
+        finally:
+            executor.shutdown(wait=True)
+
+    def _create_executor(self):
+        # Spawned children open their own connections instead of sharing
+        # the parent's pooled ones across a fork
+        return ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker_process)
+
+    def _claim(self, limit):
+        try:
+            return self.queue.claim(self.worker_id, limit)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error claiming jobs: {e}")
+            return []
+
+    def _finish(self, future, job_id, task_name):
+        """Record a finished job; False when the process pool broke"""
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            # The job stays running until its lease expires, then retries
+            print(f"Worker process died running job {job_id} ({task_name})")
+            jobs_processed_total.inc((task_name, 'crashed'))
+            return False
+        except Exception as e:
+            print(f"Error running job {job_id} ({task_name}): {e}")
+            jobs_processed_total.inc((task_name, 'crashed'))
+            return True
+        if result is not None:
+            record_attempt(*result)
+        return True
+
+    def _maintain(self):
+        if time.monotonic() < self._next_maintenance:
+            return
+        self._next_maintenance = time.monotonic() + JOB_MAINTENANCE_SECONDS
+        now = datetime.utcnow()
+        job_dao = JobDAO()
+        try:
+            requeued = job_dao.requeue_expired_jobs(
+                now - timedelta(seconds=JOB_LEASE_SECONDS))
+            if requeued:
+                print(f"Requeued {requeued} jobs with expired leases")
+            job_dao.delete_finished_jobs(
+                now - timedelta(days=JOB_RETENTION_DAYS))
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error maintaining job queue: {e}")
+
+
+class LocalJobQueue:
+    """
+    In-memory stand-in for job_table. Jobs run one at a time on a daemon
+    thread of this process, with the same retries and metrics.
+    """
+    name = 'local'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._heap = []  # (run_after, job_id, job)
+        self._job_ids = itertools.count(1)
+        self._idempotency_keys = {}
+        self._runner = None
+
+    def enqueue(self, task, payload, idempotency_key=None, delay_seconds=0):
+        with self._lock:
+            if idempotency_key in self._idempotency_keys:
+                return self._idempotency_keys[idempotency_key]
+            job_id = next(self._job_ids)
+        job = {
+            'job_id': job_id,
+            'task_name': task.name,
+            # Copied the way a job_table row would store it
+            'payload': json.loads(json.dumps(payload)),
+            'attempts': 0,
+            'max_attempts': task.max_attempts,
+            'idempotency_key': idempotency_key,
+            'run_after': time.time() + delay_seconds
+        }
+        # Like a job_table row, visible only once the enqueuing work commits
+        after_commit(self._push, job)
+        return job_id
+
+    def _push(self, job):
+        with self._lock:
+            key = job['idempotency_key']
+            if key is not None:
+                if key in self._idempotency_keys:
+                    return
+                self._idempotency_keys[key] = job['job_id']
+            heapq.heappush(self._heap, (job['run_after'], job['job_id'], job))
+            self._wake.notify()
+        jobs_enqueued_total.inc((job['task_name'],))
+        self._ensure_runner()
+
+    def get_depths(self):
+        with self._lock:
+            depths = {}
+            for _, _, job in self._heap:
+                depths[job['task_name']] = depths.get(job['task_name'], 0) + 1
+            return depths
+
+    def get_oldest_waits(self):
+        now = time.time()
+        with self._lock:
+            waits = {}
+            for run_after, _, job in self._heap:
+                if run_after <= now:
+                    waits[job['task_name']] = max(
+                        waits.get(job['task_name'], 0.0), now - run_after)
+            return waits
+
+    def _ensure_runner(self):
+        with self._lock:
+            if self._runner is not None and self._runner.is_alive():
+                return
+            self._runner = threading.Thread(target=self._run_jobs,
+                                            name='job-runner', daemon=True)
+            self._runner.start()
+
+    def _next_due(self):
+        with self._lock:
+            while not self._heap or self._heap[0][0] > time.time():
+                self._wake.wait(self._heap[0][0] - time.time()
+                                if self._heap else None)
+            return heapq.heappop(self._heap)
+
+    def _run_jobs(self):
+        while True:
+            run_after, job_id, job = self._next_due()
+            task_name = job['task_name']
+            job_queue_latency_seconds.observe(
+                max(0.0, time.time() - run_after), (task_name,))
+            job['attempts'] += 1
+            with app.app_context():
+                try:
+                    error, duration = run_attempt(task_name, job['payload'])
+                finally:
+                    db.session.remove()
+
+            if error is None:
+                record_attempt(task_name, 'completed', duration)
+            elif job['attempts'] >= job['max_attempts']:
+                record_attempt(task_name, 'failed', duration)
+                print(f"Job {job_id} ({task_name}) failed after "
+                      f"{job['attempts']} attempts: {error}")
+            else:
+                record_attempt(task_name, 'retried', duration)
+                job['run_after'] = time.time() + retry_delay(job['attempts'])
+                with self._lock:
+                    heapq.heappush(self._heap,
+                                   (job['run_after'], job_id, job))
+
+
+def create_job_queue(backend=JOB_QUEUE_BACKEND):
+    if backend == 'database':
+        return DatabaseJobQueue()
+    if backend == 'local':
+        return LocalJobQueue()
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND {backend}")
+
+
+job_queue = create_job_queue()
+job_queue_depth.set_function(lambda: {
+    (task_name,): depth for task_name, depth in job_queue.get_depths().items()})
+job_queue_oldest_seconds.set_function(lambda: {
+    (task_name,): wait for task_name, wait in
+    job_queue.get_oldest_waits().items()})
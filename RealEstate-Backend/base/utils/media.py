@@ -0,0 +1,257 @@
+import base64
+import io
+import os
+import re
+import time
+
+from PIL import Image, ImageOps
+
+from base.com.dao.property_dao import PropertyDAO
+from base.com.dao.user_dao import UserDAO
+from base.utils.job_queue import task
+
+MEDIA_ROOT = "base/static/"
+MEDIA_FOLDERS = ('property_images', 'profile_pictures')
+# srcset widths generated below an image's own width
+IMAGE_VARIANT_WIDTHS = (320, 640, 1024, 1600)
+IMAGE_VARIANT_QUALITY = 80
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+DOMINANT_COLOR_SAMPLE_SIZE = 64
+DOMINANT_COLOR_PALETTE = 8
+# Files younger than this may belong to a request or job still running
+ORPHAN_GRACE_HOURS = int(os.getenv('MEDIA_ORPHAN_GRACE_HOURS', '24'))
+ORPHAN_BATCH_SIZE = 500
+ORPHAN_MAX_FILES_PER_RUN = int(os.getenv('MEDIA_ORPHAN_MAX_FILES', '10000'))
+ORPHAN_REPORT_SAMPLE = 100
+# {stem}-{width}w.webp, as named by variant_filename
+VARIANT_FILENAME = re.compile(r'^(.+)-\d+w\.webp$')
+
+
+def media_path(folder_name, filename):
+    return os.path.join(MEDIA_ROOT, folder_name, filename)
+
+
+def variant_filename(filename, width):
+    return f"{os.path.splitext(filename)[0]}-{width}w.webp"
+
+
+def get_dominant_color(image):
+    """Most common color of a coarse palette, as #rrggbb"""
+    sample = image.convert('RGB')
+    sample.thumbnail((DOMINANT_COLOR_SAMPLE_SIZE, DOMINANT_COLOR_SAMPLE_SIZE))
+    palette_image = sample.quantize(colors=DOMINANT_COLOR_PALETTE)
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def make_placeholder(image):
+    """A few hundred bytes of blurry preview as a data URI"""
+    preview = image.copy()
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    preview.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + \
+        base64.b64encode(buffer.getvalue()).decode()
+
+
+def describe_image(folder_name, filename):
+    """
+    Dimensions, dominant color and placeholder of a stored image; also
+    writes its WebP variants and lists them as [[width, filename]].
+    """
+    with Image.open(media_path(folder_name, filename)) as source:
+        animated = getattr(source, 'is_animated', False)
+        # Phone photos are stored sideways with an EXIF rotation
+        image = ImageOps.exif_transpose(source)
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    width, height = image.size
+    variants = []
+    # Resizing would keep only the first frame of an animation
+    for variant_width in () if animated else IMAGE_VARIANT_WIDTHS:
+        if variant_width >= width:
+            break
+        variant = image.resize(
+            (variant_width, max(1, round(height * variant_width / width))),
+            Image.Resampling.LANCZOS)
+        name = variant_filename(filename, variant_width)
+        variant.save(media_path(folder_name, name), 'WEBP',
+                     quality=IMAGE_VARIANT_QUALITY)
+        variants.append([variant_width, name])
+
+    return {
+        'width': width,
+        'height': height,
+        'dominant_color': get_dominant_color(image),
+        'placeholder': make_placeholder(image),
+        'variants': variants
+    }
+
+
+@task(max_attempts=3)
+def describe_property_images(property_id: int):
+    """Describe a listing's images that have no metadata yet"""
+    property_dao = PropertyDAO()
+    property_vo = property_dao.get_property_by_id(property_id)
+    if property_vo is None or not property_vo.property_images:
+        return
+
+    image_metadata = dict(property_vo.property_image_metadata or {})
+    errors = []
+    for filename in property_vo.property_images:
+        if filename in image_metadata:
+            continue
+        try:
+            image_metadata[filename] = describe_image('property_images',
+                                                      filename)
+        except Exception as e:
+            errors.append(f"{filename}: {e}")
+
+    # Keep what succeeded; the retry only redoes the failed images
+    property_dao.update_image_metadata(
+        property_id, image_metadata,
+        image_metadata.get(property_vo.primary_image))
+    if errors:
+        raise ValueError('; '.join(errors))
+
+
+@task(max_attempts=1)
+def backfill_image_metadata(batch_size: int = 100):
+    """Describe the images of every listing still missing metadata"""
+    after_id = 0
+    while True:
+        property_ids = PropertyDAO().get_property_ids_missing_image_metadata(
+            after_id, batch_size)
+        if not property_ids:
+            break
+        for property_id in property_ids:
+            try:
+                describe_property_images(property_id=property_id)
+            except Exception as e:
+                print(f"Error describing images of property "
+                      f"{property_id}: {e}")
+        after_id = property_ids[-1]
+
+
+@task(max_attempts=3)
+def delete_media_files(folder_name: str, filenames: list):
+    """Delete uploaded files that no row references any more"""
+    if folder_name not in MEDIA_FOLDERS:
+        raise ValueError(f"Unknown media folder {folder_name}")
+    for filename in filenames:
+        # Only the plain names uploads are saved under, never a path
+        if not filename or os.path.basename(filename) != filename:
+            continue
+        try:
+            os.remove(media_path(folder_name, filename))
+        except FileNotFoundError:
+            # Removed by an earlier attempt
+            pass
+
+
+def get_referenced_media():
+    """{folder name: set of filenames rows refer to}, read as a stream"""
+    property_images = set()
+    for image_list, in PropertyDAO().get_property_image_lists():
+        property_images.update(image_list or ())
+    profile_pictures = {picture for picture, in
+                        UserDAO().get_profile_pictures()}
+    return {'property_images': property_images,
+            'profile_pictures': profile_pictures}
+
+
+def is_referenced(filename, referenced, referenced_stems):
+    if filename in referenced:
+        return True
+    # A srcset variant lives as long as the image it was made from
+    match = VARIANT_FILENAME.match(filename)
+    return match is not None and match.group(1) in referenced_stems
+
+
+def collect_orphaned_media(dry_run=True, grace_hours=ORPHAN_GRACE_HOURS,
+                           batch_size=ORPHAN_BATCH_SIZE,
+                           max_files=ORPHAN_MAX_FILES_PER_RUN):
+    """
+    Find files in the media folders that no row refers to and that were
+    last modified more than grace_hours ago, and delete them batch_size
+    at a time unless dry_run. At most max_files are removed per run;
+    truncated tells the caller another run has more to do. Returns a
+    report per folder.
+    """
+    referenced_media = get_referenced_media()
+    older_than = time.time() - grace_hours * 3600
+    report = {'dry_run': dry_run, 'grace_hours': grace_hours,
+              'truncated': False, 'folders': {}}
+    remaining = max_files
+
+    for folder_name in MEDIA_FOLDERS:
+        referenced = referenced_media[folder_name]
+        referenced_stems = {os.path.splitext(filename)[0]
+                            for filename in referenced}
+        folder_report = {'scanned': 0, 'referenced': 0, 'recent': 0,
+                         'orphaned': 0, 'orphaned_bytes': 0, 'deleted': 0,
+                         'sample': []}
+        report['folders'][folder_name] = folder_report
+        batch = []
+
+        def flush():
+            if not dry_run:
+                for filename in batch:
+                    try:
+                        os.remove(media_path(folder_name, filename))
+                        folder_report['deleted'] += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        print(f"Error deleting {folder_name}/{filename}: {e}")
+            batch.clear()
+
+        try:
+            entries = os.scandir(os.path.join(MEDIA_ROOT, folder_name))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                # Dotfiles such as .gitkeep are not uploads
+                if entry.name.startswith('.') or \
+                        not entry.is_file(follow_symlinks=False):
+                    continue
+                folder_report['scanned'] += 1
+                if is_referenced(entry.name, referenced, referenced_stems):
+                    folder_report['referenced'] += 1
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > older_than:
+                    folder_report['recent'] += 1
+                    continue
+                if remaining == 0:
+                    report['truncated'] = True
+                    break
+                remaining -= 1
+                folder_report['orphaned'] += 1
+                folder_report['orphaned_bytes'] += stat.st_size
+                if len(folder_report['sample']) < ORPHAN_REPORT_SAMPLE:
+                    folder_report['sample'].append(entry.name)
+                batch.append(entry.name)
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+
+    return report
+
+
+@task(max_attempts=1)
+def delete_orphaned_media(grace_hours: int = ORPHAN_GRACE_HOURS):
+    """Delete media files no row refers to any more"""
+    report = collect_orphaned_media(dry_run=False, grace_hours=grace_hours)
+    deleted = 0
+    for folder_name, folder_report in report['folders'].items():
+        deleted += folder_report['deleted']
+        print(f"Deleted {folder_report['deleted']} orphaned files "
+              f"({folder_report['orphaned_bytes']} bytes) from {folder_name}")
+    if report['truncated'] and deleted:
+        # Pick up where the cap stopped this run
+        delete_orphaned_media.delay(grace_hours=grace_hours)
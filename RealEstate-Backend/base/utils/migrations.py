@@ -0,0 +1,335 @@
+"""
+Versioned schema migrations. Revisions live in base/migrations as
+NNNN_description.py modules that define revision, down_revision,
+description, upgrade(op) and downgrade(op), forming one linear chain.
+
+    python migrate.py upgrade [revision]
+    python migrate.py downgrade <revision|base>
+    python migrate.py current | history | stamp <revision>
+
+Importing base upgrades to the head unless AUTO_MIGRATE=false. MySQL runs
+DDL outside transactions, so every Operations call commits on its own and
+skips work that is already done; a revision that fails halfway can simply
+be run again.
+"""
+import importlib.util
+import os
+import re
+import time
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateColumn
+
+from base import db
+from base.com.vo.schema_migration_vo import SchemaMigrationVO
+
+MIGRATIONS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'migrations')
+MIGRATION_LOCK_NAME = 'schema_migrations'
+MIGRATION_LOCK_SECONDS = int(os.getenv('MIGRATION_LOCK_SECONDS', '300'))
+BACKFILL_BATCH_SIZE = int(os.getenv('BACKFILL_BATCH_SIZE', '1000'))
+BACKFILL_PAUSE_SECONDS = float(os.getenv('BACKFILL_PAUSE_SECONDS', '0.05'))
+
+_REVISION_FILE = re.compile(r'^\d{4}_\w+\.py$')
+migration_table = SchemaMigrationVO.__table__
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Operations:
+    """Schema changes available to revisions as `op`"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @property
+    def is_mysql(self):
+        return self.engine.dialect.name == 'mysql'
+
+    def _inspector(self):
+        return sa.inspect(self.engine)
+
+    def has_table(self, table_name):
+        return self._inspector().has_table(table_name)
+
+    def has_column(self, table_name, column_name):
+        return any(column['name'] == column_name for column in
+                   self._inspector().get_columns(table_name))
+
+    def has_index(self, table_name, index_name):
+        return any(index['name'] == index_name for index in
+                   self._inspector().get_indexes(table_name))
+
+    def get_table(self, table_name):
+        """Reflected Table for building backfill expressions"""
+        return sa.Table(table_name, sa.MetaData(), autoload_with=self.engine)
+
+    def execute(self, statement, params=None):
+        if isinstance(statement, str):
+            statement = sa.text(statement)
+        with self.engine.begin() as connection:
+            return connection.execute(statement, params or {})
+
+    def create_tables(self, metadata):
+        """Create a frozen MetaData's tables that do not exist yet"""
+        metadata.create_all(self.engine, checkfirst=True)
+
+    def drop_tables(self, metadata):
+        metadata.drop_all(self.engine, checkfirst=True)
+
+    def add_column(self, table_name, column):
+        if self.has_column(table_name, column.name):
+            print(f"Column {table_name}.{column.name} exists, skipping")
+            return
+        sa.Table(table_name, sa.MetaData(), column)
+        column_sql = CreateColumn(column).compile(dialect=self.engine.dialect)
+        # MySQL 8 adds trailing columns instantly without copying the table
+        self.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_sql}')
+
+    def drop_column(self, table_name, column_name):
+        if not self.has_column(table_name, column_name):
+            return
+        self.execute(f'ALTER TABLE {table_name} DROP COLUMN {column_name}')
+
+    def create_index(self, index_name, table_name, columns, unique=False):
+        if self.has_index(table_name, index_name):
+            print(f"Index {index_name} exists, skipping")
+            return
+        if self.is_mysql:
+            # Fails instead of silently locking the table for the build
+            self.execute(f"ALTER TABLE {table_name} ADD "
+                         f"{'UNIQUE ' if unique else ''}INDEX {index_name} "
+                         f"({', '.join(columns)}), "
+                         f"ALGORITHM=INPLACE, LOCK=NONE")
+            return
+        table = self.get_table(table_name)
+        sa.Index(index_name, *(table.c[column] for column in columns),
+                 unique=unique).create(self.engine)
+
+    def drop_index(self, index_name, table_name):
+        if not self.has_index(table_name, index_name):
+            return
+        if self.is_mysql:
+            self.execute(f'ALTER TABLE {table_name} DROP INDEX {index_name}, '
+                         f'ALGORITHM=INPLACE, LOCK=NONE')
+            return
+        self.execute(f'DROP INDEX {index_name}')
+
+    def backfill(self, table_name, values, where=None,
+                 batch_size=BACKFILL_BATCH_SIZE,
+                 pause_seconds=BACKFILL_PAUSE_SECONDS):
+        return backfill_in_batches(self.engine, table_name, values, where,
+                                   batch_size, pause_seconds)
+
+
+def backfill_in_batches(engine, table_name, values, where=None,
+                        batch_size=BACKFILL_BATCH_SIZE,
+                        pause_seconds=BACKFILL_PAUSE_SECONDS):
+    """
+    UPDATE table_name in primary-key ranges of batch_size rows, each batch
+    its own short transaction, so row locks and undo stay small and
+    replicas keep up. values(table) returns the SET dict and where(table)
+    an optional filter; with a filter like `column IS NULL` an interrupted
+    backfill resumes where it stopped. Returns the number of rows updated.
+    """
+    table = sa.Table(table_name, sa.MetaData(), autoload_with=engine)
+    primary_keys = list(table.primary_key.columns)
+    if len(primary_keys) != 1:
+        raise MigrationError(f'{table_name} needs a single-column primary '
+                             f'key to backfill in batches')
+    primary_key = primary_keys[0]
+    condition = where(table) if where else sa.true()
+    updated = 0
+    last_key = None
+
+    while True:
+        select = sa.select(primary_key).where(condition) \
+            .order_by(primary_key).limit(batch_size)
+        if last_key is not None:
+            select = select.where(primary_key > last_key)
+        with engine.begin() as connection:
+            keys = connection.execute(select).scalars().all()
+            if not keys:
+                break
+            result = connection.execute(
+                table.update()
+                .where(primary_key.between(keys[0], keys[-1]), condition)
+                .values(values(table)))
+        updated += result.rowcount
+        last_key = keys[-1]
+        print(f"Backfilled {updated} rows of {table_name}")
+        if len(keys) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return updated
+
+
+def load_revisions(folder=MIGRATIONS_FOLDER):
+    """Revision modules ordered from the first to the head"""
+    modules = {}
+    for filename in sorted(os.listdir(folder)):
+        if not _REVISION_FILE.match(filename):
+            continue
+        spec = importlib.util.spec_from_file_location(
+            f'base.migrations.{filename[:-3]}',
+            os.path.join(folder, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if module.revision in modules:
+            raise MigrationError(f'Duplicate revision {module.revision}')
+        modules[module.revision] = module
+
+    children = {module.down_revision: module for module in modules.values()}
+    if len(children) != len(modules):
+        raise MigrationError('Revisions branch; every down_revision must be '
+                             'unique')
+    ordered = []
+    module = children.get(None)
+    while module is not None:
+        ordered.append(module)
+        module = children.get(module.revision)
+    if len(ordered) != len(modules):
+        raise MigrationError('Revisions do not form a single chain')
+    return ordered
+
+
+class MigrationRunner:
+    def __init__(self, engine_getter):
+        self._engine_getter = engine_getter
+
+    @property
+    def engine(self):
+        return self._engine_getter()
+
+    def get_applied(self):
+        migration_table.create(self.engine, checkfirst=True)
+        with self.engine.connect() as connection:
+            return set(connection.execute(
+                sa.select(migration_table.c.revision)).scalars())
+
+    def current(self):
+        """Newest applied revision, None for an unversioned database"""
+        applied = self.get_applied()
+        current = None
+        for module in load_revisions():
+            if module.revision in applied:
+                current = module.revision
+        return current
+
+    def history(self):
+        applied = self.get_applied()
+        return [(module.revision, module.description,
+                 module.revision in applied) for module in load_revisions()]
+
+    def upgrade(self, target='head'):
+        with self._lock():
+            revisions = load_revisions()
+            applied = self.get_applied()
+            stop = self._index(revisions, target)
+            op = Operations(self.engine)
+            for module in revisions[:stop + 1]:
+                if module.revision in applied:
+                    continue
+                print(f"Applying migration {module.revision}: "
+                      f"{module.description}")
+                module.upgrade(op)
+                self._record(module)
+        self.warn_unmigrated_tables()
+
+    def downgrade(self, target):
+        """Revert revisions newer than target; 'base' reverts all of them"""
+        with self._lock():
+            revisions = load_revisions()
+            applied = self.get_applied()
+            stop = -1 if target == 'base' else self._index(revisions, target)
+            op = Operations(self.engine)
+            for module in reversed(revisions[stop + 1:]):
+                if module.revision not in applied:
+                    continue
+                print(f"Reverting migration {module.revision}: "
+                      f"{module.description}")
+                module.downgrade(op)
+                with self.engine.begin() as connection:
+                    connection.execute(migration_table.delete().where(
+                        migration_table.c.revision == module.revision))
+
+    def stamp(self, target):
+        """Mark revisions up to target as applied without running them"""
+        with self._lock():
+            revisions = load_revisions()
+            applied = self.get_applied()
+            for module in revisions[:self._index(revisions, target) + 1]:
+                if module.revision not in applied:
+                    self._record(module)
+
+    def warn_unmigrated_tables(self):
+        inspector = sa.inspect(self.engine)
+        existing = set(inspector.get_table_names())
+        missing = sorted(set(db.metadata.tables) - existing)
+        if missing:
+            print(f"Warning: no migration creates {', '.join(missing)}")
+
+        # Adopted tables keep whatever indexes create_all() gave them
+        for table_name in sorted(existing & set(db.metadata.tables)):
+            declared = {index.name for index in
+                        db.metadata.tables[table_name].indexes}
+            present = {index['name'] for index in
+                       inspector.get_indexes(table_name)}
+            missing = sorted(declared - present)
+            if missing:
+                print(f"Warning: no migration creates index "
+                      f"{', '.join(missing)} on {table_name}")
+
+    def _index(self, revisions, target):
+        if target == 'head':
+            return len(revisions) - 1
+        for index, module in enumerate(revisions):
+            if module.revision == target:
+                return index
+        raise MigrationError(f'Unknown revision {target}')
+
+    def _record(self, module):
+        with self.engine.begin() as connection:
+            connection.execute(migration_table.insert().values(
+                revision=module.revision, description=module.description,
+                applied_date=datetime.utcnow()))
+
+    def _lock(self):
+        return MigrationLock(self.engine)
+
+
+class MigrationLock:
+    """MySQL advisory lock so only one worker process migrates at a time"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.connection = None
+
+    def __enter__(self):
+        if self.engine.dialect.name != 'mysql':
+            return self
+        self.connection = self.engine.connect()
+        acquired = self.connection.execute(
+            sa.text('SELECT GET_LOCK(:name, :timeout)'),
+            {'name': MIGRATION_LOCK_NAME,
+             'timeout': MIGRATION_LOCK_SECONDS}).scalar()
+        if acquired != 1:
+            self.connection.close()
+            raise MigrationError('Timed out waiting for the migration lock')
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.connection is not None:
+            self.connection.execute(sa.text('SELECT RELEASE_LOCK(:name)'),
+                                    {'name': MIGRATION_LOCK_NAME})
+            self.connection.close()
+            self.connection = None
+
+
+migration_runner = MigrationRunner(lambda: db.engine)
+
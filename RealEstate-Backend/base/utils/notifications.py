@@ -0,0 +1,39 @@
+import threading
+from collections import deque
+from datetime import datetime
+
+NOTIFICATION_QUEUE_SIZE = 10000
+
+
+class NotificationQueue:
+    """
+    Local stand-in for a notification service. Messages are kept in a
+    bounded in-memory queue until a sender drains them.
+    """
+
+    def __init__(self, max_size=NOTIFICATION_QUEUE_SIZE):
+        self._lock = threading.Lock()
+        self._queue = deque(maxlen=max_size)
+
+    def enqueue(self, user_id, notification_type, payload):
+        with self._lock:
+            self._queue.append({
+                'user_id': user_id,
+                'notification_type': notification_type,
+                'payload': payload,
+                'created_date': datetime.utcnow().isoformat()
+            })
+
+    def drain(self, limit=None):
+        """Remove and return up to `limit` queued notifications, oldest first"""
+        with self._lock:
+            count = len(self._queue) if limit is None else \
+                min(limit, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._queue)
+
+
+notification_queue = NotificationQueue()
@@ -0,0 +1,206 @@
+import atexit
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+from operator import itemgetter
+
+from base import app, db
+from base.com.dao.property_stats_dao import PropertyStatsDAO
+
+TRENDING_HALF_LIFE_SECONDS = 24 * 3600
+DECAY_RATE = math.log(2) / TRENDING_HALF_LIFE_SECONDS
+FAVORITE_WEIGHT = 5.0
+VIEW_WEIGHT = 1.0
+FLUSH_INTERVAL_SECONDS = 30
+FLUSH_THRESHOLD = 1000
+RELOAD_INTERVAL_SECONDS = 300
+RESCALE_AFTER_SECONDS = 7 * 24 * 3600
+
+
+class PopularityTracker:
+    """
+    In-memory favorite/view counters with time-decayed trending scores.
+
+    Scores use forward decay: each event adds weight * e^(rate * (t - ref)),
+    so every score decays by the same factor and the ranking never has to
+    be recomputed as time passes. Counter and score deltas are flushed to
+    property_stats_table in batches by a background thread, and the scores
+    are periodically reloaded so events recorded by other workers show up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # property_id -> [favorite_delta, view_delta, score_delta relative to _reference]
+        self._pending = {}
+        self._pending_events = 0
+        # property_id -> score relative to _reference
+        self._scores = {}
+        self._reference = time.time()
+        self._loaded_at = None
+        self._flush_event = threading.Event()
+        self._flusher = None
+
+    def _rescale(self, now):
+        """Move the reference time forward; call with the lock held"""
+        factor = math.exp(-DECAY_RATE * (now - self._reference))
+        self._scores = {property_id: score * factor
+                        for property_id, score in self._scores.items()
+                        if score * factor > 1e-6}
+        for pending in self._pending.values():
+            pending[2] *= factor
+        self._reference = now
+
+    def _apply(self, property_id, favorite_delta, view_delta, now):
+        """Add one property's deltas; call with the lock held"""
+        weight = favorite_delta * FAVORITE_WEIGHT + view_delta * VIEW_WEIGHT
+        score_delta = weight * math.exp(DECAY_RATE * (now - self._reference))
+        self._scores[property_id] = max(
+            0.0, self._scores.get(property_id, 0.0) + score_delta)
+
+        pending = self._pending.setdefault(property_id, [0, 0, 0.0])
+        pending[0] += favorite_delta
+        pending[1] += view_delta
+        pending[2] += score_delta
+
+    def record(self, property_id, favorite_delta=0, view_delta=0):
+        self.record_many({property_id: (favorite_delta, view_delta)})
+
+    def record_many(self, deltas):
+        """Apply {property_id: (favorite_delta, view_delta)} under one lock"""
+        now = time.time()
+        with self._lock:
+            if now - self._reference > RESCALE_AFTER_SECONDS:
+                self._rescale(now)
+            for property_id, (favorite_delta, view_delta) in deltas.items():
+                self._apply(property_id, favorite_delta, view_delta, now)
+            self._pending_events += len(deltas)
+            flush_due = self._pending_events >= FLUSH_THRESHOLD
+
+        self._ensure_flusher()
+        if flush_due:
+            self._flush_event.set()
+
+    def record_favorite(self, property_id, delta=1):
+        self.record(property_id, favorite_delta=delta)
+
+    def record_view(self, property_id, count=1):
+        self.record(property_id, view_delta=count)
+
+    def forget(self, property_ids):
+        """Drop the scores and unflushed deltas of deleted properties"""
+        with self._lock:
+            for property_id in property_ids:
+                self._scores.pop(property_id, None)
+                self._pending.pop(property_id, None)
+
+    def get_pending_counts(self, property_id):
+        """Unflushed (favorite_delta, view_delta) for a property"""
+        with self._lock:
+            pending = self._pending.get(property_id)
+            return (pending[0], pending[1]) if pending else (0, 0)
+
+    def flush(self):
+        """Write pending deltas to the DB; they are re-queued on failure"""
+        if self._loaded_at is None:
+            # Normally loaded at startup; seeds the table before the first write
+            self.load()
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+            now = time.time()
+            factor = math.exp(-DECAY_RATE * (now - self._reference))
+
+        deltas = {property_id: (values[0], values[1], values[2] * factor)
+                  for property_id, values in pending.items()}
+        try:
+            PropertyStatsDAO().apply_stat_deltas(deltas, DECAY_RATE,
+                                                 datetime.utcnow())
+        except Exception:
+            with self._lock:
+                factor = math.exp(DECAY_RATE * (now - self._reference))
+                for property_id, (favorite_delta, view_delta,
+                                  score_delta) in deltas.items():
+                    merged = self._pending.setdefault(property_id,
+                                                      [0, 0, 0.0])
+                    merged[0] += favorite_delta
+                    merged[1] += view_delta
+                    merged[2] += score_delta * factor
+            raise
+        return len(deltas)
+
+    def load(self):
+        """Rebuild ranking scores from property_stats_table plus unflushed deltas"""
+        property_stats_dao = PropertyStatsDAO()
+        now = time.time()
+        now_date = datetime.utcnow()
+
+        if property_stats_dao.count_stats_rows() == 0:
+            property_stats_dao.backfill_favorite_stats(FAVORITE_WEIGHT,
+                                                       DECAY_RATE, now_date)
+
+        scores = {}
+        for property_id, score, updated_date in \
+                property_stats_dao.get_trending_scores():
+            age = (now_date - updated_date).total_seconds() \
+                if updated_date else 0
+            scores[property_id] = score * math.exp(-DECAY_RATE * max(0, age))
+
+        with self._lock:
+            factor = math.exp(-DECAY_RATE * (now - self._reference))
+            self._reference = now
+            for property_id, pending in self._pending.items():
+                pending[2] *= factor
+                scores[property_id] = max(
+                    0.0, scores.get(property_id, 0.0) + pending[2])
+            self._scores = scores
+            self._loaded_at = now
+
+    def get_trending_ids(self, limit):
+        """Top `limit` property IDs by decayed score, O(n log limit)"""
+        if self._loaded_at is None:
+            self.load()
+        with self._lock:
+            top = heapq.nlargest(limit, self._scores.items(),
+                                 key=itemgetter(1))
+        return [property_id for property_id, score in top if score > 0]
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run_flusher,
+                                             name='popularity-flusher',
+                                             daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._flush_event.wait(FLUSH_INTERVAL_SECONDS)
+            self._flush_event.clear()
+            with app.app_context():
+                try:
+                    self.flush()
+                    if self._loaded_at is not None and \
+                            time.time() - self._loaded_at > RELOAD_INTERVAL_SECONDS:
+                        self.load()
+                except Exception as e:
+                    print(f"Error flushing popularity counters: {e}")
+                finally:
+                    db.session.remove()
+
+    def flush_at_exit(self):
+        with app.app_context():
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing popularity counters: {e}")
+
+
+popularity_tracker = PopularityTracker()
+atexit.register(popularity_tracker.flush_at_exit)
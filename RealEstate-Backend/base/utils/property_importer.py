@@ -0,0 +1,308 @@
+import csv
+import json
+import os
+import shutil
+import time
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+
+from base import db
+from base.com.dao.import_job_dao import ImportJobDAO
+from base.com.dao.property_dao import listing_counts_cache
+from base.com.vo.property_vo import PropertyVO
+from base.com.vo.user_vo import UserVO
+from base.utils.helpers import allowed_file
+from base.utils.job_queue import task
+from base.utils.media import describe_property_images
+from base.utils.reference_data import reference_data
+from base.utils.saved_search_matcher import saved_search_matcher
+from base.utils.unit_of_work import after_commit, transaction
+from base.utils.validators import validate_price, validate_bedrooms, \
+    validate_bathrooms
+
+IMPORT_FOLDER = "base/imports/"
+IMAGE_FOLDER = "base/static/property_images/"
+IMPORT_FORMATS = ('csv', 'jsonl')
+IMPORT_BATCH_SIZE = 500
+# A running job is also checkpointed this often, keeping its heartbeat fresh
+IMPORT_HEARTBEAT_SECONDS = 60
+# A running job without a heartbeat for this long lost its worker
+IMPORT_LEASE_SECONDS = int(os.getenv('IMPORT_LEASE_SECONDS', '600'))
+MAX_STORED_ROW_ERRORS = 1000
+MAX_ARCHIVE_IMAGE_BYTES = 10 * 1024 * 1024
+# Source file plus image archive; raises MAX_CONTENT_LENGTH for this endpoint
+MAX_IMPORT_REQUEST_BYTES = int(os.getenv('MAX_IMPORT_REQUEST_BYTES',
+                                         str(1024 * 1024 * 1024)))
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportTakenOver(Exception):
+    """Another run claimed the job after this run's lease expired"""
+
+
+def resolve_category(row):
+    if row.get('category_id'):
+        category_id = int(row['category_id'])
+        category = reference_data.get_category(category_id)
+        if not category or not category['is_active']:
+            raise RowError(f"Unknown category_id: {category_id}")
+        return category_id
+
+    category_id = reference_data.get_category_id(row.get('category_name'))
+    if category_id is None:
+        raise RowError(f"Unknown category: {row.get('category_name')}")
+    return category_id
+
+
+def resolve_location(row):
+    if row.get('location_id'):
+        location_id = int(row['location_id'])
+        location = reference_data.get_location(location_id)
+        if not location or not location['is_active']:
+            raise RowError(f"Unknown location_id: {location_id}")
+        return location_id
+
+    location_ids = reference_data.get_location_ids(row.get('location_name'),
+                                                   row.get('city'))
+    if not location_ids:
+        if row.get('city'):
+            raise RowError(
+                f"Unknown location: {row.get('location_name')}, {row.get('city')}")
+        raise RowError(f"Unknown location: {row.get('location_name')}")
+    if len(location_ids) > 1:
+        raise RowError(
+            f"Ambiguous location {row.get('location_name')}, add a city column")
+    return location_ids[0]
+
+
+def iter_source_rows(path, source_format):
+    """Stream (row_number, raw_row) pairs; JSONL rows stay unparsed strings"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if source_format == 'csv':
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield row_number, row
+        else:
+            for row_number, line in enumerate(handle, start=1):
+                yield row_number, line.strip()
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in TRUE_VALUES
+
+
+def parse_image_refs(value):
+    if isinstance(value, list):
+        return [str(ref).strip() for ref in value if str(ref).strip()]
+    refs = str(value or '').replace('|', ';').split(';')
+    return [ref.strip() for ref in refs if ref.strip()]
+
+
+def store_images(refs, archive):
+    """Copy referenced images into the property image folder"""
+    filenames = []
+    for ref in refs:
+        if not allowed_file(ref):
+            raise RowError(f"Unsupported image type: {ref}")
+
+        if archive is None:
+            # Without an archive, rows may only reference already uploaded files
+            if os.path.basename(ref) != ref or not os.path.exists(
+                    os.path.join(IMAGE_FOLDER, ref)):
+                raise RowError(f"Image not found: {ref}")
+            filenames.append(ref)
+            continue
+
+        try:
+            member = archive.getinfo(ref)
+        except KeyError:
+            raise RowError(f"Image not found in archive: {ref}")
+        if member.file_size > MAX_ARCHIVE_IMAGE_BYTES:
+            raise RowError(f"Image too large: {ref}")
+
+        filename = f"{uuid.uuid4().hex}{os.path.splitext(ref)[1].lower()}"
+        with archive.open(member) as source, \
+                open(os.path.join(IMAGE_FOLDER, filename), 'wb') as target:
+            shutil.copyfileobj(source, target)
+        filenames.append(filename)
+
+    if not filenames:
+        raise RowError('At least one image is required')
+    return filenames
+
+
+def build_property_mapping(row, archive, user_id, is_approved):
+    """Validate one source row and return a PropertyVO insert mapping"""
+    for field in ('property_title', 'property_description', 'address'):
+        if not str(row.get(field) or '').strip():
+            raise RowError(f"{field} is required")
+
+    if row.get('property_type') not in ('sale', 'rent'):
+        raise RowError("property_type must be 'sale' or 'rent'")
+
+    try:
+        price = float(row.get('price'))
+        bedrooms = int(row.get('bedrooms'))
+        bathrooms = int(row.get('bathrooms'))
+        area_sqft = float(row.get('area_sqft'))
+        year_built = int(row['year_built']) if row.get('year_built') else None
+        parking_spots = int(row.get('parking_spots') or 0)
+    except (TypeError, ValueError):
+        raise RowError('Invalid numeric values')
+
+    if not validate_price(price):
+        raise RowError('Price must be positive')
+    if not validate_bedrooms(bedrooms):
+        raise RowError('Invalid bedrooms count')
+    if not validate_bathrooms(bathrooms):
+        raise RowError('Invalid bathrooms count')
+
+    try:
+        category_id = resolve_category(row)
+        location_id = resolve_location(row)
+    except (TypeError, ValueError) as e:
+        raise RowError(str(e))
+
+    return {
+        'property_title': str(row['property_title']).strip(),
+        'property_description': str(row['property_description']),
+        'property_type': row['property_type'],
+        'price': price,
+        'bedrooms': bedrooms,
+        'bathrooms': bathrooms,
+        'area_sqft': area_sqft,
+        'address': str(row['address']),
+        'year_built': year_built,
+        'parking_spots': parking_spots,
+        'has_garden': parse_bool(row.get('has_garden')),
+        'has_pool': parse_bool(row.get('has_pool')),
+        'pet_friendly': parse_bool(row.get('pet_friendly')),
+        'furnished': parse_bool(row.get('furnished')),
+        'property_images': store_images(
+            parse_image_refs(row.get('property_images')), archive),
+        'user_id': user_id,
+        'category_id': category_id,
+        'location_id': location_id,
+        'is_approved': is_approved
+    }
+
+
+def process_import_job(import_job_id):
+    """
+    Import rows after the job's checkpoint; the caller has claimed the job.
+    Each batch insert commits with the new checkpoint, guarded on the old
+    one, so a crashed job resumes without duplicates and a run whose lease
+    was taken over stops instead of inserting its batch twice.
+    """
+    import_job_dao = ImportJobDAO()
+    import_job_vo = import_job_dao.get_import_job_by_id(import_job_id)
+    user_vo = UserVO.query.get(import_job_vo.user_id)
+    is_approved = user_vo is not None and user_vo.user_role == 'admin'
+
+    os.makedirs(IMAGE_FOLDER, exist_ok=True)
+    archive = zipfile.ZipFile(import_job_vo.archive_path) \
+        if import_job_vo.archive_path else None
+    checkpoint = import_job_vo.rows_processed or 0
+    rows_imported = import_job_vo.rows_imported or 0
+    row_errors = list(import_job_vo.row_errors or [])
+    rows_failed = import_job_vo.rows_failed or 0
+    processed = checkpoint
+    batch = []
+    flushed_at = time.monotonic()
+
+    def flush(**values):
+        nonlocal checkpoint, rows_imported, flushed_at
+        with transaction():
+            if batch:
+                # return_defaults fills in each mapping's property_id
+                db.session.bulk_insert_mappings(PropertyVO, batch,
+                                                return_defaults=True)
+            values.update(rows_processed=processed,
+                          rows_imported=rows_imported + len(batch),
+                          rows_failed=rows_failed, row_errors=list(row_errors))
+            if not import_job_dao.save_import_progress(import_job_id,
+                                                       checkpoint, values):
+                raise ImportTakenOver(
+                    f"Import job {import_job_id} was claimed by another run")
+            if batch and is_approved:
+                after_commit(listing_counts_cache.invalidate)
+                after_commit(saved_search_matcher.publish,
+                             [mapping['property_id'] for mapping in batch])
+            # Imported images get their sizes and variants like uploads do,
+            # queued with the batch so a crash cannot lose the jobs
+            for mapping in batch:
+                describe_property_images.delay(
+                    property_id=mapping['property_id'])
+        checkpoint = processed
+        rows_imported += len(batch)
+        flushed_at = time.monotonic()
+        batch.clear()
+
+    try:
+        for row_number, raw_row in iter_source_rows(
+                import_job_vo.source_path, import_job_vo.source_format):
+            if row_number <= checkpoint:
+                continue
+
+            processed = row_number
+            if raw_row == '':
+                continue
+
+            try:
+                row = json.loads(raw_row) if isinstance(raw_row, str) \
+                    else raw_row
+                if not isinstance(row, dict):
+                    raise RowError('Row must be an object')
+                batch.append(build_property_mapping(
+                    row, archive, import_job_vo.user_id, is_approved))
+            except (RowError, json.JSONDecodeError) as e:
+                rows_failed += 1
+                if len(row_errors) < MAX_STORED_ROW_ERRORS:
+                    row_errors.append({'row': row_number, 'error': str(e)})
+
+            if processed - checkpoint >= IMPORT_BATCH_SIZE or \
+                    time.monotonic() - flushed_at >= IMPORT_HEARTBEAT_SECONDS:
+                flush()
+
+        flush(job_status='completed')
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+@task(max_attempts=1)
+def run_import_job(import_job_id: int):
+    """Claim an import job and run it, unless another run holds it"""
+    import_job_dao = ImportJobDAO()
+    stale_before = datetime.utcnow() - timedelta(seconds=IMPORT_LEASE_SECONDS)
+    if not import_job_dao.claim_import_job(import_job_id, stale_before):
+        return
+
+    try:
+        process_import_job(import_job_id)
+    except ImportTakenOver as e:
+        db.session.rollback()
+        print(f"Stopped import job {import_job_id}: {e}")
+    except Exception as e:
+        db.session.rollback()
+        import_job_dao.fail_import_job(import_job_id, str(e))
+        raise
+
+
+def start_import_job(import_job_id):
+    """Queue the job; runs that find it already claimed do nothing"""
+    return run_import_job.delay(import_job_id=import_job_id)
+
+
+def is_import_job_active(import_job_vo):
+    """True while a run holds the job and keeps its heartbeat fresh"""
+    stale_before = datetime.utcnow() - timedelta(seconds=IMPORT_LEASE_SECONDS)
+    return import_job_vo.job_status == 'running' and \
+        import_job_vo.updated_date is not None and \
+        import_job_vo.updated_date >= stale_before
@@ -0,0 +1,175 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from base import app
+from base.utils.metrics import metrics_registry
+
+SLOW_QUERY_SECONDS = float(os.getenv('SLOW_QUERY_SECONDS', '0.1'))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', '0.1'))
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', 'base/logs/slow_queries.log')
+SLOW_REQUEST_DB_SECONDS = float(os.getenv('SLOW_REQUEST_DB_SECONDS', '0.5'))
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '10'))
+SLOWEST_STATEMENTS_PER_REQUEST = 3
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+db_queries_total = metrics_registry.counter(
+    'db_queries_total', 'SQL statements executed', ('endpoint',))
+db_query_duration_seconds = metrics_registry.histogram(
+    'db_query_duration_seconds', 'Duration of single SQL statements',
+    ('endpoint',))
+db_request_queries = metrics_registry.histogram(
+    'db_request_queries', 'SQL statements per request', ('endpoint',),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250))
+db_request_duration_seconds = metrics_registry.histogram(
+    'db_request_duration_seconds', 'Total SQL time per request',
+    ('endpoint',))
+db_slow_queries_total = metrics_registry.counter(
+    'db_slow_queries_total',
+    f'SQL statements slower than {SLOW_QUERY_SECONDS}s', ('endpoint',))
+db_n_plus_one_total = metrics_registry.counter(
+    'db_n_plus_one_total',
+    f'Requests repeating one statement more than {N_PLUS_ONE_THRESHOLD} times',
+    ('endpoint',))
+
+_placeholder_list = re.compile(
+    r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)')
+_whitespace = re.compile(r'\s+')
+_slow_log_lock = threading.Lock()
+
+
+def normalize_statement(statement):
+    """Collapse whitespace and IN-list placeholders so repeats compare equal"""
+    return _placeholder_list.sub('(?)', _whitespace.sub(' ', statement).strip())
+
+
+def current_endpoint():
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    return 'background'
+
+
+class RequestQueryStats:
+    """SQL activity of one request"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.total_seconds = 0.0
+        self.statement_counts = {}
+        self.slowest = []
+
+    def add(self, statement, seconds):
+        self.query_count += 1
+        self.total_seconds += seconds
+        normalized = normalize_statement(statement)
+        self.statement_counts[normalized] = \
+            self.statement_counts.get(normalized, 0) + 1
+        self.slowest.append((seconds, normalized))
+        if len(self.slowest) > SLOWEST_STATEMENTS_PER_REQUEST:
+            self.slowest.sort(reverse=True)
+            self.slowest.pop()
+
+    def repeated_statements(self):
+        return {statement: count
+                for statement, count in self.statement_counts.items()
+                if count > N_PLUS_ONE_THRESHOLD}
+
+
+def write_slow_query_log(entry):
+    try:
+        with _slow_log_lock:
+            os.makedirs(os.path.dirname(SLOW_QUERY_LOG) or '.', exist_ok=True)
+            with open(SLOW_QUERY_LOG, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        print(f"Error writing slow query log: {e}")
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def after_cursor_execute(conn, cursor, statement, parameters, context,
+                         executemany):
+    seconds = time.perf_counter() - conn.info['query_start_times'].pop()
+    endpoint = current_endpoint()
+    db_queries_total.inc((endpoint,))
+    db_query_duration_seconds.observe(seconds, (endpoint,))
+
+    if has_request_context():
+        stats = g.get('query_stats')
+        if stats is not None:
+            stats.add(statement, seconds)
+
+    if seconds >= SLOW_QUERY_SECONDS:
+        db_slow_queries_total.inc((endpoint,))
+        # Parameters are left out; they can hold credentials or personal data
+        if random.random() < SLOW_QUERY_SAMPLE_RATE:
+            write_slow_query_log({
+                'logged_date': datetime.utcnow().isoformat(),
+                'endpoint': endpoint,
+                'duration_ms': round(seconds * 1000, 3),
+                'executemany': executemany,
+                'statement': normalize_statement(statement)[
+                    :MAX_LOGGED_STATEMENT_LENGTH]
+            })
+
+
+@event.listens_for(Engine, 'handle_error')
+def handle_error(exception_context):
+    start_times = exception_context.connection.info.get('query_start_times') \
+        if exception_context.connection is not None else None
+    if start_times:
+        start_times.pop()
+
+
+@app.before_request
+def start_query_stats():
+    g.query_stats = RequestQueryStats()
+
+
+@app.after_request
+def record_query_stats(response):
+    stats = g.get('query_stats')
+    if stats is None:
+        return response
+
+    endpoint = current_endpoint()
+    db_request_queries.observe(stats.query_count, (endpoint,))
+    db_request_duration_seconds.observe(stats.total_seconds, (endpoint,))
+
+    repeated = stats.repeated_statements()
+    if repeated:
+        db_n_plus_one_total.inc((endpoint,))
+        statement, count = max(repeated.items(), key=lambda item: item[1])
+        print(f"Possible N+1 in {endpoint}: statement repeated {count} times: "
+              f"{statement[:200]}")
+
+    if stats.total_seconds >= SLOW_REQUEST_DB_SECONDS and \
+            random.random() < SLOW_QUERY_SAMPLE_RATE:
+        write_slow_query_log({
+            'logged_date': datetime.utcnow().isoformat(),
+            'endpoint': endpoint,
+            'query_count': stats.query_count,
+            'db_time_ms': round(stats.total_seconds * 1000, 3),
+            'slowest': [{'duration_ms': round(seconds * 1000, 3),
+                         'statement': statement[:MAX_LOGGED_STATEMENT_LENGTH]}
+                        for seconds, statement in sorted(stats.slowest,
+                                                         reverse=True)]
+        })
+
+    response.headers.add('Server-Timing',
+                         f'db;dur={stats.total_seconds * 1000:.1f};'
+                         f'desc="{stats.query_count} queries"')
+    return response
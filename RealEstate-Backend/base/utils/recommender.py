@@ -0,0 +1,196 @@
+"""
+Item-item collaborative filtering from favorites and appointments.
+
+Runs as a batch job outside the web workers and stores the top N
+properties per user in recommendation_table:
+
+    python -m base.utils.recommender --processes 4 --interval 3600
+"""
+import argparse
+import math
+import os
+import time
+from array import array
+from datetime import datetime
+from multiprocessing import Pool
+
+import numpy as np
+from scipy import sparse
+
+from base import db
+from base.com.dao.recommendation_dao import RecommendationDAO
+from base.com.vo.appointment_vo import AppointmentVO
+from base.com.vo.favorite_vo import FavoriteVO
+from base.com.vo.property_vo import PropertyVO
+
+FAVORITE_SIGNAL = 1.0
+APPOINTMENT_SIGNAL = 2.0
+NEIGHBORS_PER_ITEM = 50
+RECOMMENDATIONS_PER_USER = 20
+USER_CHUNK_SIZE = 5000
+
+# Set once per worker process by init_worker
+_similarity = None
+_listed = None
+
+
+def load_interactions():
+    """
+    Build the sparse user x property signal matrix.
+    Returns (matrix, user_ids, property_ids) where row/column i of the
+    matrix belongs to user_ids[i]/property_ids[i].
+    """
+    user_index = {}
+    property_index = {}
+    rows = array('i')
+    cols = array('i')
+    values = array('f')
+
+    def add(user_id, property_id, value):
+        rows.append(user_index.setdefault(user_id, len(user_index)))
+        cols.append(property_index.setdefault(property_id, len(property_index)))
+        values.append(value)
+
+    for user_id, property_id in db.session.query(
+            FavoriteVO.user_id, FavoriteVO.property_id).yield_per(10000):
+        add(user_id, property_id, FAVORITE_SIGNAL)
+
+    for buyer_id, property_id in db.session.query(
+            AppointmentVO.buyer_id, AppointmentVO.property_id) \
+            .filter(AppointmentVO.appointment_status != 'cancelled') \
+            .yield_per(10000):
+        add(buyer_id, property_id, APPOINTMENT_SIGNAL)
+
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(values, dtype=np.float32),
+         (np.frombuffer(rows, dtype=np.int32),
+          np.frombuffer(cols, dtype=np.int32))),
+        shape=(len(user_index), len(property_index)), dtype=np.float32)
+    # Duplicates were summed; dampen repeated signals on the same pair
+    matrix.data = np.log1p(matrix.data)
+
+    user_ids = np.fromiter(user_index.keys(), dtype=np.int64,
+                           count=len(user_index))
+    property_ids = np.fromiter(property_index.keys(), dtype=np.int64,
+                               count=len(property_index))
+    return matrix, user_ids, property_ids
+
+
+def item_similarity(interactions, neighbors=NEIGHBORS_PER_ITEM):
+    """Cosine similarity between property columns, pruned to the top neighbours"""
+    co_occurrence = (interactions.T @ interactions).tocsr()
+    norms = np.sqrt(co_occurrence.diagonal())
+    norms[norms == 0] = 1.0
+    scale = sparse.diags((1.0 / norms).astype(np.float32))
+    similarity = (scale @ co_occurrence @ scale).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    # Keep only the strongest neighbours of each item so scoring stays sparse
+    for item in range(similarity.shape[0]):
+        start, end = similarity.indptr[item], similarity.indptr[item + 1]
+        if end - start > neighbors:
+            row = similarity.data[start:end]
+            weakest = np.argpartition(row, end - start - neighbors)[
+                :end - start - neighbors]
+            row[weakest] = 0
+    similarity.eliminate_zeros()
+    return similarity
+
+
+def init_worker(similarity, listed):
+    global _similarity, _listed
+    _similarity = similarity
+    _listed = listed
+
+
+def score_chunk(chunk, limit=RECOMMENDATIONS_PER_USER):
+    """Top `limit` (column indices, scores) for each user row in the chunk"""
+    scores = (chunk @ _similarity).tocsr()
+    results = []
+    for row in range(chunk.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        items = scores.indices[start:end]
+        values = scores.data[start:end]
+        seen = chunk.indices[chunk.indptr[row]:chunk.indptr[row + 1]]
+
+        keep = _listed[items] & ~np.isin(items, seen)
+        items, values = items[keep], values[keep]
+        if len(items) > limit:
+            top = np.argpartition(-values, limit - 1)[:limit]
+            items, values = items[top], values[top]
+        order = np.argsort(-values)
+        results.append((items[order], values[order]))
+    return results
+
+
+def build_recommendations(processes=1):
+    """Recompute every user's list; returns the number of users scored"""
+    started = datetime.utcnow()
+    interactions, user_ids, property_ids = load_interactions()
+
+    listed_ids = np.fromiter(
+        (row.property_id for row in db.session.query(PropertyVO.property_id)
+         .filter(PropertyVO.is_approved == True,
+                 PropertyVO.property_status == 'available')
+         .yield_per(10000)), dtype=np.int64)
+    listed = np.isin(property_ids, listed_ids)
+    similarity = item_similarity(interactions)
+
+    chunks = [interactions[start:start + USER_CHUNK_SIZE]
+              for start in range(0, interactions.shape[0], USER_CHUNK_SIZE)]
+    recommendation_dao = RecommendationDAO()
+
+    def store(chunk_number, results):
+        offset = chunk_number * USER_CHUNK_SIZE
+        chunk_user_ids = [int(user_id) for user_id in
+                          user_ids[offset:offset + len(results)]]
+        mappings = []
+        for user_id, (items, values) in zip(chunk_user_ids, results):
+            for rank, (item, value) in enumerate(zip(items, values), start=1):
+                mappings.append({
+                    'user_id': user_id,
+                    'property_id': int(property_ids[item]),
+                    'recommendation_rank': rank,
+                    'recommendation_score': float(value),
+                    'created_date': started
+                })
+        recommendation_dao.replace_recommendations(chunk_user_ids, mappings)
+
+    if processes > 1 and len(chunks) > 1:
+        # Children only compute; drop pooled connections before forking
+        db.engine.dispose()
+        with Pool(processes, initializer=init_worker,
+                  initargs=(similarity, listed)) as pool:
+            for chunk_number, results in enumerate(
+                    pool.imap(score_chunk, chunks)):
+                store(chunk_number, results)
+    else:
+        init_worker(similarity, listed)
+        for chunk_number, chunk in enumerate(chunks):
+            store(chunk_number, score_chunk(chunk))
+
+    recommendation_dao.delete_recommendations_before(started)
+    return len(user_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Recompute personalized property recommendations')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--interval', type=int, default=0,
+                        help='Seconds between runs; 0 runs once')
+    args = parser.parse_args()
+
+    while True:
+        started = time.time()
+        users = build_recommendations(args.processes)
+        print(f"Recommendations built for {users} users in "
+              f"{time.time() - started:.1f}s")
+        if not args.interval:
+            break
+        time.sleep(max(0, args.interval - math.floor(time.time() - started)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from base import db
+from base.com.dao.reference_version_dao import ReferenceVersionDAO
+from base.com.vo.category_vo import CategoryVO
+from base.com.vo.location_vo import LocationVO
+
+CATEGORY_REFERENCE = 'category'
+LOCATION_REFERENCE = 'location'
+REFERENCE_POLL_SECONDS = 5
+
+
+def normalize_name(value):
+    return str(value or '').strip().lower()
+
+
+class CategorySnapshot:
+    """Immutable view of category_table"""
+
+    def __init__(self, category_vo_list):
+        self.by_id = {category_vo.category_id: category_vo.as_dict()
+                      for category_vo in category_vo_list}
+        self.active = [item for _, item in sorted(self.by_id.items())
+                       if item['is_active']]
+        self.ids_by_name = {normalize_name(item['category_name']):
+                            item['category_id'] for item in self.active}
+
+
+class LocationSnapshot:
+    """Immutable view of location_table"""
+
+    def __init__(self, location_vo_list):
+        self.by_id = {location_vo.location_id: location_vo.as_dict()
+                      for location_vo in location_vo_list}
+        self.active = [item for _, item in sorted(self.by_id.items())
+                       if item['is_active']]
+        self.ids_by_name = {}
+        self.ids_by_name_and_city = {}
+        for item in self.active:
+            name = normalize_name(item['location_name'])
+            self.ids_by_name.setdefault(name, []).append(item['location_id'])
+            self.ids_by_name_and_city[(name, normalize_name(item['city']))] = \
+                item['location_id']
+
+
+class ReferenceDataCache:
+    """
+    In-process copy of the category and location tables with O(1) lookups
+    by ID and by name. Writes through CategoryDAO/LocationDAO bump a row in
+    reference_version_table in the same transaction and reload this
+    worker's copy; other workers notice the new version on their next poll.
+    Returned dicts are shared and must not be modified.
+    """
+
+    LOADERS = {
+        CATEGORY_REFERENCE: (CategoryVO, CategorySnapshot),
+        LOCATION_REFERENCE: (LocationVO, LocationSnapshot),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._snapshots = {}
+        self._versions = {}
+        self._polled_at = 0
+
+    def load(self):
+        reference_version_dao = ReferenceVersionDAO()
+        reference_version_dao.ensure_versions(self.LOADERS)
+        versions = reference_version_dao.get_versions()
+        for reference_name in self.LOADERS:
+            self._reload(reference_name, versions.get(reference_name, 0))
+        self._polled_at = time.time()
+
+    def _reload(self, reference_name, version, session=None):
+        model, snapshot_class = self.LOADERS[reference_name]
+        snapshot = snapshot_class((session or db.session).query(model).all())
+        with self._lock:
+            self._snapshots[reference_name] = snapshot
+            self._versions[reference_name] = version
+
+    def reload(self, reference_name):
+        """Reload one table after a local write"""
+        version = ReferenceVersionDAO().get_versions().get(reference_name, 0)
+        self._reload(reference_name, version)
+
+    def ensure_fresh(self):
+        if time.time() - self._polled_at < REFERENCE_POLL_SECONDS or \
+                not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            # Polled in a session of its own, so a failed poll never rolls
+            # back the caller's unit of work, e.g. an import batch
+            with Session(db.engine) as session:
+                versions = ReferenceVersionDAO().get_versions(session)
+                for reference_name in self.LOADERS:
+                    version = versions.get(reference_name, 0)
+                    if reference_name not in self._snapshots or \
+                            self._versions.get(reference_name) != version:
+                        self._reload(reference_name, version, session)
+            self._polled_at = time.time()
+        except Exception as e:
+            # Keep serving the last snapshot; the next poll retries
+            print(f"Error refreshing reference data: {e}")
+        finally:
+            self._poll_lock.release()
+
+    def _snapshot(self, reference_name):
+        self.ensure_fresh()
+        snapshot = self._snapshots.get(reference_name)
+        if snapshot is None:
+            self.load()
+            snapshot = self._snapshots[reference_name]
+        return snapshot
+
+    def get_snapshot(self, reference_name):
+        """Current immutable snapshot; a new object after every reload"""
+        return self._snapshot(reference_name)
+
+    def get_category(self, category_id):
+        return self._snapshot(CATEGORY_REFERENCE).by_id.get(category_id)
+
+    def get_category_name(self, category_id):
+        category = self.get_category(category_id)
+        return category['category_name'] if category else None
+
+    def get_category_id(self, category_name):
+        """Active category ID for a case-insensitive name, or None"""
+        return self._snapshot(CATEGORY_REFERENCE).ids_by_name.get(
+            normalize_name(category_name))
+
+    def get_active_categories(self):
+        return self._snapshot(CATEGORY_REFERENCE).active
+
+    def get_location(self, location_id):
+        return self._snapshot(LOCATION_REFERENCE).by_id.get(location_id)
+
+    def get_location_ids(self, location_name, city=None):
+        """Active location IDs for a case-insensitive name, optionally in a city"""
+        snapshot = self._snapshot(LOCATION_REFERENCE)
+        name = normalize_name(location_name)
+        if city:
+            location_id = snapshot.ids_by_name_and_city.get(
+                (name, normalize_name(city)))
+            return [location_id] if location_id is not None else []
+        return snapshot.ids_by_name.get(name, [])
+
+    def get_active_locations(self):
+        return self._snapshot(LOCATION_REFERENCE).active
+
+
+reference_data = ReferenceDataCache()
@@ -0,0 +1,237 @@
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
+
+import base
+from base import app
+from base.utils.cache import TTLCache
+from base.utils.decorators import get_current_user
+from base.utils.metrics import metrics_registry
+
+# Comma-separated SQLAlchemy URLs, e.g. two SQLite files in tests
+REPLICA_URLS = [url.strip() for url in
+                os.getenv('DATABASE_REPLICA_URLS', '').split(',')
+                if url.strip()]
+REPLICA_SELECTION = os.getenv('REPLICA_SELECTION', 'round_robin')
+REPLICA_HEALTH_SECONDS = float(os.getenv('REPLICA_HEALTH_SECONDS', '5'))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+# How long a user's reads stay on the primary after they write
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '15'))
+
+db_routed_statements_total = metrics_registry.counter(
+    'db_routed_statements_total',
+    'Statements of @read_replica methods by target', ('target',))
+db_replica_failures_total = metrics_registry.counter(
+    'db_replica_failures_total',
+    'Replica reads or health checks that failed', ('replica',))
+
+_read_only = ContextVar('replica_read_only', default=False)
+_routed_replica = ContextVar('routed_replica', default=None)
+_MISSING = object()
+
+
+class Replica:
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag_seconds = None
+
+    def load(self):
+        """Connections currently checked out of this replica's pool"""
+        checkedout = getattr(self.engine.pool, 'checkedout', None)
+        return checkedout() if checkedout else 0
+
+    def measure_lag(self, connection):
+        """Replication delay in seconds, None while replication is stopped"""
+        if self.engine.dialect.name != 'mysql':
+            connection.execute(text('SELECT 1'))
+            return 0
+        try:
+            row = connection.exec_driver_sql('SHOW REPLICA STATUS') \
+                .mappings().first()
+        except ProgrammingError:
+            # MySQL before 8.0.22
+            row = connection.exec_driver_sql('SHOW SLAVE STATUS') \
+                .mappings().first()
+        if row is None:
+            # Not replicating, e.g. a restored read-only copy
+            return 0
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """
+    Picks the replica that serves a request's @read_replica reads: one per
+    request, round-robin or least-loaded among replicas whose last health
+    check succeeded within REPLICA_MAX_LAG_SECONDS of lag. Users who wrote
+    within READ_YOUR_WRITES_SECONDS, and requests that already wrote, read
+    from the primary instead.
+    """
+
+    def __init__(self, urls, selection=REPLICA_SELECTION):
+        self.replicas = [
+            Replica(f'replica{index}',
+                    create_engine(url, pool_pre_ping=True,
+                                  echo=app.config.get('SQLALCHEMY_ECHO',
+                                                      False)))
+            for index, url in enumerate(urls)]
+        self.selection = selection
+        self._cycle = itertools.count()
+        self._recent_writers = TTLCache(ttl=READ_YOUR_WRITES_SECONDS,
+                                        max_size=100000)
+        self._checker = None
+        self._checker_lock = threading.Lock()
+
+    def choose(self):
+        self._ensure_checker()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.selection == 'least_loaded':
+            return min(healthy, key=Replica.load)
+        return healthy[next(self._cycle) % len(healthy)]
+
+    def get_read_replica(self):
+        """Replica for the current read, None to use the primary"""
+        if not has_request_context():
+            return self.choose()
+        if g.get('wrote_primary'):
+            return None
+        replica = g.get('read_replica', _MISSING)
+        if replica is _MISSING:
+            current_user = get_current_user()
+            if current_user and self.wrote_recently(current_user['user_id']):
+                replica = None
+            else:
+                replica = self.choose()
+            g.read_replica = replica
+        return replica
+
+    def mark_write(self, user_id):
+        self._recent_writers.set(user_id, True)
+
+    def wrote_recently(self, user_id):
+        return self._recent_writers.get(user_id, False)
+
+    def mark_unhealthy(self, replica, reason):
+        if replica.healthy:
+            print(f"Replica {replica.name} marked unhealthy: {reason}")
+        replica.healthy = False
+        db_replica_failures_total.inc((replica.name,))
+
+    def check_replicas(self):
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    lag = replica.measure_lag(connection)
+            except DBAPIError as e:
+                self.mark_unhealthy(replica, e)
+                continue
+            replica.lag_seconds = lag
+            if lag is None or lag > REPLICA_MAX_LAG_SECONDS:
+                self.mark_unhealthy(replica, f'replication lag {lag}')
+            elif not replica.healthy:
+                print(f"Replica {replica.name} is healthy again")
+                replica.healthy = True
+
+    def _ensure_checker(self):
+        if self._checker is not None and self._checker.is_alive():
+            return
+        with self._checker_lock:
+            if self._checker is not None and self._checker.is_alive():
+                return
+            self._checker = threading.Thread(target=self._run_checker,
+                                             name='replica-health',
+                                             daemon=True)
+            self._checker.start()
+
+    def _run_checker(self):
+        while True:
+            try:
+                self.check_replicas()
+            except Exception as e:
+                print(f"Error checking replicas: {e}")
+            time.sleep(REPLICA_HEALTH_SECONDS)
+
+
+replica_router = ReplicaRouter(REPLICA_URLS)
+
+
+class RoutingSession(Session):
+    """db.session class that sends @read_replica SELECTs to a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            writing = self._flushing or getattr(clause, 'is_dml', False)
+            if writing:
+                if has_request_context():
+                    g.wrote_primary = True
+            elif _read_only.get():
+                replica = replica_router.get_read_replica()
+                db_routed_statements_total.inc(
+                    (replica.name if replica else 'primary',))
+                if replica is not None:
+                    _routed_replica.set(replica)
+                    return replica.engine
+        return super().get_bind(mapper, clause, bind, **kwargs)
+
+
+def read_replica(f):
+    """
+    Run a DAO read method against a replica when one is configured. Only
+    for reads that tolerate replication lag: not for rows about to be
+    modified, uniqueness checks before inserts, or loaders of caches that
+    writes invalidate. A replica that fails mid-read is marked unhealthy
+    and the read is retried on the primary.
+    """
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not replica_router.replicas or _read_only.get():
+            return f(*args, **kwargs)
+
+        read_only_token = _read_only.set(True)
+        routed_token = _routed_replica.set(None)
+        try:
+            return f(*args, **kwargs)
+        except OperationalError as e:
+            replica = _routed_replica.get()
+            if replica is None:
+                raise
+            replica_router.mark_unhealthy(replica, e)
+            base.db.session.rollback()
+            if has_request_context():
+                g.read_replica = None
+            _read_only.set(False)
+            return f(*args, **kwargs)
+        finally:
+            _routed_replica.reset(routed_token)
+            _read_only.reset(read_only_token)
+
+    return decorated
+
+
+@app.before_request
+def reset_replica_routing():
+    # g can outlive a request when the app context was pushed globally
+    g.pop('read_replica', None)
+    g.pop('wrote_primary', None)
+
+
+@app.after_request
+def remember_primary_writes(response):
+    if g.get('wrote_primary') and replica_router.replicas:
+        current_user = get_current_user()
+        if current_user:
+            replica_router.mark_write(current_user['user_id'])
+    return response
@@ -0,0 +1,178 @@
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+
+from base import app
+from base.utils.decorators import get_current_user
+from base.utils.metrics import metrics_registry
+
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_SECONDS = float(os.getenv('PROFILE_INTERVAL_SECONDS', '0.005'))
+PROFILE_FOLDER = os.getenv('PROFILE_FOLDER', 'base/logs/profiles/')
+PROFILE_HEADER = 'X-Profile'
+MAX_PROFILE_DEPTH = 128
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                16777216)
+
+http_requests_total = metrics_registry.counter(
+    'http_requests_total', 'HTTP responses by route and status',
+    ('endpoint', 'method', 'status'))
+http_request_duration_seconds = metrics_registry.histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ('endpoint', 'method'))
+http_request_size_bytes = metrics_registry.histogram(
+    'http_request_size_bytes', 'Request body size by route', ('endpoint',),
+    buckets=SIZE_BUCKETS)
+http_response_size_bytes = metrics_registry.histogram(
+    'http_response_size_bytes', 'Response body size by route', ('endpoint',),
+    buckets=SIZE_BUCKETS)
+http_profiles_total = metrics_registry.counter(
+    'http_profiles_total', 'Requests captured by the sampling profiler',
+    ('endpoint',))
+
+
+def frame_label(frame):
+    code = frame.f_code
+    filename = code.co_filename
+    cwd = os.getcwd()
+    if filename.startswith(cwd):
+        filename = filename[len(cwd) + 1:]
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """
+    One background thread that periodically samples the stacks of the
+    request threads registered with it and folds them into collapsed-stack
+    counts ("outer;inner;leaf count"), the input format of flame graph tools.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._targets = {}
+        self._thread = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._targets[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                name='stack-sampler',
+                                                daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._targets.pop(thread_id, Counter())
+
+    def _run(self):
+        labels = {}
+        while True:
+            with self._lock:
+                while not self._targets:
+                    self._wake.wait()
+                thread_ids = list(self._targets)
+
+            frames = sys._current_frames()
+            samples = {}
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None and len(stack) < MAX_PROFILE_DEPTH:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(frame)
+                    stack.append(label)
+                    frame = frame.f_back
+                if stack:
+                    samples[thread_id] = ';'.join(reversed(stack))
+            del frames
+
+            with self._lock:
+                for thread_id, stack in samples.items():
+                    counts = self._targets.get(thread_id)
+                    if counts is not None:
+                        counts[stack] += 1
+            time.sleep(self.interval)
+
+
+stack_sampler = StackSampler()
+
+
+def profiling_requested():
+    """Sampled by PROFILE_SAMPLE_RATE, or forced by an admin's X-Profile header"""
+    if request.headers.get(PROFILE_HEADER):
+        current_user = get_current_user()
+        if current_user and current_user['user_role'] == 'admin':
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def write_profile(endpoint, counts):
+    """Store collapsed stacks; returns the profile ID"""
+    profile_id = f'{endpoint}-{time.strftime("%Y%m%d%H%M%S")}-{uuid.uuid4().hex[:8]}'
+    os.makedirs(PROFILE_FOLDER, exist_ok=True)
+    with open(os.path.join(PROFILE_FOLDER, f'{profile_id}.folded'), 'w',
+              encoding='utf-8') as handle:
+        for stack, count in counts.most_common():
+            handle.write(f'{stack} {count}\n')
+    return profile_id
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    if profiling_requested():
+        g.profile_thread_id = threading.get_ident()
+        stack_sampler.start(g.profile_thread_id)
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+
+    endpoint = request.endpoint or 'unmatched'
+    seconds = time.perf_counter() - started
+    http_requests_total.inc((endpoint, request.method,
+                             str(response.status_code)))
+    http_request_duration_seconds.observe(seconds, (endpoint, request.method))
+    if request.content_length:
+        http_request_size_bytes.observe(request.content_length, (endpoint,))
+    if not response.direct_passthrough:
+        http_response_size_bytes.observe(
+            response.calculate_content_length() or 0, (endpoint,))
+
+    profile_thread_id = g.pop('profile_thread_id', None)
+    if profile_thread_id is not None:
+        counts = stack_sampler.stop(profile_thread_id)
+        http_profiles_total.inc((endpoint,))
+        try:
+            if counts:
+                response.headers['X-Profile-Id'] = write_profile(endpoint,
+                                                                 counts)
+        except OSError as e:
+            print(f"Error writing request profile: {e}")
+
+    response.headers.add('Server-Timing', f'app;dur={seconds * 1000:.1f}')
+    return response
+
+
+@app.teardown_request
+def stop_request_profile(exception=None):
+    # Covers requests that never reached after_request
+    profile_thread_id = g.pop('profile_thread_id', None)
+    if profile_thread_id is not None:
+        stack_sampler.stop(profile_thread_id)
@@ -0,0 +1,298 @@
+import math
+import threading
+import time
+from itertools import product
+
+from base import app, db
+from base.com.vo.property_vo import PropertyVO
+from base.utils.notifications import notification_queue
+
+SAVED_SEARCH_RELOAD_SECONDS = 60
+MAX_SEARCH_TERM_LENGTH = 100
+
+# filter key -> type; same keys PropertyDAO.search_properties understands
+SAVED_SEARCH_FIELDS = {
+    'property_type': str,
+    'category_id': int,
+    'location_id': int,
+    'min_price': float,
+    'max_price': float,
+    'min_bedrooms': int,
+    'min_bathrooms': int,
+    'min_area': float,
+    'search_term': str,
+}
+
+
+def normalize_search_filters(filters):
+    """
+    Coerce a filter dict to the saved form. Unknown keys and empty values
+    are dropped (search_properties ignores falsy filters too); raises
+    ValueError for values of the wrong type.
+    """
+    if not isinstance(filters, dict):
+        raise ValueError('Filters must be an object')
+
+    normalized = {}
+    for key, cast in SAVED_SEARCH_FIELDS.items():
+        value = filters.get(key)
+        if value is None or value == '':
+            continue
+        try:
+            value = cast(value.strip() if isinstance(value, str) else value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid value for {key}')
+        if value:
+            normalized[key] = value
+
+    if normalized.get('property_type', 'sale') not in ('sale', 'rent'):
+        raise ValueError('property_type must be sale or rent')
+    if len(normalized.get('search_term', '')) > MAX_SEARCH_TERM_LENGTH:
+        raise ValueError('Search term is too long')
+    if normalized.get('max_price', math.inf) < normalized.get('min_price', 0):
+        raise ValueError('max_price must not be below min_price')
+    return normalized
+
+
+class IntervalTree:
+    """Static centered interval tree answering "which intervals contain x" """
+
+    def __init__(self, intervals):
+        # intervals: [(low, high, key)] with low <= high, bounds inclusive
+        self._root = self._build(intervals)
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        endpoints = sorted(bound for low, high, _ in intervals
+                           for bound in (low, high) if math.isfinite(bound))
+        center = endpoints[len(endpoints) // 2] if endpoints else 0.0
+
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+
+        return (center,
+                sorted(overlapping, key=lambda interval: interval[0]),
+                sorted(overlapping, key=lambda interval: -interval[1]),
+                self._build(left), self._build(right))
+
+    def stab(self, point):
+        """Keys of every interval containing `point`"""
+        keys = []
+        node = self._root
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if point < center:
+                for low, _, key in by_low:
+                    if low > point:
+                        break
+                    keys.append(key)
+                node = left
+            else:
+                for _, high, key in by_high:
+                    if high < point:
+                        break
+                    keys.append(key)
+                node = right if point > center else None
+        return keys
+
+
+class PriceBucket:
+    """Saved searches sharing one type/category/location key"""
+
+    def __init__(self):
+        self.ranges = {}
+        self._tree = None
+
+    def put(self, saved_search_id, low, high):
+        self.ranges[saved_search_id] = (low, high)
+        self._tree = None
+
+    def discard(self, saved_search_id):
+        if self.ranges.pop(saved_search_id, None) is not None:
+            self._tree = None
+
+    def stab(self, price):
+        if self._tree is None:
+            # Rebuilt lazily so a burst of new searches costs one build
+            self._tree = IntervalTree([(low, high, saved_search_id)
+                                       for saved_search_id, (low, high)
+                                       in self.ranges.items()])
+        return self._tree.stab(price)
+
+
+def bucket_key(filters):
+    return (filters.get('property_type'), filters.get('category_id'),
+            filters.get('location_id'))
+
+
+def matches_residual_filters(filters, row):
+    """Predicates not covered by the bucket key and price range"""
+    if (row.bedrooms or 0) < filters.get('min_bedrooms', 0):
+        return False
+    if (row.bathrooms or 0) < filters.get('min_bathrooms', 0):
+        return False
+    if (row.area_sqft or 0) < filters.get('min_area', 0):
+        return False
+    search_term = filters.get('search_term')
+    if search_term:
+        search_term = search_term.lower()
+        return any(search_term in (value or '').lower() for value in
+                   (row.property_title, row.property_description, row.address))
+    return True
+
+
+class SavedSearchMatcher:
+    """
+    Reverse index of saved searches. A newly published listing is matched
+    by probing the eight buckets its type/category/location can fall in
+    (each key either equal to the listing's value or unset) and stabbing
+    their price interval trees, so only the candidates left over are
+    checked against the remaining filters.
+
+    Searches saved through this process are indexed immediately; a
+    background thread reloads the full index periodically to pick up
+    changes from other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._searches = {}
+        self._loaded_at = None
+        self._reloader = None
+        self._reloader_lock = threading.Lock()
+
+    def _put(self, saved_search_id, user_id, filters):
+        """Index one search; call with the lock held"""
+        self._discard(saved_search_id)
+        key = bucket_key(filters)
+        self._buckets.setdefault(key, PriceBucket()).put(
+            saved_search_id, filters.get('min_price', -math.inf),
+            filters.get('max_price', math.inf))
+        self._searches[saved_search_id] = (user_id, filters, key)
+
+    def _discard(self, saved_search_id):
+        """Drop one search; call with the lock held"""
+        entry = self._searches.pop(saved_search_id, None)
+        if entry is not None:
+            bucket = self._buckets[entry[2]]
+            bucket.discard(saved_search_id)
+            if not bucket.ranges:
+                del self._buckets[entry[2]]
+
+    def load(self):
+        from base.com.vo.saved_search_vo import SavedSearchVO
+
+        rows = db.session.query(SavedSearchVO.saved_search_id,
+                                SavedSearchVO.user_id,
+                                SavedSearchVO.search_filters) \
+            .filter(SavedSearchVO.is_active == True) \
+            .yield_per(5000)
+        with self._lock:
+            self._buckets = {}
+            self._searches = {}
+            for row in rows:
+                self._put(row.saved_search_id, row.user_id,
+                          row.search_filters or {})
+            self._loaded_at = time.time()
+
+    def add(self, saved_search_id, user_id, filters):
+        with self._lock:
+            if self._loaded_at is not None:
+                self._put(saved_search_id, user_id, filters)
+
+    def remove(self, saved_search_id):
+        with self._lock:
+            self._discard(saved_search_id)
+
+    def _ensure_reloader(self):
+        if self._reloader is not None and self._reloader.is_alive():
+            return
+        with self._reloader_lock:
+            if self._reloader is not None and self._reloader.is_alive():
+                return
+            self._reloader = threading.Thread(
+                target=self._run_reloader, name='saved-search-reloader',
+                daemon=True)
+            self._reloader.start()
+
+    def _run_reloader(self):
+        while True:
+            time.sleep(SAVED_SEARCH_RELOAD_SECONDS)
+            with app.app_context():
+                try:
+                    self.load()
+                except Exception as e:
+                    print(f"Error reloading saved searches: {e}")
+                finally:
+                    db.session.remove()
+
+    def match(self, row):
+        """(saved_search_id, user_id) of every saved search the listing satisfies"""
+        if self._loaded_at is None:
+            # Once per process; the reloader keeps the index fresh after that
+            self.load()
+        self._ensure_reloader()
+
+        price = row.price or 0
+        matches = []
+        with self._lock:
+            for key in product((row.property_type, None),
+                               (row.category_id, None),
+                               (row.location_id, None)):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+                for saved_search_id in bucket.stab(price):
+                    user_id, filters, _ = self._searches[saved_search_id]
+                    if matches_residual_filters(filters, row):
+                        matches.append((saved_search_id, user_id))
+        return matches
+
+    def publish(self, property_ids):
+        """
+        Match newly approved listings and queue one notification per
+        interested user and listing. Failures are logged, never raised,
+        so they cannot undo an approval.
+        """
+        try:
+            rows = db.session.query(PropertyVO.property_id, PropertyVO.user_id,
+                                    PropertyVO.property_title,
+                                    PropertyVO.property_description,
+                                    PropertyVO.address,
+                                    PropertyVO.property_type,
+                                    PropertyVO.category_id,
+                                    PropertyVO.location_id, PropertyVO.price,
+                                    PropertyVO.bedrooms, PropertyVO.bathrooms,
+                                    PropertyVO.area_sqft) \
+                .filter(PropertyVO.property_id.in_(property_ids),
+                        PropertyVO.is_approved == True) \
+                .all()
+
+            queued = 0
+            for row in rows:
+                by_user = {}
+                for saved_search_id, user_id in self.match(row):
+                    if user_id != row.user_id:
+                        by_user.setdefault(user_id, []).append(saved_search_id)
+                for user_id, saved_search_ids in by_user.items():
+                    notification_queue.enqueue(user_id, 'saved_search_match', {
+                        'property_id': row.property_id,
+                        'property_title': row.property_title,
+                        'saved_search_ids': saved_search_ids
+                    })
+                queued += len(by_user)
+            return queued
+        except Exception as e:
+            print(f"Error matching saved searches: {e}")
+            return 0
+
+
+saved_search_matcher = SavedSearchMatcher()
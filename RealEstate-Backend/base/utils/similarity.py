@@ -0,0 +1,251 @@
+import math
+import threading
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from base import db
+from base.com.vo.location_vo import LocationVO
+from base.com.vo.property_vo import PropertyVO
+
+SIMILARITY_REFRESH_SECONDS = 30
+SIMILARITY_REBUILD_SECONDS = 3600
+
+# (column, weight); continuous columns are z-score normalized at build time
+NUMERIC_FEATURES = (
+    ('log_price', 3.0),
+    ('bedrooms', 1.5),
+    ('bathrooms', 1.0),
+    ('log_area', 1.5),
+    ('year_built', 0.5),
+    ('parking_spots', 0.5),
+    ('latitude', 2.0),
+    ('longitude', 2.0),
+)
+AMENITY_FEATURES = ('has_garden', 'has_pool', 'pet_friendly', 'furnished')
+AMENITY_WEIGHT = 0.5
+CATEGORY_WEIGHT = 1.5
+
+
+def feature_query():
+    return db.session.query(PropertyVO.property_id, PropertyVO.property_type,
+                            PropertyVO.price, PropertyVO.bedrooms,
+                            PropertyVO.bathrooms, PropertyVO.area_sqft,
+                            PropertyVO.year_built, PropertyVO.parking_spots,
+                            PropertyVO.has_garden, PropertyVO.has_pool,
+                            PropertyVO.pet_friendly, PropertyVO.furnished,
+                            PropertyVO.category_id, PropertyVO.is_approved,
+                            PropertyVO.property_status,
+                            PropertyVO.updated_date,
+                            LocationVO.latitude, LocationVO.longitude) \
+        .join(LocationVO, PropertyVO.location_id == LocationVO.location_id)
+
+
+def is_listed(row):
+    return bool(row.is_approved) and row.property_status == 'available'
+
+
+def raw_numeric_values(row):
+    return [
+        math.log1p(max(row.price or 0, 0)),
+        row.bedrooms or 0,
+        row.bathrooms or 0,
+        math.log1p(max(row.area_sqft or 0, 0)),
+        row.year_built if row.year_built else math.nan,
+        row.parking_spots or 0,
+        row.latitude if row.latitude is not None else math.nan,
+        row.longitude if row.longitude is not None else math.nan,
+    ]
+
+
+class SimilarityIndex:
+    """
+    Normalized feature matrix of listed properties for nearest-neighbour
+    queries. Rows changed since the last refresh (by updated_date) are
+    patched in place; normalization statistics and the category columns
+    are recomputed by a periodic full rebuild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._property_ids = np.zeros(0, dtype=np.int64)
+        self._is_sale = np.zeros(0, dtype=bool)
+        self._active = np.zeros(0, dtype=bool)
+        self._rows = {}
+        self._size = 0
+        self._means = None
+        self._stds = None
+        self._category_columns = {}
+        self._weights = None
+        self._built_at = None
+        self._refreshed_at = None
+        self._last_updated_date = None
+
+    def _encode(self, row):
+        numeric = np.array(raw_numeric_values(row), dtype=np.float64)
+        numeric = np.where(np.isnan(numeric), self._means, numeric)
+        numeric = (numeric - self._means) / self._stds
+
+        vector = np.zeros(len(self._weights), dtype=np.float32)
+        vector[:len(NUMERIC_FEATURES)] = numeric
+        offset = len(NUMERIC_FEATURES)
+        for index, field in enumerate(AMENITY_FEATURES):
+            vector[offset + index] = 1.0 if getattr(row, field) else 0.0
+        column = self._category_columns.get(row.category_id)
+        if column is not None:
+            vector[column] = 1.0
+        return vector
+
+    def rebuild(self):
+        started = datetime.utcnow()
+        rows = [row for row in feature_query().filter(
+            PropertyVO.is_approved == True,
+            PropertyVO.property_status == 'available').yield_per(1000)]
+
+        raw = np.array([raw_numeric_values(row) for row in rows],
+                       dtype=np.float64).reshape(len(rows),
+                                                 len(NUMERIC_FEATURES))
+        with warnings.catch_warnings():
+            # All-missing columns (e.g. no year_built) fall back to 0 / 1
+            warnings.simplefilter('ignore', RuntimeWarning)
+            means = np.nanmean(raw, axis=0) if len(rows) else \
+                np.zeros(len(NUMERIC_FEATURES))
+            stds = np.nanstd(raw, axis=0) if len(rows) else \
+                np.ones(len(NUMERIC_FEATURES))
+        means = np.nan_to_num(means)
+        stds = np.where(np.nan_to_num(stds) > 0, np.nan_to_num(stds), 1.0)
+
+        category_ids = sorted({row.category_id for row in rows})
+        offset = len(NUMERIC_FEATURES) + len(AMENITY_FEATURES)
+        category_columns = {category_id: offset + index
+                            for index, category_id in enumerate(category_ids)}
+        weights = np.array([weight for _, weight in NUMERIC_FEATURES] +
+                           [AMENITY_WEIGHT] * len(AMENITY_FEATURES) +
+                           [CATEGORY_WEIGHT] * len(category_ids),
+                           dtype=np.float32)
+
+        with self._lock:
+            self._means = means
+            self._stds = stds
+            self._category_columns = category_columns
+            self._weights = weights
+            capacity = max(16, len(rows))
+            self._matrix = np.zeros((capacity, len(weights)), dtype=np.float32)
+            self._property_ids = np.zeros(capacity, dtype=np.int64)
+            self._is_sale = np.zeros(capacity, dtype=bool)
+            self._active = np.zeros(capacity, dtype=bool)
+            self._rows = {}
+            self._size = 0
+            for row in rows:
+                self._put(row)
+            now = time.time()
+            self._built_at = now
+            self._refreshed_at = now
+            self._last_updated_date = started
+
+    def _put(self, row):
+        """Insert or overwrite one row; call with the lock held"""
+        index = self._rows.get(row.property_id)
+        if index is None:
+            if self._size == len(self._property_ids):
+                capacity = max(16, self._size * 2)
+                matrix = np.zeros((capacity, self._matrix.shape[1]),
+                                  dtype=np.float32)
+                matrix[:self._size] = self._matrix[:self._size]
+                self._matrix = matrix
+                self._property_ids = np.resize(self._property_ids, capacity)
+                self._is_sale = np.resize(self._is_sale, capacity)
+                self._active = np.resize(self._active, capacity)
+            index = self._size
+            self._size += 1
+            self._rows[row.property_id] = index
+            self._property_ids[index] = row.property_id
+
+        self._matrix[index] = self._encode(row)
+        self._is_sale[index] = row.property_type == 'sale'
+        self._active[index] = is_listed(row)
+
+    def refresh(self):
+        """Patch rows updated since the last refresh"""
+        changed = feature_query().filter(
+            PropertyVO.updated_date >= self._last_updated_date).all()
+        with self._lock:
+            for row in changed:
+                if row.property_id in self._rows or is_listed(row):
+                    self._put(row)
+                if row.updated_date and row.updated_date > self._last_updated_date:
+                    self._last_updated_date = row.updated_date
+            self._refreshed_at = time.time()
+
+    def remove(self, property_id):
+        with self._lock:
+            index = self._rows.get(property_id)
+            if index is not None:
+                self._active[index] = False
+
+    def ensure_fresh(self):
+        now = time.time()
+        if self._built_at is None:
+            with self._refresh_lock:
+                if self._built_at is None:
+                    self.rebuild()
+            return
+
+        stale = now - self._refreshed_at > SIMILARITY_REFRESH_SECONDS
+        if not stale or not self._refresh_lock.acquire(blocking=False):
+            # Another request is refreshing; serve the current matrix
+            return
+        try:
+            if now - self._built_at > SIMILARITY_REBUILD_SECONDS:
+                self.rebuild()
+            else:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def get_similar_ids(self, property_id, limit):
+        """IDs of the `limit` nearest listed properties of the same type"""
+        self.ensure_fresh()
+        with self._lock:
+            # Snapshot references; refreshes replace or patch rows, which a
+            # concurrent query may see half-applied but never out of bounds
+            size = self._size
+            matrix = self._matrix[:size]
+            property_ids = self._property_ids[:size]
+            active = self._active[:size]
+            sale_flags = self._is_sale[:size]
+            weights = self._weights
+            index = self._rows.get(property_id)
+            if index is not None:
+                target = matrix[index].copy()
+                is_sale = sale_flags[index]
+
+        if index is None:
+            row = feature_query().filter(
+                PropertyVO.property_id == property_id).first()
+            if row is None:
+                return None
+            with self._lock:
+                target = self._encode(row)
+            is_sale = row.property_type == 'sale'
+
+        diff = matrix - target
+        distances = (diff * diff) @ weights
+        candidates = active & (sale_flags == is_sale)
+        if index is not None:
+            candidates[index] = False
+        distances = np.where(candidates, distances, np.inf)
+
+        count = min(limit, int(candidates.sum()))
+        if count == 0:
+            return []
+        nearest = np.argpartition(distances, count - 1)[:count]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [int(property_ids[i]) for i in nearest]
+
+
+similarity_index = SimilarityIndex()
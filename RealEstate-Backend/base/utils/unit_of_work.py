@@ -0,0 +1,130 @@
+"""
+Unit of work over db.session. DAO write methods end with commit() instead
+of db.session.commit() and hand side effects that must only follow a
+durable write (cache invalidation, index updates) to after_commit(). Called
+on their own they behave as before. Inside `with transaction():` or a
+@transactional function, commit() only flushes and the callbacks are held,
+so several DAO calls become one atomic commit:
+
+    with transaction():
+        appointment_id = AppointmentDAO().insert_appointment(appointment_vo)
+        PropertyDAO().mark_property_pending(property_id)
+
+Nested transactions join the outermost one. savepoint() scopes a part of
+a transaction that may fail, e.g. an insert racing a unique constraint,
+without losing the rest of it.
+"""
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import update
+
+from base import db
+
+
+def _state():
+    # Kept on the session so it is scoped exactly like db.session
+    return db.session.info.setdefault('unit_of_work',
+                                      {'depth': 0, 'callbacks': []})
+
+
+def in_transaction():
+    return _state()['depth'] > 0
+
+
+def commit():
+    """Commit, or flush when a surrounding transaction commits later"""
+    if in_transaction():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def update_where(model, identity, values, *guards):
+    """
+    UPDATE model SET values WHERE <primary key> = identity AND guards as
+    one statement, committed like any DAO write. Returns the number of
+    rows matched: 0 means the row is missing or a guard no longer holds,
+    so a concurrent change is never silently overwritten.
+    """
+    primary_key, = model.__mapper__.primary_key
+    # The MySQL dialects set CLIENT_FOUND_ROWS, so an update that matches
+    # but changes nothing still counts
+    result = db.session.execute(
+        update(model).where(primary_key == identity, *guards).values(values))
+    commit()
+    return result.rowcount
+
+
+def after_commit(callback, *args):
+    """Run callback(*args) once the current work is committed"""
+    if in_transaction():
+        _state()['callbacks'].append((callback, args))
+    else:
+        callback(*args)
+
+
+def _run_callbacks(callbacks):
+    for callback, args in callbacks:
+        try:
+            callback(*args)
+        except Exception as e:
+            # The data is committed; a failed side effect must not undo it
+            print(f"Error running after-commit callback: {e}")
+
+
+@contextmanager
+def transaction():
+    state = _state()
+    state['depth'] += 1
+    try:
+        yield db.session
+    except BaseException:
+        state['depth'] -= 1
+        if state['depth'] == 0:
+            state['callbacks'].clear()
+            db.session.rollback()
+        raise
+
+    state['depth'] -= 1
+    if state['depth'] > 0:
+        return
+    callbacks = state['callbacks'][:]
+    state['callbacks'].clear()
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _run_callbacks(callbacks)
+
+
+def transactional(f):
+    """Run the decorated function as one unit of work"""
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        with transaction():
+            return f(*args, **kwargs)
+
+    return decorated
+
+
+@contextmanager
+def savepoint():
+    """
+    Roll back only this block when it raises; the exception still
+    propagates. Outside a transaction the block's work is committed.
+    """
+    state = _state()
+    pending = len(state['callbacks'])
+    with transaction():
+        nested = db.session.begin_nested()
+        try:
+            yield db.session
+            nested.commit()
+        except BaseException:
+            # Also needed after a failed flush deactivated the savepoint
+            nested.rollback()
+            del state['callbacks'][pending:]
+            raise
@@ -0,0 +1,212 @@
+"""
+Streaming multipart uploads. receive_multipart() parses request.stream
+chunk by chunk instead of letting Werkzeug spool every file to a temporary
+file before the handler runs. Each image is checked by its magic bytes as
+soon as its first chunk arrives and written straight to its final name
+under base/static, and the byte limits apply while reading, so a bogus or
+oversized upload is rejected without reading the rest of it.
+"""
+import os
+import uuid
+
+from flask import request
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, \
+    MultipartDecoder, NeedData
+
+from base.utils.helpers import allowed_file
+from base.utils.media import media_path
+
+MAX_UPLOAD_FILE_BYTES = int(os.getenv('MAX_UPLOAD_FILE_BYTES',
+                                      str(10 * 1024 * 1024)))
+MAX_UPLOAD_FILES = int(os.getenv('MAX_UPLOAD_FILES', '10'))
+# Same defaults Flask applies to request.form
+MAX_FORM_FIELD_BYTES = 500 * 1024
+MAX_FORM_PARTS = 1000
+UPLOAD_CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 12
+
+# Leading bytes of each accepted format -> extension the file is saved as
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+def format_size(size):
+    """Byte count for messages: 512 bytes, 200 KB, 1.5 MB"""
+    for unit, scale in (('MB', 1024 * 1024), ('KB', 1024)):
+        if size >= scale:
+            return f"{round(size / scale, 1):g} {unit}"
+    return f"{size} bytes"
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def sniff_image_type(head):
+    """Extension for the image format `head` starts with, None otherwise"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+class MultipartUpload:
+    """
+    One multipart request body. file_fields maps each accepted file field
+    to the media folder its images are saved in; parts of other file
+    fields are read past and dropped.
+    """
+
+    def __init__(self, file_fields, max_files=MAX_UPLOAD_FILES,
+                 max_file_bytes=MAX_UPLOAD_FILE_BYTES):
+        self.file_fields = file_fields
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self.form = MultiDict()
+        self.files = {}  # field name -> [saved filename]
+        self._saved = []  # (folder_name, filename) written so far
+        self._part = None
+        self._chunks = []
+        self._size = 0
+        self._handle = None
+
+    def receive(self):
+        """(form, files) once the whole body is read; raises UploadError"""
+        content_type, options = parse_options_header(request.content_type)
+        if content_type != 'multipart/form-data' or not options.get(
+                'boundary'):
+            raise UploadError('Expected a multipart/form-data body')
+        decoder = MultipartDecoder(options['boundary'].encode(),
+                                   MAX_FORM_FIELD_BYTES,
+                                   max_parts=MAX_FORM_PARTS)
+        event = None
+        try:
+            stream = request.stream
+            while not isinstance(event, Epilogue):
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                decoder.receive_data(chunk or None)
+                event = decoder.next_event()
+                while not isinstance(event, (NeedData, Epilogue)):
+                    self._handle_event(event)
+                    event = decoder.next_event()
+                if not chunk:
+                    break
+            if not isinstance(event, Epilogue):
+                raise UploadError('Upload ended before it was complete')
+        except RequestEntityTooLarge:
+            self.discard()
+            raise UploadError('Upload is too large', 413)
+        except ValueError:
+            self.discard()
+            raise UploadError('Malformed multipart/form-data body')
+        except BaseException:
+            self.discard()
+            raise
+        return self.form, self.files
+
+    def discard(self):
+        """Delete every file this upload wrote"""
+        self._close()
+        for folder_name, filename in self._saved:
+            try:
+                os.remove(media_path(folder_name, filename))
+            except FileNotFoundError:
+                pass
+        self._saved = []
+        self.files = {}
+
+    def _handle_event(self, event):
+        if isinstance(event, Field):
+            self._part = ('field', event.name, None, None)
+            self._chunks = []
+        elif isinstance(event, File):
+            self._start_file(event)
+        elif isinstance(event, Data):
+            kind = self._part[0]
+            if kind == 'field':
+                self._chunks.append(event.data)
+                if not event.more_data:
+                    self.form.add(self._part[1], b''.join(self._chunks)
+                                  .decode('utf-8', 'replace'))
+            elif kind == 'file':
+                self._write(event.data, event.more_data)
+                if not event.more_data:
+                    self._finish_file()
+
+    def _start_file(self, event):
+        folder_name = self.file_fields.get(event.name)
+        if folder_name is None or not event.filename:
+            # Not a field this endpoint stores, or an empty file input
+            self._part = ('skip', event.name, None, None)
+            return
+        if not allowed_file(event.filename):
+            raise UploadError(f"Unsupported image type: {event.filename}")
+        if len(self._saved) >= self.max_files:
+            raise UploadError(f"At most {self.max_files} images can be "
+                              f"uploaded at once")
+        self._part = ('file', event.name, event.filename, folder_name)
+        self._chunks = []
+        self._size = 0
+
+    def _write(self, data, more_data):
+        _, _, filename, _ = self._part
+        self._size += len(data)
+        if self._size > self.max_file_bytes:
+            raise UploadError(f"{filename} is larger than "
+                              f"{format_size(self.max_file_bytes)}", 413)
+        if self._handle is not None:
+            self._handle.write(data)
+            return
+        # Hold the first bytes back until there are enough to sniff
+        self._chunks.append(data)
+        head = b''.join(self._chunks)
+        if len(head) >= SNIFF_BYTES or not more_data:
+            self._open(head)
+
+    def _open(self, head):
+        _, field_name, filename, folder_name = self._part
+        extension = sniff_image_type(head)
+        if extension is None:
+            raise UploadError(f"{filename} is not a valid image")
+        saved_filename = f"{uuid.uuid4().hex}.{extension}"
+        path = media_path(folder_name, saved_filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._handle = open(path, 'wb')
+        self._saved.append((folder_name, saved_filename))
+        self._handle.write(head)
+        self._chunks = []
+
+    def _finish_file(self):
+        _, field_name, _, _ = self._part
+        if self._handle is None:
+            self._open(b''.join(self._chunks))
+        self.files.setdefault(field_name, []).append(self._saved[-1][1])
+        self._close()
+
+    def _close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def receive_multipart(file_fields, max_files=MAX_UPLOAD_FILES,
+                      max_file_bytes=MAX_UPLOAD_FILE_BYTES):
+    """
+    Read a multipart request, saving the images of file_fields
+    ({field name: media folder}) as they stream in. Returns (form, files)
+    with form like request.form and files as {field name: [filename]};
+    raises UploadError, after deleting anything written, when the body is
+    rejected.
+    """
+    return MultipartUpload(file_fields, max_files, max_file_bytes).receive()
@@ -0,0 +1,108 @@
+import atexit
+import threading
+
+from base import app, db
+from base.utils.popularity import popularity_tracker
+
+VIEW_STRIPES = 16
+VIEW_FLUSH_INTERVAL_SECONDS = 10
+VIEW_FLUSH_THRESHOLD = 5000
+
+
+class StripedCounter:
+    """Per-key counters split across independently locked stripes"""
+
+    def __init__(self, stripes=VIEW_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [{} for _ in range(stripes)]
+        self._totals = [0] * stripes
+
+    def add(self, key, count=1):
+        """Add to a key's count; returns the total held by its stripe"""
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            counts = self._counts[stripe]
+            counts[key] = counts.get(key, 0) + count
+            self._totals[stripe] += count
+            return self._totals[stripe]
+
+    def get(self, key):
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            return self._counts[stripe].get(key, 0)
+
+    def drain(self):
+        """Swap out every stripe and return the merged counts"""
+        drained = {}
+        for stripe, lock in enumerate(self._locks):
+            with lock:
+                counts = self._counts[stripe]
+                self._counts[stripe] = {}
+                self._totals[stripe] = 0
+            drained.update(counts)
+        return drained
+
+
+class ViewTracker:
+    """
+    Write-behind property view counting. Requests only touch one stripe of
+    the buffer; a background thread coalesces the counts and hands them to
+    the popularity tracker, which upserts property_stats_table in one batch.
+    """
+
+    def __init__(self):
+        self._buffer = StripedCounter()
+        self._flush_event = threading.Event()
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+
+    def record_view(self, property_id):
+        stripe_total = self._buffer.add(property_id)
+        self._ensure_flusher()
+        if stripe_total * VIEW_STRIPES >= VIEW_FLUSH_THRESHOLD:
+            self._flush_event.set()
+
+    def get_pending_views(self, property_id):
+        return self._buffer.get(property_id) + \
+            popularity_tracker.get_pending_counts(property_id)[1]
+
+    def flush(self):
+        views = self._buffer.drain()
+        if views:
+            popularity_tracker.record_many(
+                {property_id: (0, count) for property_id, count in views.items()})
+        popularity_tracker.flush()
+        return len(views)
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._flusher_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run_flusher,
+                                             name='view-flusher', daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._flush_event.wait(VIEW_FLUSH_INTERVAL_SECONDS)
+            self._flush_event.clear()
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Error flushing view counts: {e}")
+                finally:
+                    db.session.remove()
+
+    def flush_at_exit(self):
+        with app.app_context():
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing view counts: {e}")
+
+
+view_tracker = ViewTracker()
+atexit.register(view_tracker.flush_at_exit)
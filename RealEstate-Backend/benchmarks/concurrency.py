@@ -0,0 +1,256 @@
+"""
+Concurrency ceiling of the two serving modes on the hot read endpoints.
+
+Starts the threaded Flask server (as app.py does) and the ASGI app under
+uvicorn against the same database, then holds increasing numbers of
+keep-alive connections that each issue back-to-back reads:
+
+    python -m benchmarks.concurrency --levels 50,200,1000,2000
+    python -m benchmarks.concurrency --database-url mysql+pymysql://... \
+        --skip-seed --levels 100,500,2000,5000
+
+A mode's ceiling is the highest level whose error rate stays under
+--max-error-rate and whose p95 stays under --slo-ms. Point it at MySQL for
+meaningful numbers: SQLite answers too quickly for threads to pile up
+waiting on I/O. Thousands of connections need `ulimit -n` well above the
+highest level.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.run import percentile
+
+DEFAULT_DATABASE = os.path.join(tempfile.gettempdir(),
+                                'realestate_concurrency.db')
+
+SERVER_COMMANDS = {
+    'threaded': lambda port: [
+        sys.executable, '-c',
+        f'from base import app; app.run(host="127.0.0.1", port={port}, '
+        f'threaded=True)'],
+    'asgi': lambda port: [
+        sys.executable, '-m', 'uvicorn', 'asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+        '--no-access-log', '--backlog', '8192'],
+}
+
+
+def hot_read_paths(dataset, count, rng):
+    """Weighted sample of the endpoints served by the async path"""
+    paths = []
+    for _ in range(count):
+        property_id, _ = rng.choice(dataset.properties)
+        name = rng.choice(dataset.location_names).lower()
+        paths.append(rng.choices((
+            f'/api/properties/{property_id}',
+            f'/api/reviews/property/{property_id}',
+            '/api/categories?include=counts',
+            '/api/locations?include=counts',
+            f'/api/locations/search?q={name[:3]}',
+        ), weights=(40, 25, 10, 10, 15))[0])
+    return paths
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed')
+    status = int(status_line.split()[1])
+    length = 0
+    keep_alive = status_line.startswith(b'HTTP/1.1')
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value.strip().lower() != 'close'
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def connection_worker(port, paths, deadline, timeout, latencies,
+                            errors, rng):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection('127.0.0.1', port), timeout)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                         f'Connection: keep-alive\r\n\r\n'.encode())
+            await writer.drain()
+            status, keep_alive = await asyncio.wait_for(
+                read_response(reader), timeout)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                ValueError, IndexError) as e:
+            errors.append(type(e).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(port, paths, connections, seconds, timeout, seed):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        connection_worker(port, paths, deadline, timeout, latencies, errors,
+                          random.Random(seed + index))
+        for index in range(connections)))
+    elapsed = time.perf_counter() - started
+    values = sorted(latencies)
+    attempts = len(latencies) + sum(1 for error in errors
+                                    if not isinstance(error, int))
+    return {
+        'connections': connections,
+        'requests': len(values),
+        'errors': len(errors),
+        'error_rate': round(len(errors) / max(1, attempts), 4),
+        'throughput_rps': round(len(values) / elapsed, 2),
+        'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+    }
+
+
+def wait_until_ready(port, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with {process.returncode}')
+        try:
+            with urllib.request.urlopen(
+                    f'http://127.0.0.1:{port}/api/categories', timeout=2):
+                return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError('Server did not start in time')
+
+
+def benchmark_mode(mode, args, paths):
+    env = dict(os.environ, SQLALCHEMY_ECHO='false')
+    process = subprocess.Popen(SERVER_COMMANDS[mode](args.port), env=env,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(args.port, process)
+        asyncio.run(run_level(args.port, paths, 10, 2, args.timeout, 0))
+        results = []
+        for connections in args.levels:
+            result = asyncio.run(run_level(args.port, paths, connections,
+                                           args.seconds, args.timeout,
+                                           args.seed))
+            print(f"{mode:<9}{connections:>7}{result['throughput_rps']:>10}"
+                  f"{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                  f"{result['p99_ms']:>10}{result['error_rate']:>8.1%}")
+            results.append(result)
+        return results
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def concurrency_ceiling(results, slo_ms, max_error_rate):
+    ceiling = 0
+    for result in results:
+        if result['error_rate'] > max_error_rate or result['p95_ms'] > slo_ms:
+            break
+        ceiling = result['connections']
+    return ceiling
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compare concurrency ceilings of the serving modes')
+    parser.add_argument('--database-url',
+                        default=f'sqlite:///{DEFAULT_DATABASE}')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--properties', type=int, default=5000)
+    parser.add_argument('--modes', default='threaded,asgi')
+    parser.add_argument('--levels', default='25,100,400,1000',
+                        type=lambda value: [int(level) for level in
+                                            value.split(',')])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--slo-ms', type=float, default=500)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='Write the JSON report here')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['SQLALCHEMY_ECHO'] = 'false'
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    if not args.skip_seed and \
+            args.database_url == f'sqlite:///{DEFAULT_DATABASE}' and \
+            os.path.exists(DEFAULT_DATABASE):
+        os.remove(DEFAULT_DATABASE)
+
+    from benchmarks.dataset import seed_dataset, load_dataset
+
+    if args.skip_seed:
+        dataset = load_dataset()
+    else:
+        dataset = seed_dataset({'properties': args.properties,
+                                'users': max(100, args.properties // 5),
+                                'reviews': args.properties * 2,
+                                'favorites': args.properties * 2,
+                                'appointments': args.properties // 2},
+                               seed=args.seed)
+    paths = hot_read_paths(dataset, 1000, random.Random(args.seed))
+
+    print(f"{'mode':<9}{'conns':>7}{'rps':>10}{'p50':>10}{'p95':>10}"
+          f"{'p99':>10}{'errors':>8}")
+    report = {'config': {key: value for key, value in vars(args).items()
+                         if key != 'output'}, 'modes': {}}
+    for mode in args.modes.split(','):
+        results = benchmark_mode(mode, args, paths)
+        report['modes'][mode] = {
+            'levels': results,
+            'ceiling': concurrency_ceiling(results, args.slo_ms,
+                                           args.max_error_rate),
+        }
+
+    for mode, result in report['modes'].items():
+        print(f"{mode} ceiling: {result['ceiling']} connections "
+              f"(p95 <= {args.slo_ms:g}ms, errors <= "
+              f"{args.max_error_rate:.0%})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Synthetic dataset for the benchmark harness, written with executemany
+bulk inserts so hundreds of thousands of rows seed in seconds.
+"""
+import random
+from datetime import datetime, timedelta, time as dt_time
+
+from sqlalchemy import insert
+
+from base import db
+from base.com.dao.property_dao import listing_counts_cache
+from base.com.vo.appointment_vo import AppointmentVO
+from base.com.vo.category_vo import CategoryVO
+from base.com.vo.favorite_vo import FavoriteVO
+from base.com.vo.location_vo import LocationVO
+from base.com.vo.property_vo import PropertyVO
+from base.com.vo.review_vo import ReviewVO
+from base.com.vo.user_vo import UserVO
+from base.utils.helpers import hash_password
+from base.utils.popularity import popularity_tracker
+from base.utils.reference_data import reference_data
+
+INSERT_CHUNK_SIZE = 5000
+
+DEFAULT_VOLUMES = {
+    'users': 2000,
+    'categories': 8,
+    'locations': 200,
+    'properties': 10000,
+    'reviews': 20000,
+    'favorites': 20000,
+    'appointments': 5000,
+}
+
+CITIES = (('Mumbai', 'Maharashtra'), ('Pune', 'Maharashtra'),
+          ('Bangalore', 'Karnataka'), ('Chennai', 'Tamil Nadu'),
+          ('Hyderabad', 'Telangana'), ('Delhi', 'Delhi'),
+          ('Ahmedabad', 'Gujarat'), ('Kolkata', 'West Bengal'))
+CATEGORY_NAMES = ('Apartment', 'Villa', 'Bungalow', 'Penthouse', 'Studio',
+                  'Row House', 'Farm House', 'Plot', 'Office', 'Shop')
+SYLLABLES = ('an', 'dhe', 'ri', 'ban', 'dra', 'ko', 'ra', 'man', 'ga', 'la',
+             'wa', 'kh', 'ed', 'pur', 'na', 'gar', 'vi', 'har', 'sa', 'to')
+WORDS = ('spacious', 'sunny', 'renovated', 'quiet', 'corner', 'garden',
+         'modern', 'family', 'luxury', 'compact', 'metro', 'lake', 'view')
+
+
+def bulk_insert(model, rows):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(model.__table__),
+                           rows[start:start + INSERT_CHUNK_SIZE])
+    db.session.commit()
+
+
+def max_id(column):
+    return db.session.query(db.func.max(column)).scalar() or 0
+
+
+class Dataset:
+    """IDs and sample values the scenarios draw from"""
+
+    def __init__(self, user_ids, admin_id, properties, location_names):
+        self.user_ids = user_ids
+        self.admin_id = admin_id
+        # [(property_id, owner_id)] of approved, available listings
+        self.properties = properties
+        self.location_names = location_names
+
+
+def seed_dataset(volumes, seed=42):
+    """Insert a synthetic dataset on top of whatever the DB already holds"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    volumes = dict(DEFAULT_VOLUMES, **volumes)
+    run_tag = f'{seed}-{int(now.timestamp())}'
+
+    password = hash_password('benchmark@123')
+    first_user = max_id(UserVO.user_id) + 1
+    bulk_insert(UserVO, [{
+        'user_name': f'Bench User {i}',
+        'user_email': f'bench{i}-{run_tag}@example.com',
+        'user_password': password,
+        'user_role': 'user',
+        'is_verified': True,
+        'is_active': True,
+        'created_date': now - timedelta(days=rng.randint(0, 700)),
+        'updated_date': now,
+    } for i in range(volumes['users'])])
+    user_ids = list(range(first_user, first_user + volumes['users']))
+
+    first_category = max_id(CategoryVO.category_id) + 1
+    bulk_insert(CategoryVO, [{
+        'category_name': f'{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {run_tag}-{i}',
+        'is_active': True,
+    } for i in range(volumes['categories'])])
+    category_ids = list(range(first_category,
+                              first_category + volumes['categories']))
+
+    first_location = max_id(LocationVO.location_id) + 1
+    location_rows = []
+    for i in range(volumes['locations']):
+        city, state = CITIES[i % len(CITIES)]
+        name = ''.join(rng.choice(SYLLABLES)
+                       for _ in range(rng.randint(2, 4))).title()
+        location_rows.append({
+            'location_name': name,
+            'city': city,
+            'state': state,
+            'country': 'India',
+            'zip_code': f'{400000 + i}',
+            'latitude': 8 + rng.random() * 25,
+            'longitude': 70 + rng.random() * 20,
+            'is_active': True,
+        })
+    bulk_insert(LocationVO, location_rows)
+    location_ids = list(range(first_location,
+                              first_location + volumes['locations']))
+
+    first_property = max_id(PropertyVO.property_id) + 1
+    property_rows = []
+    for i in range(volumes['properties']):
+        created = now - timedelta(minutes=rng.randint(0, 525600))
+        is_approved = rng.random() < 0.9
+        property_rows.append({
+            'property_title': f'{rng.choice(WORDS).title()} '
+                              f'{rng.randint(1, 5)} BHK {i}',
+            'property_description': ' '.join(rng.choice(WORDS)
+                                              for _ in range(60)),
+            'property_type': 'sale' if rng.random() < 0.6 else 'rent',
+            'price': float(rng.randint(10, 5000) * 10000),
+            'bedrooms': rng.randint(1, 5),
+            'bathrooms': rng.randint(1, 4),
+            'area_sqft': float(rng.randint(300, 5000)),
+            'address': f'{rng.randint(1, 999)} Bench Street',
+            'year_built': rng.randint(1970, 2025),
+            'parking_spots': rng.randint(0, 3),
+            'has_garden': rng.random() < 0.3,
+            'has_pool': rng.random() < 0.1,
+            'pet_friendly': rng.random() < 0.4,
+            'furnished': rng.random() < 0.5,
+            'property_images': [f'bench_{i % 50}.jpg'],
+            'property_status': 'available' if rng.random() < 0.85 else
+            rng.choice(('sold', 'rented', 'pending')),
+            'is_featured': rng.random() < 0.05,
+            'is_approved': is_approved,
+            'created_date': created,
+            'updated_date': created,
+            'user_id': rng.choice(user_ids),
+            'category_id': rng.choice(category_ids),
+            'location_id': rng.choice(location_ids),
+        })
+    bulk_insert(PropertyVO, property_rows)
+    property_ids = range(first_property,
+                         first_property + volumes['properties'])
+    owners = {property_id: row['user_id']
+              for property_id, row in zip(property_ids, property_rows)}
+    listed = [(property_id, owners[property_id])
+              for property_id, row in zip(property_ids, property_rows)
+              if row['is_approved'] and row['property_status'] == 'available']
+
+    # Skewed popularity: a few listings collect most of the activity
+    def popular_property():
+        return first_property + min(int(rng.paretovariate(1.2)) - 1,
+                                    volumes['properties'] - 1)
+
+    def unique_pairs(count):
+        pairs = set()
+        attempts = 0
+        while len(pairs) < count and attempts < count * 5:
+            attempts += 1
+            pairs.add((rng.choice(user_ids),
+                       popular_property() if rng.random() < 0.5 else
+                       rng.randrange(first_property,
+                                     first_property + volumes['properties'])))
+        return pairs
+
+    bulk_insert(ReviewVO, [{
+        'user_id': user_id,
+        'property_id': property_id,
+        'rating': rng.randint(1, 5),
+        'comment': ' '.join(rng.choice(WORDS) for _ in range(20)),
+        'is_approved': rng.random() < 0.8,
+        'created_date': now - timedelta(minutes=rng.randint(0, 525600)),
+    } for user_id, property_id in unique_pairs(volumes['reviews'])])
+
+    bulk_insert(FavoriteVO, [{
+        'user_id': user_id,
+        'property_id': property_id,
+        'created_date': now - timedelta(minutes=rng.randint(0, 525600)),
+    } for user_id, property_id in unique_pairs(volumes['favorites'])])
+
+    appointment_rows = []
+    for _ in range(volumes['appointments']):
+        property_id, seller_id = rng.choice(listed)
+        appointment_rows.append({
+            'buyer_id': rng.choice(user_ids),
+            'seller_id': seller_id,
+            'property_id': property_id,
+            'appointment_date': (now + timedelta(days=rng.randint(-60, 60))).date(),
+            'appointment_time': dt_time(rng.randint(9, 18), rng.choice((0, 30))),
+            'appointment_status': rng.choice(('pending', 'confirmed',
+                                              'cancelled', 'completed')),
+            'message': 'Benchmark visit',
+            'created_date': now,
+        })
+    bulk_insert(AppointmentVO, appointment_rows)
+
+    refresh_caches()
+    return Dataset(user_ids, get_admin_id(), listed,
+                   [row['location_name'] for row in location_rows])
+
+
+def load_dataset(limit=5000):
+    """Dataset view of an already seeded DB, for --skip-seed runs"""
+    user_ids = [row.user_id for row in db.session.query(UserVO.user_id)
+                .filter(UserVO.user_role == 'user').limit(limit)]
+    listed = [(row.property_id, row.user_id) for row in
+              db.session.query(PropertyVO.property_id, PropertyVO.user_id)
+              .filter(PropertyVO.is_approved == True,
+                      PropertyVO.property_status == 'available')
+              .limit(limit)]
+    location_names = [row.location_name for row in
+                      db.session.query(LocationVO.location_name).limit(limit)]
+    refresh_caches()
+    return Dataset(user_ids, get_admin_id(), listed, location_names)
+
+
+def get_admin_id():
+    row = db.session.query(UserVO.user_id) \
+        .filter(UserVO.user_role == 'admin') \
+        .order_by(UserVO.user_id) \
+        .first()
+    return row.user_id if row else None
+
+
+def refresh_caches():
+    """Rows were written behind the DAOs' backs; reload in-process caches"""
+    reference_data.load()
+    popularity_tracker.load()
+    listing_counts_cache.invalidate()
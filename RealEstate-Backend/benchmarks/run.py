@@ -0,0 +1,292 @@
+"""
+API benchmark harness.
+
+Seeds a synthetic dataset, replays weighted user sessions (see
+scenarios.py) and reports throughput and p50/p95/p99 latency per route:
+
+    python -m benchmarks.run --properties 20000 --sessions 2000
+    python -m benchmarks.run --save-baseline benchmarks/baselines/sqlite.json
+    python -m benchmarks.run --baseline benchmarks/baselines/sqlite.json
+
+By default it runs in-process against the Flask test client and a
+throwaway SQLite file. To measure a real multi-worker server, start it
+against the same database and SECRET_KEY, then pass --url, for example
+--url http://127.0.0.1:8000 --concurrency 32 --skip-seed.
+
+A run with --baseline exits with status 1 if any route's p95 regressed by
+more than --tolerance (and at least --min-regression-ms), or if its error
+rate grew. Routes with fewer than MIN_COMPARED_SAMPLES requests are not
+compared.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_DATABASE = os.path.join(tempfile.gettempdir(),
+                                'realestate_benchmark.db')
+MIN_COMPARED_SAMPLES = 30
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Thread-safe latency and status collection per route label"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._errors = {}
+
+    def record(self, label, seconds, ok):
+        with self._lock:
+            self._latencies.setdefault(label, []).append(seconds)
+            if not ok:
+                self._errors[label] = self._errors.get(label, 0) + 1
+
+    def summary(self, elapsed):
+        routes = {}
+        with self._lock:
+            for label, latencies in sorted(self._latencies.items()):
+                values = sorted(latencies)
+                routes[label] = {
+                    'requests': len(values),
+                    'errors': self._errors.get(label, 0),
+                    'throughput_rps': round(len(values) / elapsed, 2),
+                    'mean_ms': round(sum(values) / len(values) * 1000, 3),
+                    'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+                    'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+                    'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+                }
+        total = sum(route['requests'] for route in routes.values())
+        return {'elapsed_seconds': round(elapsed, 3),
+                'total_requests': total,
+                'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+                'routes': routes}
+
+
+class Session:
+    """Issues one request, times it and records the outcome"""
+
+    def __init__(self, recorder, token_for):
+        self.recorder = recorder
+        self.token_for = token_for
+
+    def request(self, label, method, path, user_id=None, user_role='user',
+                json=None, expected=(200,)):
+        headers = {}
+        if user_id is not None:
+            headers['Authorization'] = self.token_for(user_id, user_role)
+        started = time.perf_counter()
+        try:
+            status, body = self.send(method, path, headers, json)
+        except Exception:
+            status, body = None, None
+        self.recorder.record(label, time.perf_counter() - started,
+                             status in expected)
+        return body
+
+
+class TestClientSession(Session):
+    def __init__(self, recorder, token_for, client):
+        super().__init__(recorder, token_for)
+        self.client = client
+
+    def send(self, method, path, headers, body):
+        response = self.client.open(path, method=method, headers=headers,
+                                    json=body)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpSession(Session):
+    def __init__(self, recorder, token_for, base_url):
+        super().__init__(recorder, token_for)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, headers, body):
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+def compare_to_baseline(summary, baseline, tolerance, min_regression_ms):
+    """Human-readable regressions of summary against a stored baseline"""
+    regressions = []
+    for label, base in baseline.get('routes', {}).items():
+        current = summary['routes'].get(label)
+        # Percentiles of a handful of samples are mostly noise
+        if current is None or min(base['requests'],
+                                  current['requests']) < MIN_COMPARED_SAMPLES:
+            continue
+        limit = base['p95_ms'] * (1 + tolerance)
+        if current['p95_ms'] > limit and \
+                current['p95_ms'] - base['p95_ms'] >= min_regression_ms:
+            regressions.append(
+                f"{label}: p95 {current['p95_ms']}ms > baseline "
+                f"{base['p95_ms']}ms +{tolerance:.0%}")
+        base_error_rate = base['errors'] / max(1, base['requests'])
+        error_rate = current['errors'] / max(1, current['requests'])
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(f"{label}: error rate {error_rate:.1%} > "
+                               f"baseline {base_error_rate:.1%}")
+    return regressions
+
+
+def print_summary(summary):
+    print(f"{'route':<44}{'reqs':>7}{'err':>5}{'rps':>9}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, route in summary['routes'].items():
+        print(f"{label:<44}{route['requests']:>7}{route['errors']:>5}"
+              f"{route['throughput_rps']:>9}{route['p50_ms']:>9}"
+              f"{route['p95_ms']:>9}{route['p99_ms']:>9}")
+    print(f"{summary['total_requests']} requests in "
+          f"{summary['elapsed_seconds']}s "
+          f"({summary['throughput_rps']} req/s), latencies in ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the API')
+    parser.add_argument('--database-url',
+                        default=f'sqlite:///{DEFAULT_DATABASE}')
+    parser.add_argument('--url', help='Benchmark a running server instead '
+                                      'of the in-process test client')
+    parser.add_argument('--skip-seed', action='store_true',
+                        help='Reuse the data already in the database')
+    parser.add_argument('--seed', type=int, default=42)
+    for name, default in (('users', 2000), ('categories', 8),
+                          ('locations', 200), ('properties', 10000),
+                          ('reviews', 20000), ('favorites', 20000),
+                          ('appointments', 5000)):
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--scenarios', default='all',
+                        help='Comma-separated scenario names or "all"')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Fail on regressions against it')
+    parser.add_argument('--save-baseline', help='Store this run as baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-regression-ms', type=float, default=5.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Configure the app before base is imported
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('SQLALCHEMY_ECHO', 'false')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    if not args.skip_seed and args.database_url == f'sqlite:///{DEFAULT_DATABASE}' \
+            and os.path.exists(DEFAULT_DATABASE):
+        os.remove(DEFAULT_DATABASE)
+
+    from base import app
+    from base.utils.helpers import generate_token
+    from benchmarks.dataset import seed_dataset, load_dataset
+    from benchmarks.scenarios import SCENARIOS
+
+    if args.skip_seed:
+        dataset = load_dataset()
+    else:
+        started = time.perf_counter()
+        dataset = seed_dataset({name: getattr(args, name) for name in (
+            'users', 'categories', 'locations', 'properties', 'reviews',
+            'favorites', 'appointments')}, seed=args.seed)
+        print(f"Seeded dataset in {time.perf_counter() - started:.1f}s")
+
+    names = list(SCENARIOS) if args.scenarios == 'all' else \
+        [name.strip() for name in args.scenarios.split(',')]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)}")
+    functions = [SCENARIOS[name][0] for name in names]
+    weights = [SCENARIOS[name][1] for name in names]
+
+    def token_for(user_id, user_role):
+        return generate_token(user_id, user_role)
+
+    def make_session(recorder):
+        if args.url:
+            return HttpSession(recorder, token_for, args.url)
+        return TestClientSession(recorder, token_for, app.test_client())
+
+    def run_sessions(recorder, count, seed):
+        rng = random.Random(seed)
+        plan = rng.choices(functions, weights=weights, k=count)
+        local = threading.local()
+
+        def run_one(index):
+            session = getattr(local, 'session', None)
+            if session is None:
+                session = local.session = make_session(recorder)
+            plan[index](session, dataset, random.Random(seed * 1000003 + index))
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(run_one, range(count)))
+
+    run_sessions(Recorder(), args.warmup, args.seed + 1)
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    run_sessions(recorder, args.sessions, args.seed)
+    summary = recorder.summary(time.perf_counter() - started)
+    summary['config'] = {key: value for key, value in vars(args).items()
+                         if key not in ('baseline', 'save_baseline',
+                                        'output')}
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(summary, handle, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or '.', exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as handle:
+            json.dump(summary, handle, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        changed = [key for key in ('scenarios', 'concurrency', 'url',
+                                   'properties', 'users')
+                   if baseline.get('config', {}).get(key) !=
+                   summary['config'].get(key)]
+        if changed:
+            print(f"Warning: baseline was recorded with different "
+                  f"{', '.join(changed)}")
+        regressions = compare_to_baseline(summary, baseline, args.tolerance,
+                                          args.min_regression_ms)
+        if regressions:
+            print('Regressions against baseline:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('No regressions against baseline')
+
+
+if __name__ == '__main__':
+    main()
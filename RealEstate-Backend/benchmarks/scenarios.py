@@ -0,0 +1,113 @@
+"""
+Benchmark scenarios. Each scenario is one simulated user session: a
+function that takes (session, dataset, rng) and issues its requests
+through session.request(label, method, path, ...), where the label is
+the route template that results are grouped by.
+"""
+from datetime import date, timedelta
+
+
+def browse(session, dataset, rng):
+    user_id = rng.choice(dataset.user_ids)
+    session.request('GET /api/properties', 'GET',
+                    '/api/properties?include=favorited', user_id=user_id)
+    session.request('GET /api/categories', 'GET',
+                    '/api/categories?include=counts')
+    session.request('GET /api/locations', 'GET',
+                    '/api/locations?include=counts')
+    session.request('GET /api/properties/trending', 'GET',
+                    '/api/properties/trending')
+
+
+def search(session, dataset, rng):
+    user_id = rng.choice(dataset.user_ids)
+    name = rng.choice(dataset.location_names).lower()
+    # Type-ahead fires once per keystroke
+    for length in range(1, min(len(name), 4) + 1):
+        session.request('GET /api/locations/search', 'GET',
+                        f'/api/locations/search?q={name[:length]}')
+
+    filters = {'property_type': rng.choice(('sale', 'rent')),
+               'min_bedrooms': rng.randint(1, 3),
+               'max_price': rng.randint(100, 5000) * 10000}
+    response = session.request('POST /api/saved-searches', 'POST',
+                               '/api/saved-searches', user_id=user_id,
+                               json={'search_name': 'Benchmark',
+                                     'search_filters': filters},
+                               expected=(201, 400))
+    saved_search_id = (response or {}).get('data', {}).get('saved_search_id')
+    if saved_search_id:
+        session.request('GET /api/saved-searches/<id>/results', 'GET',
+                        f'/api/saved-searches/{saved_search_id}/results',
+                        user_id=user_id)
+        session.request('DELETE /api/saved-searches/<id>', 'DELETE',
+                        f'/api/saved-searches/{saved_search_id}',
+                        user_id=user_id)
+
+
+def detail(session, dataset, rng):
+    property_id, _ = rng.choice(dataset.properties)
+    session.request('GET /api/properties/<id>', 'GET',
+                    f'/api/properties/{property_id}')
+    session.request('GET /api/reviews/property/<id>', 'GET',
+                    f'/api/reviews/property/{property_id}')
+    session.request('GET /api/properties/<id>/similar', 'GET',
+                    f'/api/properties/{property_id}/similar')
+
+
+def favorite(session, dataset, rng):
+    user_id = rng.choice(dataset.user_ids)
+    property_id, _ = rng.choice(dataset.properties)
+    session.request('POST /api/favorites', 'POST', '/api/favorites',
+                    user_id=user_id, json={'property_id': property_id},
+                    expected=(201, 400))
+    ids = ','.join(str(rng.choice(dataset.properties)[0]) for _ in range(20))
+    session.request('GET /api/favorites/check', 'GET',
+                    f'/api/favorites/check?ids={ids},{property_id}',
+                    user_id=user_id)
+    session.request('DELETE /api/favorites/<id>', 'DELETE',
+                    f'/api/favorites/{property_id}', user_id=user_id,
+                    expected=(200, 404))
+
+
+def book(session, dataset, rng):
+    user_id = rng.choice(dataset.user_ids)
+    property_id, seller_id = rng.choice(dataset.properties)
+    visit_date = date.today() + timedelta(days=rng.randint(1, 365))
+    response = session.request(
+        'POST /api/appointments', 'POST', '/api/appointments',
+        user_id=user_id, expected=(201, 400),
+        json={'property_id': property_id, 'seller_id': seller_id,
+              'appointment_date': visit_date.isoformat(),
+              'appointment_time': f'{rng.randint(9, 18):02d}:'
+                                  f'{rng.choice((0, 30)):02d}'})
+    session.request('GET /api/appointments', 'GET', '/api/appointments',
+                    user_id=user_id)
+    appointment_id = (response or {}).get('data', {}).get('appointment_id')
+    if appointment_id:
+        session.request('PUT /api/appointments/<id>/cancel', 'PUT',
+                        f'/api/appointments/{appointment_id}/cancel',
+                        user_id=user_id)
+
+
+def admin_dashboard(session, dataset, rng):
+    admin = {'user_id': dataset.admin_id, 'user_role': 'admin'}
+    session.request('GET /api/admin/dashboard', 'GET',
+                    '/api/admin/dashboard', **admin)
+    session.request('GET /api/admin/moderation/properties', 'GET',
+                    '/api/admin/moderation/properties?limit=50', **admin)
+    session.request('GET /api/admin/moderation/reviews', 'GET',
+                    '/api/admin/moderation/reviews?limit=50', **admin)
+    session.request('GET /api/admin/appointments', 'GET',
+                    '/api/admin/appointments', **admin)
+
+
+# name -> (session function, relative weight in the default mix)
+SCENARIOS = {
+    'browse': (browse, 40),
+    'search': (search, 20),
+    'detail': (detail, 25),
+    'favorite': (favorite, 8),
+    'book': (book, 5),
+    'admin': (admin_dashboard, 2),
+}
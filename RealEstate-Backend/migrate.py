@@ -0,0 +1,31 @@
+import os
+import sys
+
+# Run only the command given, not the upgrade importing base would do
+os.environ['AUTO_MIGRATE'] = 'false'
+
+from base.utils.migrations import migration_runner, __doc__ as usage
+
+
+def main(argv):
+    command = argv[0] if argv else 'upgrade'
+    if command == 'upgrade':
+        migration_runner.upgrade(argv[1] if len(argv) > 1 else 'head')
+    elif command == 'downgrade' and len(argv) > 1:
+        migration_runner.downgrade(argv[1])
+    elif command == 'stamp' and len(argv) > 1:
+        migration_runner.stamp(argv[1])
+    elif command == 'current':
+        print(migration_runner.current() or 'base')
+    elif command == 'history':
+        for revision, description, applied in migration_runner.history():
+            print(f"{revision} {'[applied]' if applied else '[pending]'} "
+                  f"{description}")
+    else:
+        print(usage)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,75 @@
+"""
+Importing base connects to DATABASE_URL and migrates it, so tests point it
+at a throwaway SQLite file before anything imports the app:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix='realestate-tests-')
+os.environ['DATABASE_URL'] = \
+    f"sqlite:///{os.path.join(_database_dir, 'primary.db')}"
+os.environ['DATABASE_REPLICA_URLS'] = ''
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-' + 'x' * 32)
+os.environ['SQLALCHEMY_ECHO'] = 'false'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import itertools  # noqa: E402
+
+import pytest  # noqa: E402
+
+_unique = itertools.count(1)
+
+
+@pytest.fixture
+def foreign_keys():
+    """Enforce foreign keys on SQLite connections, as MySQL does"""
+    from sqlalchemy import event
+    from base import db
+
+    def enable(connection, _):
+        connection.execute('PRAGMA foreign_keys=ON')
+
+    db.session.remove()
+    db.engine.dispose()
+    event.listen(db.engine, 'connect', enable)
+    yield
+    db.session.remove()
+    event.remove(db.engine, 'connect', enable)
+    db.engine.dispose()
+
+
+@pytest.fixture
+def make_property():
+    """Factory committing a listing with its own owner, category and location"""
+    from base import db
+    from base.com.vo.category_vo import CategoryVO
+    from base.com.vo.location_vo import LocationVO
+    from base.com.vo.property_vo import PropertyVO
+    from base.com.vo.user_vo import UserVO
+
+    def make(**values):
+        number = next(_unique)
+        user_vo = UserVO(user_name=f'Owner {number}',
+                         user_email=f'owner{number}@example.com',
+                         user_password='x', user_role='user')
+        category_vo = CategoryVO(category_name=f'Category {number}')
+        location_vo = LocationVO(location_name=f'Location {number}',
+                                 city='City', state='State', country='Country')
+        db.session.add_all([user_vo, category_vo, location_vo])
+        db.session.flush()
+        property_vo = PropertyVO(
+            property_title=f'Listing {number}', property_description='A home',
+            property_type='sale', price=100000, bedrooms=2, bathrooms=1,
+            area_sqft=900, address='1 Main St', user_id=user_vo.user_id,
+            category_id=category_vo.category_id,
+            location_id=location_vo.location_id, **values)
+        db.session.add(property_vo)
+        db.session.commit()
+        return property_vo.property_id
+
+    yield make
+    db.session.remove()
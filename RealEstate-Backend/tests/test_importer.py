@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from base import db
+from base.com.vo.import_job_vo import ImportJobVO
+from base.com.vo.property_vo import PropertyVO
+from base.com.vo.user_vo import UserVO
+from base.utils import job_queue, property_importer
+from base.utils.property_importer import is_import_job_active, run_import_job
+from base.utils.reference_data import reference_data
+from base.utils.saved_search_matcher import saved_search_matcher
+
+
+@pytest.fixture
+def queued_jobs(monkeypatch):
+    """(task name, payload) of every job enqueued instead of running it"""
+    jobs = []
+
+    def enqueue(task, payload, idempotency_key=None, delay_seconds=0):
+        jobs.append((task.name, payload))
+        return len(jobs)
+
+    monkeypatch.setattr(job_queue.job_queue, 'enqueue', enqueue)
+    return jobs
+
+
+@pytest.fixture
+def make_import_job(tmp_path, monkeypatch, make_property):
+    """Factory committing an admin's CSV import job of `rows` valid rows"""
+    monkeypatch.setattr(property_importer, 'IMAGE_FOLDER', str(tmp_path))
+    (tmp_path / 'front.jpg').write_bytes(b'jpeg')
+    property_vo = PropertyVO.query.get(make_property())
+    reference_data.load()
+
+    def make(rows, **values):
+        title = f'Imported {property_vo.property_id}-{rows}'
+        source_path = tmp_path / f'{title}.csv'
+        lines = ['property_title,property_description,address,property_type,'
+                 'price,bedrooms,bathrooms,area_sqft,category_id,location_id,'
+                 'property_images']
+        lines += [f'{title},A home,1 Main St,sale,100000,2,1,900,'
+                  f'{property_vo.category_id},{property_vo.location_id},'
+                  f'front.jpg'] * rows
+        source_path.write_text('\n'.join(lines) + '\n')
+
+        UserVO.query.get(property_vo.user_id).user_role = 'admin'
+        import_job_vo = ImportJobVO(source_format='csv',
+                                    source_path=str(source_path),
+                                    user_id=property_vo.user_id, **values)
+        db.session.add(import_job_vo)
+        db.session.commit()
+        return import_job_vo.import_job_id, title
+
+    return make
+
+
+def imported_count(title):
+    return PropertyVO.query.filter_by(property_title=title).count()
+
+
+def test_run_skips_a_job_held_by_a_live_run(make_import_job, queued_jobs):
+    import_job_id, title = make_import_job(2, job_status='running')
+
+    run_import_job(import_job_id=import_job_id)
+    assert imported_count(title) == 0
+    import_job_vo = ImportJobVO.query.get(import_job_id)
+    assert is_import_job_active(import_job_vo)
+
+    # A run whose heartbeat went stale lost its worker and is taken over
+    import_job_vo.updated_date = datetime.utcnow() - timedelta(
+        seconds=property_importer.IMPORT_LEASE_SECONDS + 1)
+    db.session.commit()
+    run_import_job(import_job_id=import_job_id)
+    db.session.expire_all()
+    import_job_vo = ImportJobVO.query.get(import_job_id)
+    assert (import_job_vo.job_status, import_job_vo.rows_imported) == \
+        ('completed', 2)
+    assert imported_count(title) == 2
+
+    run_import_job(import_job_id=import_job_id)
+    assert imported_count(title) == 2
+
+
+def test_run_stops_without_inserting_after_a_takeover(make_import_job,
+                                                      queued_jobs,
+                                                      monkeypatch):
+    import_job_id, title = make_import_job(3)
+    build_property_mapping = property_importer.build_property_mapping
+
+    def build_then_lose_the_job(*args):
+        # Another run claims the stale job and checkpoints a row first
+        ImportJobVO.query.filter_by(import_job_id=import_job_id) \
+            .update({'rows_processed': 1})
+        db.session.commit()
+        return build_property_mapping(*args)
+
+    monkeypatch.setattr(property_importer, 'build_property_mapping',
+                        build_then_lose_the_job)
+    run_import_job(import_job_id=import_job_id)
+
+    db.session.expire_all()
+    import_job_vo = ImportJobVO.query.get(import_job_id)
+    assert (import_job_vo.job_status, import_job_vo.rows_processed) == \
+        ('running', 1)
+    assert imported_count(title) == 0
+
+
+def test_run_publishes_imported_approved_listings(make_import_job, queued_jobs,
+                                                  monkeypatch):
+    import_job_id, title = make_import_job(2)
+    published = []
+    monkeypatch.setattr(saved_search_matcher, 'publish', published.extend)
+
+    run_import_job(import_job_id=import_job_id)
+
+    property_ids = [row.property_id for row in PropertyVO.query.filter_by(
+        property_title=title)]
+    assert len(property_ids) == 2
+    assert sorted(published) == sorted(property_ids)
+
+
+def test_run_queues_image_metadata_of_imported_listings(make_import_job,
+                                                        queued_jobs):
+    import_job_id, title = make_import_job(2)
+
+    run_import_job(import_job_id=import_job_id)
+
+    property_ids = [row.property_id for row in PropertyVO.query.filter_by(
+        property_title=title)]
+    assert queued_jobs == [('describe_property_images',
+                            {'property_id': property_id})
+                           for property_id in sorted(property_ids)]
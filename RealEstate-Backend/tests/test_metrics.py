@@ -0,0 +1,21 @@
+from base import app
+
+
+def test_metrics_are_closed_without_a_token(monkeypatch):
+    monkeypatch.delenv('METRICS_TOKEN', raising=False)
+    client = app.test_client()
+
+    # A local proxy forwards every request from 127.0.0.1
+    response = client.get('/internal/metrics',
+                          environ_base={'REMOTE_ADDR': '127.0.0.1'})
+    assert response.status_code == 403
+
+
+def test_metrics_accept_the_configured_token(monkeypatch):
+    monkeypatch.setenv('METRICS_TOKEN', 'scraper-token')
+    client = app.test_client()
+
+    assert client.get('/internal/metrics').status_code == 403
+    response = client.get('/internal/metrics', headers={
+        'Authorization': 'Bearer scraper-token'})
+    assert response.status_code == 200
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from base import app, db
+from base.com.controller import moderation_controller
+from base.com.vo.property_vo import PropertyVO
+from base.utils.helpers import generate_token
+
+
+def test_repeated_feature_filter_reaches_every_match(make_property,
+                                                     monkeypatch):
+    monkeypatch.setattr(moderation_controller, 'MAX_BULK_ITEMS', 2)
+    created_after = datetime.utcnow().isoformat()
+    already_featured = make_property(is_approved=True, is_featured=True)
+    property_ids = [make_property(is_approved=True) for _ in range(3)]
+
+    client = app.test_client()
+    headers = {'Authorization': generate_token(1, 'admin')}
+    body = {'action': 'feature', 'filter': {'created_after': created_after}}
+    reports = []
+    for _ in range(3):
+        response = client.post('/api/admin/moderation/properties', json=body,
+                               headers=headers)
+        assert response.status_code == 200
+        reports.append(response.get_json()['data'])
+        if not reports[-1]['has_more']:
+            break
+
+    assert [(report['processed'], report['has_more'])
+            for report in reports] == [(2, True), (1, False)]
+    featured = [result['id'] for report in reports
+                for result in report['results']]
+    assert sorted(featured) == property_ids
+    assert already_featured not in featured
+    db.session.expire_all()
+    assert all(PropertyVO.query.get(property_id).is_featured
+               for property_id in property_ids)
@@ -0,0 +1,46 @@
+from base import db
+from base.com.dao.property_dao import PropertyDAO
+from base.com.vo.property_stats_vo import PropertyStatsVO
+from base.com.vo.property_vo import PropertyVO
+from base.utils.popularity import PopularityTracker, popularity_tracker
+
+
+def make_tracker():
+    tracker = PopularityTracker()
+    # Flushed by the test instead of a background thread
+    tracker._ensure_flusher = lambda: None
+    return tracker
+
+
+def test_flush_drops_deltas_of_deleted_properties(foreign_keys, make_property):
+    kept_id = make_property(is_approved=True)
+    deleted_id = make_property(is_approved=True)
+    tracker = make_tracker()
+    tracker.record_many({kept_id: (1, 3), deleted_id: (1, 2)})
+
+    # Deleted behind the tracker's back, e.g. by a user's cascade
+    PropertyVO.query.filter_by(property_id=deleted_id).delete()
+    db.session.commit()
+
+    assert tracker.flush() == 2
+    stats = PropertyStatsVO.query.get(kept_id)
+    assert (stats.favorite_count, stats.view_count) == (1, 3)
+    assert PropertyStatsVO.query.get(deleted_id) is None
+    assert tracker.get_pending_counts(deleted_id) == (0, 0)
+
+    # Later deltas keep flushing instead of retrying the deleted row
+    tracker.record_many({kept_id: (0, 1)})
+    assert tracker.flush() == 1
+    db.session.expire_all()
+    assert PropertyStatsVO.query.get(kept_id).view_count == 4
+
+
+def test_delete_property_forgets_pending_deltas(foreign_keys, make_property):
+    property_id = make_property(is_approved=True)
+    popularity_tracker.record_many({property_id: (1, 5)})
+    assert popularity_tracker.get_pending_counts(property_id) == (1, 5)
+
+    assert PropertyDAO().delete_property(property_id)
+
+    assert popularity_tracker.get_pending_counts(property_id) == (0, 0)
+    assert property_id not in popularity_tracker.get_trending_ids(1000)
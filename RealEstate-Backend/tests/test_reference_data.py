@@ -0,0 +1,27 @@
+from base import db
+from base.com.dao.reference_version_dao import ReferenceVersionDAO
+from base.com.vo.user_vo import UserVO
+from base.utils.reference_data import reference_data
+from base.utils.unit_of_work import transaction
+
+
+def test_failed_poll_keeps_the_callers_unit_of_work(monkeypatch):
+    reference_data.load()
+
+    def fail(self, session=None):
+        raise RuntimeError('database went away')
+
+    with transaction():
+        db.session.add(UserVO(user_name='Importer',
+                              user_email='importer@example.com',
+                              user_password='x', user_role='user'))
+        db.session.flush()
+
+        monkeypatch.setattr(ReferenceVersionDAO, 'get_versions', fail)
+        monkeypatch.setattr(reference_data, '_polled_at', 0)
+        # Served from the last snapshot while the poll fails
+        assert reference_data.get_category(0) is None
+
+    db.session.remove()
+    assert UserVO.query.filter_by(
+        user_email='importer@example.com').count() == 1
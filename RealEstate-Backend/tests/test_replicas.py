@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+
+import pytest
+from flask import g
+from sqlalchemy import create_engine, text
+
+from base import app, db
+from base.utils import replicas
+from base.utils.helpers import generate_token
+from base.utils.replicas import ReplicaRouter, read_replica
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    """Two SQLite files standing in for replicas, each naming itself"""
+    urls = []
+    for index in range(2):
+        url = f"sqlite:///{tmp_path / f'replica{index}.db'}"
+        engine = create_engine(url)
+        with engine.begin() as connection:
+            connection.execute(text('CREATE TABLE replica_name (name TEXT)'))
+            connection.execute(text('INSERT INTO replica_name VALUES (:name)'),
+                               {'name': f'replica{index}'})
+        engine.dispose()
+        urls.append(url)
+    return urls
+
+
+def make_router(urls, selection='round_robin'):
+    router = ReplicaRouter(urls, selection)
+    # Health is left as constructed instead of polled from a thread
+    router._ensure_checker = lambda: None
+    return router
+
+
+@contextmanager
+def request_as(user_id):
+    """
+    A request by user_id. The before_request hooks run as when serving:
+    they reset the routing state g keeps under the app context that base
+    pushes globally.
+    """
+    with app.test_request_context(
+            headers={'Authorization': generate_token(user_id, 'user')}):
+        app.preprocess_request()
+        yield
+
+
+def test_round_robin_alternates_between_healthy_replicas(replica_urls):
+    router = make_router(replica_urls)
+
+    assert [router.choose().name for _ in range(4)] == \
+        ['replica0', 'replica1', 'replica0', 'replica1']
+
+    router.replicas[0].healthy = False
+    assert {router.choose().name for _ in range(3)} == {'replica1'}
+
+    router.replicas[1].healthy = False
+    assert router.choose() is None
+
+
+def test_least_loaded_picks_replica_with_fewest_checked_out(replica_urls):
+    router = make_router(replica_urls, 'least_loaded')
+
+    with router.replicas[0].engine.connect():
+        assert router.choose().name == 'replica1'
+    with router.replicas[1].engine.connect():
+        assert router.choose().name == 'replica0'
+
+
+def test_recent_writer_reads_from_primary(replica_urls):
+    router = make_router(replica_urls)
+    router.mark_write(7)
+
+    with request_as(7):
+        assert router.get_read_replica() is None
+
+    with request_as(8):
+        replica = router.get_read_replica()
+        assert replica is not None
+        # One replica per request
+        assert router.get_read_replica() is replica
+
+
+def test_request_that_wrote_reads_from_primary(replica_urls):
+    router = make_router(replica_urls)
+
+    with request_as(8):
+        assert router.get_read_replica() is not None
+        g.wrote_primary = True
+        assert router.get_read_replica() is None
+
+
+def test_read_replica_methods_run_on_the_chosen_replica(replica_urls,
+                                                        monkeypatch):
+    router = make_router(replica_urls)
+    monkeypatch.setattr(replicas, 'replica_router', router)
+
+    @read_replica
+    def get_replica_name():
+        return db.session.execute(
+            text('SELECT name FROM replica_name')).scalar()
+
+    try:
+        assert [get_replica_name() for _ in range(2)] == \
+            ['replica0', 'replica1']
+    finally:
+        db.session.remove()
@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from base.utils.saved_search_matcher import SavedSearchMatcher
+
+
+def test_match_leaves_reloads_to_the_reloader(monkeypatch):
+    matcher = SavedSearchMatcher()
+    reloads = []
+    monkeypatch.setattr(matcher, 'load', lambda: reloads.append('load'))
+    monkeypatch.setattr(matcher, '_ensure_reloader',
+                        lambda: reloads.append('reloader'))
+    row = SimpleNamespace(property_type='sale', category_id=1, location_id=1,
+                          price=100000, bedrooms=2, bathrooms=1, area_sqft=900,
+                          property_title='Listing', property_description='',
+                          address='')
+
+    # The first match in a process has nothing to match against yet
+    matcher.match(row)
+    assert reloads == ['load', 'reloader']
+
+    # A stale index is reloaded in the background, not on the caller
+    reloads.clear()
+    matcher._loaded_at = 0
+    matcher.match(row)
+    assert reloads == ['reloader']
@@ -0,0 +1,49 @@
+"""
+Runs queued background jobs from job_table (JOB_QUEUE_BACKEND=database):
+
+    python worker.py [--processes N] [--once] [--metrics-port PORT]
+
+SIGTERM or Ctrl+C stops claiming new jobs and waits for running ones.
+"""
+import argparse
+import os
+import signal
+import sys
+
+from base.utils.job_queue import JOB_POLL_SECONDS, JobWorker, job_queue
+from base.utils.metrics import start_metrics_server
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Run queued background jobs')
+    parser.add_argument('--processes', type=int,
+                        default=int(os.getenv('JOB_WORKER_PROCESSES',
+                                              os.cpu_count() or 2)),
+                        help='jobs run in parallel, one per process')
+    parser.add_argument('--poll-interval', type=float,
+                        default=JOB_POLL_SECONDS,
+                        help='seconds between polls when no job is due')
+    parser.add_argument('--once', action='store_true',
+                        help='exit once no job is due instead of polling')
+    parser.add_argument('--metrics-port', type=int,
+                        default=int(os.getenv('WORKER_METRICS_PORT', '0')),
+                        help='serve Prometheus metrics on this local port')
+    args = parser.parse_args(argv)
+
+    if job_queue.name != 'database':
+        print('The worker runs jobs stored in job_table; set '
+              'JOB_QUEUE_BACKEND=database for it and the web app')
+        return 1
+
+    worker = JobWorker(max(1, args.processes), args.poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+    print(f"Worker {worker.worker_id} running {worker.processes} processes")
+    worker.run(once=args.once)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
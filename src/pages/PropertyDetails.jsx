@@ -2,7 +2,7 @@ import { useEffect, useState } from "react";
 import { useParams, Link, useNavigate } from "react-router-dom";
 import { useDispatch, useSelector } from "react-redux";
 import { fetchPropertyById, clearCurrentProperty } from "../redux/slices/propertySlice";
-import { fetchReviewsByProperty, clearReviews } from "../redux/slices/reviewSlice";
+import { fetchReviewsByProperty, fetchMoreReviewsByProperty, clearReviews } from "../redux/slices/reviewSlice";
 import { fetchFavorites } from "../redux/slices/favoriteSlice";
 import { addToFavorites, removeFromFavorites } from "../redux/slices/favoriteSlice";
 import { fetchCategories } from "../redux/slices/categorySlice";
@@ -17,7 +17,13 @@ export default function PropertyDetails() {
   const navigate = useNavigate();
   const dispatch = useDispatch();
   const { currentProperty: property, loading } = useSelector((state) => state.properties);
-  const { list: reviews, loading: reviewsLoading } = useSelector((state) => state.reviews);
+  const {
+    list: reviews,
+    nextCursor: reviewsCursor,
+    stats: reviewStats,
+    loading: reviewsLoading,
+    loadingMore: reviewsLoadingMore,
+  } = useSelector((state) => state.reviews);
   const { favoritesByPropertyId, list: favorites } = useSelector((state) => state.favorites);
   const { user, token } = useSelector((state) => state.auth);
   const { list: categories } = useSelector((state) => state.categories);
@@ -97,7 +103,16 @@ export default function PropertyDetails() {
     }).format(price);
   };
 
+  // Reviews are paged, so the totals come from the stats of the first page
+  const totalReviews = reviewStats?.total_reviews ?? reviews.length;
+
+  const handleLoadMoreReviews = () => {
+    if (!reviewsCursor || reviewsLoadingMore) return;
+    dispatch(fetchMoreReviewsByProperty({ propertyId: id, cursor: reviewsCursor }));
+  };
+
   const calculateAverageRating = () => {
+    if (reviewStats) return Number(reviewStats.average_rating || 0).toFixed(1);
     if (reviews.length === 0) return 0;
     const sum = reviews.reduce((acc, r) => acc + (r.review_rating || r.rating || 0), 0);
     return (sum / reviews.length).toFixed(1);
@@ -361,7 +376,7 @@ export default function PropertyDetails() {
                 </div>
                 <div className="text-center">
                   <p className="text-2xl font-semibold text-gray-900">
-                    {reviews.length}
+                    {totalReviews}
                   </p>
                   <p className="text-sm text-gray-500">Reviews</p>
                 </div>
@@ -454,7 +469,7 @@ export default function PropertyDetails() {
 
             {/* Reviews Section */}
             <div className="bg-white rounded-xl shadow-sm p-6">
-              <h3 className="text-lg font-semibold mb-4">Reviews ({reviews.length})</h3>
+              <h3 className="text-lg font-semibold mb-4">Reviews ({totalReviews})</h3>
 
               {/* Review Form */}
               {token && <ReviewForm propertyId={id} />}
@@ -502,6 +517,15 @@ export default function PropertyDetails() {
                       <p className="text-gray-600">{review.comment || review.review_comment}</p>
                     </div>
                   ))}
+                  {reviewsCursor && (
+                    <button
+                      onClick={handleLoadMoreReviews}
+                      disabled={reviewsLoadingMore}
+                      className="w-full py-2 text-indigo-600 font-medium border border-indigo-200 rounded-lg hover:bg-indigo-50 disabled:opacity-50"
+                    >
+                      {reviewsLoadingMore ? "Loading..." : "Load more reviews"}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
@@ -18,9 +18,30 @@ export const fetchReviewsByProperty = createAsyncThunk(
   async (propertyId, { rejectWithValue }) => {
     try {
       const res = await reviewService.getPropertyReviews(propertyId);
-      // Backend returns { data: { reviews: [...], stats: {...} } }
+      // Backend returns { data: { reviews: [...], next_cursor, stats: {...} } }
       const responseData = res.data?.data || res.data || {};
-      return responseData.reviews || [];
+      return {
+        reviews: responseData.reviews || [],
+        nextCursor: responseData.next_cursor || null,
+        stats: responseData.stats || null,
+      };
+    } catch (err) {
+      return rejectWithValue(getErrorMessage(err));
+    }
+  }
+);
+
+// Next page of a property's reviews; stats only come with the first page
+export const fetchMoreReviewsByProperty = createAsyncThunk(
+  "reviews/fetchMoreByProperty",
+  async ({ propertyId, cursor }, { rejectWithValue }) => {
+    try {
+      const res = await reviewService.getPropertyReviews(propertyId, { cursor });
+      const responseData = res.data?.data || res.data || {};
+      return {
+        reviews: responseData.reviews || [],
+        nextCursor: responseData.next_cursor || null,
+      };
     } catch (err) {
       return rejectWithValue(getErrorMessage(err));
     }
@@ -45,7 +66,10 @@ const reviewSlice = createSlice({
   name: "reviews",
   initialState: {
     list: [],
+    nextCursor: null,
+    stats: null,
     loading: false,
+    loadingMore: false,
     error: null,
   },
   reducers: {
@@ -54,6 +78,8 @@ const reviewSlice = createSlice({
     },
     clearReviews: (state) => {
       state.list = [];
+      state.nextCursor = null;
+      state.stats = null;
     },
   },
   extraReducers: (builder) => {
@@ -64,12 +90,27 @@ const reviewSlice = createSlice({
       })
       .addCase(fetchReviewsByProperty.fulfilled, (state, action) => {
         state.loading = false;
-        state.list = action.payload || [];
+        state.list = action.payload.reviews;
+        state.nextCursor = action.payload.nextCursor;
+        state.stats = action.payload.stats;
       })
       .addCase(fetchReviewsByProperty.rejected, (state, action) => {
         state.loading = false;
         state.error = action.payload;
       })
+      .addCase(fetchMoreReviewsByProperty.pending, (state) => {
+        state.loadingMore = true;
+        state.error = null;
+      })
+      .addCase(fetchMoreReviewsByProperty.fulfilled, (state, action) => {
+        state.loadingMore = false;
+        state.list = [...state.list, ...action.payload.reviews];
+        state.nextCursor = action.payload.nextCursor;
+      })
+      .addCase(fetchMoreReviewsByProperty.rejected, (state, action) => {
+        state.loadingMore = false;
+        state.error = action.payload;
+      })
       .addCase(addReview.pending, (state) => {
         state.loading = true;
         state.error = null;
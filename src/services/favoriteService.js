@@ -4,4 +4,5 @@ import api from "./api";
 export const addFavorite = (data) => api.post("/api/favorites", data);
 export const getFavorites = () => api.get("/api/favorites");
 export const removeFavorite = (id) => api.delete(`/api/favorites/${id}`);
+export const checkFavorites = (ids) => api.get("/api/favorites/check", { params: { ids: ids.join(",") } });
 
@@ -2,7 +2,7 @@ import api from "./api";
 
 // Location CRUD endpoints
 export const addLocation = (data) => api.post("/api/locations", data);
-export const getAllLocations = () => api.get("/api/locations");
+export const getAllLocations = (params) => api.get("/api/locations", { params });
 export const updateLocation = (id, data) => api.put(`/api/locations/${id}`, data);
 export const deleteLocation = (id) => api.delete(`/api/locations/${id}`);
-
+export const searchLocations = (q, limit) => api.get("/api/locations/search", { params: { q, limit } });
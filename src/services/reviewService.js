@@ -2,8 +2,9 @@ import api from "./api";
 
 // Review endpoints
 export const addReview = (data) => api.post("/api/reviews", data);
-export const getPropertyReviews = (propertyId) => api.get(`/api/reviews/property/${propertyId}`);
+export const getPropertyReviews = (propertyId, params) => api.get(`/api/reviews/property/${propertyId}`, { params });
 export const getPropertyReviewStats = (propertyId) => api.get(`/api/reviews/property/${propertyId}`);
 export const getReviews = (params) => api.get("/api/reviews", { params });
+export const getRecentReviews = (params) => api.get("/api/reviews/recent", { params });
 export const deleteReview = (id) => api.delete(`/api/reviews/${id}`);
 
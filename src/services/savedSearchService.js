@@ -0,0 +1,7 @@
+import api from "./api";
+
+// Saved search endpoints
+export const createSavedSearch = (data) => api.post("/api/saved-searches", data);
+export const getSavedSearches = () => api.get("/api/saved-searches");
+export const getSavedSearchResults = (id) => api.get(`/api/saved-searches/${id}/results`);
+export const deleteSavedSearch = (id) => api.delete(`/api/saved-searches/${id}`);